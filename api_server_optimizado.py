@@ -51,6 +51,7 @@ import threading
 from flask import Flask, request, jsonify, Response, send_file, redirect
 from flask_cors import CORS
 from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Optional
 import os
 from datetime import datetime, timedelta
@@ -201,6 +202,12 @@ except ImportError as e:
     print(f"⚠️ WhatsApp no disponible: {e}")
     WHATSAPP_DISPONIBLE = False
 
+# Lectura en streaming del catálogo para los endpoints que lo recorren una sola vez.
+# Se usa la misma función que los scripts de src/ para leer el repositorio igual.
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from repositorio_io import iterar_propiedades
+
 
 
 # Configuración
@@ -915,15 +922,9 @@ def obtener_estadisticas():
     try:
         # LECTURA DIRECTA DEL ARCHIVO - BYPASS COMPLETO DE CLASES
         logger.info("🔄 Leyendo archivo directamente...")
-        with open('resultados/propiedades_estructuradas.json', 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-            # Verificar si es directamente una lista o tiene estructura {"propiedades": [...]}
-            if isinstance(datos, list):
-                propiedades = datos
-            else:
-                propiedades = datos.get('propiedades', [])
-        
-        logger.info(f"📊 Archivo leído: {len(propiedades)} propiedades")
+        # Las propiedades se procesan mientras se leen, sin cargar el archivo completo
+        propiedades = iterar_propiedades('resultados/propiedades_estructuradas.json')
+        total_propiedades = 0
         
         # Contar operaciones directamente
         operaciones = {}
@@ -938,6 +939,8 @@ def obtener_estadisticas():
         caracteristicas_booleanas = {}
         
         for prop in propiedades:
+            total_propiedades += 1
+            
             # Operaciones - nuevo formato
             op = prop.get('tipo_operacion', 'sin tipo')
             operaciones[op] = operaciones.get(op, 0) + 1
@@ -1101,13 +1104,14 @@ def obtener_estadisticas():
                 elif carac == 'cisterna':
                     caracteristicas_finales['💧 Cisterna'] = count
         
+        logger.info(f"📊 Archivo leído: {total_propiedades} propiedades")
         logger.info("📊 Distribución calculada directamente:")
         for op, count in operaciones.items():
             logger.info(f"   • {op}: {count}")
         
         stats = {
-            'total': len(propiedades),
-            'total_propiedades': len(propiedades),
+            'total': total_propiedades,
+            'total_propiedades': total_propiedades,
             'por_ciudad': ciudades,
             'por_tipo': tipos,
             'por_operacion': operaciones,
@@ -1219,23 +1223,16 @@ def servir_imagen(filename):
 def obtener_estadisticas_debug():
     """DEBUG: Lee directamente el archivo sin cache ni clases."""
     try:
-        import json
-        with open('resultados/propiedades_estructuradas.json', 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-            # Verificar si es directamente una lista o tiene estructura {"propiedades": [...]}
-            if isinstance(datos, list):
-                propiedades = datos
-            else:
-                propiedades = datos.get('propiedades', [])
-        
         # Contar operaciones directamente - nuevo formato
         operaciones = {}
-        for prop in propiedades:
+        total_propiedades = 0
+        for prop in iterar_propiedades('resultados/propiedades_estructuradas.json'):
+            total_propiedades += 1
             op = prop.get('tipo_operacion', 'sin tipo')
             operaciones[op] = operaciones.get(op, 0) + 1
         
         return jsonify({
-            'total_propiedades': len(propiedades),
+            'total_propiedades': total_propiedades,
             'por_operacion': operaciones,
             'debug': 'Lectura directa del archivo'
         })
@@ -3243,8 +3240,8 @@ def configurar_whatsapp():
 def debug_caracteristicas():
     """DEBUG: Probar extracción de características numéricas."""
     try:
-        with open('resultados/propiedades_estructuradas.json', 'r', encoding='utf-8') as f:
-            propiedades = json.load(f)
+        # Solo se leen del archivo las propiedades que se analizan
+        propiedades = iterar_propiedades('resultados/propiedades_estructuradas.json')
         
         # Contadores
         caracteristicas_numericas = {
@@ -3255,7 +3252,7 @@ def debug_caracteristicas():
         caracteristicas_booleanas = {}
         
         # Analizar primeras 100 propiedades
-        for prop in propiedades[:100]:
+        for prop in islice(propiedades, 100):
             descripcion = prop.get('descripcion_original', '').lower()
             
             # Buscar recámaras
@@ -8,33 +8,157 @@ usando la función simple de extracción de precios.
 """
 
 import os
-import json
+import gzip
+import shelve
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from bs4 import BeautifulSoup
+from lxml import etree
 from tqdm import tqdm
 
+from repositorio_io import cargar_json, guardar_json
+
 # Rutas
 CARPETA_RESULTADOS = "resultados"
 CARPETA_REPO_MASTER = os.path.join(CARPETA_RESULTADOS, "repositorio_propiedades.json")
 BACKUP_REPO = os.path.join(CARPETA_RESULTADOS, f"repositorio_propiedades_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
 
-def extraer_precio(soup):
-    """Función simple para extraer precio."""
-    for span in soup.find_all("span"):
-        t = span.get_text(strip=True)
-        if t.startswith("$") and len(t) < 30:
-            return t
-    return ""
+PROCESOS_PRECIOS = os.cpu_count() or 1
+MINIMO_PARA_PARALELO = 64
+
+# Caché en disco de precios por archivo HTML. La clave incluye fecha de modificación
+# y tamaño del archivo, y la huella de este módulo: si el HTML o extraer_precio
+# cambian, el precio se vuelve a extraer.
+CACHE_PRECIOS = os.path.join(CARPETA_RESULTADOS, "cache_precios")
+with open(__file__, "rb") as _f:
+    _HUELLA_PRECIOS = hashlib.blake2b(_f.read(), digest_size=8).hexdigest()
+
+def _clave_cache(ruta_html: str) -> str:
+    estado = os.stat(ruta_html)
+    return f"{_HUELLA_PRECIOS}|{ruta_html}|{estado.st_mtime_ns}|{estado.st_size}"
+
+def ruta_html_guardado(ruta_html):
+    """Devuelve la ruta del HTML guardado (comprimido en extracciones nuevas) o None."""
+    if os.path.exists(ruta_html + ".gz"):
+        return ruta_html + ".gz"
+    if os.path.exists(ruta_html):
+        return ruta_html
+    return None
+
+# Texto que BeautifulSoup no incluye en get_text() (scripts, estilos, plantillas, ruby)
+ETIQUETAS_SIN_TEXTO = {"script", "style", "template", "rt", "rp"}
+TAMANO_BLOQUE = 64 * 1024
+
+class _PrecioEncontrado(Exception):
+    pass
+
+class BuscadorPrecio:
+    """
+    Target de lxml que busca el primer <span> (en orden del documento) cuyo texto
+    empieza con "$" y mide menos de 30 caracteres, sin construir el árbol.
+    El texto de cada span se arma como get_text(strip=True) de BeautifulSoup.
+    """
+    
+    def __init__(self):
+        self.pendiente = []     # Fragmentos del nodo de texto actual
+        self.spans_abiertos = []  # (orden, partes) de cada <span> sin cerrar
+        self.sin_texto = 0      # Profundidad dentro de etiquetas cuyo texto se omite
+        self.orden = 0
+        self.candidato = None   # (orden, texto) del mejor precio encontrado
+    
+    def _volcar(self):
+        # Un nodo de texto termina en cualquier etiqueta o comentario
+        if not self.pendiente:
+            return
+        texto = "".join(self.pendiente).strip()
+        self.pendiente.clear()
+        if texto and not self.sin_texto:
+            for _, partes in self.spans_abiertos:
+                partes.append(texto)
+    
+    def start(self, tag, attrib):
+        self._volcar()
+        if tag == "span":
+            self.spans_abiertos.append((self.orden, []))
+            self.orden += 1
+        elif tag in ETIQUETAS_SIN_TEXTO:
+            self.sin_texto += 1
+    
+    def end(self, tag):
+        self._volcar()
+        if tag == "span":
+            orden, partes = self.spans_abiertos.pop()
+            texto = "".join(partes)
+            if texto.startswith("$") and len(texto) < 30 and (self.candidato is None or orden < self.candidato[0]):
+                self.candidato = (orden, texto)
+            # Un span exterior empieza antes que los interiores: solo al cerrarse
+            # todos se sabe cuál es el primero
+            if self.candidato and not self.spans_abiertos:
+                raise _PrecioEncontrado(self.candidato[1])
+        elif tag in ETIQUETAS_SIN_TEXTO:
+            # Todo el texto dentro de estas etiquetas se omite, aunque esté
+            # en un <span> anidado (get_text() tampoco lo incluye)
+            self.sin_texto -= 1
+    
+    def data(self, datos):
+        self.pendiente.append(datos)
+    
+    def comment(self, texto):
+        self._volcar()
+    
+    def pi(self, target, datos):
+        self._volcar()
+    
+    def close(self):
+        self._volcar()
+        return self.candidato[1] if self.candidato else ""
+
+def extraer_precio(f):
+    """
+    Extrae el precio leyendo el HTML por bloques; el parseo se detiene en cuanto
+    se encuentra el precio, sin leer el resto del archivo.
+    """
+    parser = etree.HTMLParser(target=BuscadorPrecio(), encoding="utf-8")
+    try:
+        while bloque := f.read(TAMANO_BLOQUE):
+            parser.feed(bloque)
+        return parser.close()
+    except _PrecioEncontrado as encontrado:
+        return encontrado.args[0]
+
+def leer_precio_html(ruta_html):
+    """
+    Lee el HTML guardado de una propiedad (.html.gz o .html) y extrae su precio.
+    Devuelve (precio, error).
+    """
+    try:
+        # Se lee en bytes: lxml decodifica el documento directamente
+        abrir = gzip.open if ruta_html.endswith(".gz") else open
+        with abrir(ruta_html, "rb") as f:
+            return extraer_precio(f), None
+    except Exception as e:
+        return "", str(e)
+
+def leer_precios(rutas):
+    """
+    Aplica leer_precio_html a cada ruta y devuelve los resultados en el mismo orden,
+    en paralelo con ProcessPoolExecutor si hay suficientes archivos.
+    """
+    if PROCESOS_PRECIOS < 2 or len(rutas) < MINIMO_PARA_PARALELO:
+        yield from map(leer_precio_html, rutas)
+        return
+    # Lotes grandes para que el costo de serializar cada tarea sea despreciable
+    tamano_lote = max(1, len(rutas) // (PROCESOS_PRECIOS * 4))
+    with ProcessPoolExecutor(max_workers=PROCESOS_PRECIOS) as pool:
+        yield from pool.map(leer_precio_html, rutas, chunksize=tamano_lote)
 
 def actualizar_precios():
     # 1. Crear backup del repositorio actual
     if os.path.exists(CARPETA_REPO_MASTER):
-        with open(CARPETA_REPO_MASTER, "r", encoding="utf-8") as f:
-            repo_master = json.load(f)
-        
-        # Guardar backup
-        with open(BACKUP_REPO, "w", encoding="utf-8") as f:
-            json.dump(repo_master, f, ensure_ascii=False, indent=2)
+        # Guardar backup: copia directa del archivo, sin volver a serializarlo
+        shutil.copyfile(CARPETA_REPO_MASTER, BACKUP_REPO)
+        repo_master = cargar_json(CARPETA_REPO_MASTER)
         
         print(f"Backup creado en: {BACKUP_REPO}")
     else:
@@ -46,41 +170,50 @@ def actualizar_precios():
     propiedades_sin_html = 0
     
     print("\nActualizando precios...")
-    for pid, datos in tqdm(repo_master.items(), desc="Procesando propiedades"):
-        try:
-            # Obtener la fecha de extracción
-            fecha_str = datos.get("fecha_extraccion", "").split("T")[0]
-            if not fecha_str:
-                print(f"Advertencia: Propiedad {pid} no tiene fecha de extracción")
-                continue
-                
-            # Construir ruta al archivo HTML
-            ciudad = datos.get("ciudad", "cuernavaca").lower()
-            ruta_html = os.path.join(CARPETA_RESULTADOS, fecha_str, f"{ciudad}-{fecha_str}-{pid}.html")
+    pendientes = []
+    for pid, datos in repo_master.items():
+        # Obtener la fecha de extracción
+        fecha_str = datos.get("fecha_extraccion", "").split("T")[0]
+        if not fecha_str:
+            print(f"Advertencia: Propiedad {pid} no tiene fecha de extracción")
+            continue
             
-            if not os.path.exists(ruta_html):
-                propiedades_sin_html += 1
+        # Construir ruta al archivo HTML
+        ciudad = datos.get("ciudad", "cuernavaca").lower()
+        ruta_html = ruta_html_guardado(os.path.join(CARPETA_RESULTADOS, fecha_str, f"{ciudad}-{fecha_str}-{pid}.html"))
+        if ruta_html is None:
+            propiedades_sin_html += 1
+            continue
+        pendientes.append((pid, ruta_html))
+    
+    with shelve.open(CACHE_PRECIOS) as cache:
+        # Los HTML sin cambios desde la última corrida no se vuelven a parsear
+        precios = {}
+        por_leer = []
+        for pid, ruta_html in pendientes:
+            clave = _clave_cache(ruta_html)
+            if clave in cache:
+                precios[pid] = cache[clave]
+            else:
+                por_leer.append((pid, ruta_html, clave))
+        
+        # El parseo de cada HTML es independiente: se reparte entre procesos
+        resultados = leer_precios([ruta_html for _, ruta_html, _ in por_leer])
+        for (pid, _, clave), (nuevo_precio, error) in tqdm(zip(por_leer, resultados), total=len(por_leer), desc="Procesando propiedades"):
+            if error:
+                print(f"\nError procesando propiedad {pid}: {error}")
                 continue
-                
-            # Leer archivo HTML
-            with open(ruta_html, "r", encoding="utf-8") as f:
-                html = f.read()
-                
-            # Extraer nuevo precio
-            soup = BeautifulSoup(html, "html.parser")
-            nuevo_precio = extraer_precio(soup)
-            
-            if nuevo_precio:
-                # Actualizar precio en el repositorio
-                datos["precio"] = nuevo_precio
-                propiedades_actualizadas += 1
-                
-        except Exception as e:
-            print(f"\nError procesando propiedad {pid}: {str(e)}")
+            cache[clave] = nuevo_precio
+            precios[pid] = nuevo_precio
+    
+    for pid, nuevo_precio in precios.items():
+        if nuevo_precio:
+            # Actualizar precio en el repositorio
+            repo_master[pid]["precio"] = nuevo_precio
+            propiedades_actualizadas += 1
             
-    # 3. Guardar repositorio actualizado
-    with open(CARPETA_REPO_MASTER, "w", encoding="utf-8") as f:
-        json.dump(repo_master, f, ensure_ascii=False, indent=2)
+    # 3. Guardar repositorio actualizado, compacto como en genera_repositorio_final
+    guardar_json(CARPETA_REPO_MASTER, repo_master, indentar=False)
         
     print(f"\nProceso completado:")
     print(f"- Total de propiedades en repositorio: {len(repo_master)}")
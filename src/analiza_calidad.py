@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 from collections import Counter
 import statistics
 
+from repositorio_io import iterar_propiedades
+
+_VACIO = {}  # Sustituto de solo lectura para secciones ausentes
+
 def normalizar_texto(texto):
     """
     Normaliza un texto eliminando caracteres especiales y convirtiendo a minúsculas.
@@ -29,16 +32,8 @@ def normalizar_texto(texto):
     return texto
 
 def analizar_calidad_campos(archivo):
-    with open(archivo, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    propiedades = data.get('propiedades', [])
-    total = len(propiedades)
-    if total == 0:
-        print("No hay propiedades para analizar")
-        return
-    
-    print(f"\n=== ANÁLISIS DE CALIDAD DE DATOS ({total} propiedades) ===\n")
+    # Una sola pasada en streaming acumula todas las métricas
+    total = 0
     
     # Contadores para campos principales
     tipos_operacion = Counter()
@@ -60,7 +55,9 @@ def analizar_calidad_campos(archivo):
     estados_conservacion = Counter()
     orientaciones = Counter()
     
-    for prop in propiedades:
+    for prop in iterar_propiedades(archivo):
+        total += 1
+        
         # Tipo de operación
         tipo_op = prop.get('tipo_operacion', '')
         tipos_operacion[tipo_op] += 1
@@ -70,46 +67,52 @@ def analizar_calidad_campos(archivo):
             precios_validos += 1
             precios.append(prop['precio_num'])
         
-        # Ubicación
-        ubicacion = prop.get('ubicacion', {})
+        # Ubicación (un solo dict vacío compartido cuando falta la llave)
+        ubicacion = prop.get('ubicacion') or _VACIO
         if ubicacion.get('colonia') or ubicacion.get('zona'):
             ubicaciones_completas += 1
             
-        # Características
-        caract = prop.get('caracteristicas', {})
-        if any([caract.get('recamaras'), caract.get('banos'), 
-                caract.get('superficie_m2'), caract.get('construccion_m2')]):
+        # Características: cada campo se lee una sola vez
+        caract = prop.get('caracteristicas') or _VACIO
+        caract_get = caract.get
+        rec = caract_get('recamaras')
+        ban = caract_get('banos')
+        sup = caract_get('superficie_m2')
+        con = caract_get('construccion_m2')
+        if rec or ban or sup or con:
             caracteristicas_completas += 1
             
-        if caract.get('recamaras'):
-            recamaras.append(caract['recamaras'])
-        if caract.get('banos'):
-            banos.append(caract['banos'])
-        if caract.get('medio_bano'):
-            medio_banos.append(caract['medio_bano'])
-        if caract.get('superficie_m2'):
-            superficie.append(caract['superficie_m2'])
-        if caract.get('construccion_m2'):
-            construccion.append(caract['construccion_m2'])
-        if caract.get('estacionamientos'):
-            estacionamientos.append(caract['estacionamientos'])
-        if caract.get('niveles'):
-            niveles.append(caract['niveles'])
+        if rec:
+            recamaras.append(rec)
+        if ban:
+            banos.append(ban)
+        if medio := caract_get('medio_bano'):
+            medio_banos.append(medio)
+        if sup:
+            superficie.append(sup)
+        if con:
+            construccion.append(con)
+        if est := caract_get('estacionamientos'):
+            estacionamientos.append(est)
+        if niv := caract_get('niveles'):
+            niveles.append(niv)
             
-        # Amenidades y seguridad
-        for amenidad in caract.get('amenidades', []):
-            amenidad_norm = normalizar_texto(amenidad)
-            amenidades[amenidad_norm] += 1
-        for elemento in caract.get('seguridad', []):
-            elemento_norm = normalizar_texto(elemento)
-            seguridad[elemento_norm] += 1
+        # Amenidades y seguridad (Counter.update cuenta el iterable en C)
+        amenidades.update(map(normalizar_texto, caract_get('amenidades', ())))
+        seguridad.update(map(normalizar_texto, caract_get('seguridad', ())))
             
         # Estado de conservación y orientación
-        if estado := caract.get('estado_conservacion'):
+        if estado := caract_get('estado_conservacion'):
             estados_conservacion[estado] += 1
-        if orientacion := caract.get('orientacion'):
+        if orientacion := caract_get('orientacion'):
             orientaciones[orientacion] += 1
     
+    if total == 0:
+        print("No hay propiedades para analizar")
+        return
+    
+    print(f"\n=== ANÁLISIS DE CALIDAD DE DATOS ({total} propiedades) ===\n")
+    
     # Imprimir resultados
     print("1. TIPOS DE OPERACIÓN:")
     for tipo, count in tipos_operacion.most_common():
@@ -118,7 +121,7 @@ def analizar_calidad_campos(archivo):
     print("\n2. PRECIOS:")
     print(f"   Propiedades con precio válido: {precios_validos} ({precios_validos/total*100:.1f}%)")
     if precios:
-        print(f"   Precio promedio: ${statistics.mean(precios):,.2f}")
+        print(f"   Precio promedio: ${statistics.fmean(precios):,.2f}")
         print(f"   Precio mediana: ${statistics.median(precios):,.2f}")
         print(f"   Precio mínimo: ${min(precios):,.2f}")
         print(f"   Precio máximo: ${max(precios):,.2f}")
@@ -130,51 +133,33 @@ def analizar_calidad_campos(archivo):
     print(f"   Propiedades con características: {caracteristicas_completas} ({caracteristicas_completas/total*100:.1f}%)")
     print(f"   - Con recámaras: {len(recamaras)} ({len(recamaras)/total*100:.1f}%)")
     if recamaras:
-        print(f"     Promedio de recámaras: {statistics.mean(recamaras):.1f}")
+        print(f"     Promedio de recámaras: {statistics.fmean(recamaras):.1f}")
     print(f"   - Con baños completos: {len(banos)} ({len(banos)/total*100:.1f}%)")
     if banos:
-        print(f"     Promedio de baños: {statistics.mean(banos):.1f}")
+        print(f"     Promedio de baños: {statistics.fmean(banos):.1f}")
     print(f"   - Con medio baño: {len(medio_banos)} ({len(medio_banos)/total*100:.1f}%)")
     print(f"   - Con superficie: {len(superficie)} ({len(superficie)/total*100:.1f}%)")
     if superficie:
-        print(f"     Superficie promedio: {statistics.mean(superficie):.1f} m²")
+        print(f"     Superficie promedio: {statistics.fmean(superficie):.1f} m²")
     print(f"   - Con construcción: {len(construccion)} ({len(construccion)/total*100:.1f}%)")
     if construccion:
-        print(f"     Construcción promedio: {statistics.mean(construccion):.1f} m²")
+        print(f"     Construcción promedio: {statistics.fmean(construccion):.1f} m²")
     print(f"   - Con estacionamientos: {len(estacionamientos)} ({len(estacionamientos)/total*100:.1f}%)")
     if estacionamientos:
-        print(f"     Promedio de estacionamientos: {statistics.mean(estacionamientos):.1f}")
+        print(f"     Promedio de estacionamientos: {statistics.fmean(estacionamientos):.1f}")
     print(f"   - Con niveles: {len(niveles)} ({len(niveles)/total*100:.1f}%)")
     if niveles:
-        print(f"     Promedio de niveles: {statistics.mean(niveles):.1f}")
+        print(f"     Promedio de niveles: {statistics.fmean(niveles):.1f}")
     
-    # Analizar amenidades
+    # Amenidades (ya contadas en la pasada principal), las 10 más comunes
     print("\n5. AMENIDADES MÁS COMUNES:")
-    amenidades_count = {}
-    for prop in propiedades:
-        if "caracteristicas" in prop and "amenidades" in prop["caracteristicas"]:
-            for amenidad in prop["caracteristicas"]["amenidades"]:
-                amenidad_norm = normalizar_texto(amenidad)
-                amenidades_count[amenidad_norm] = amenidades_count.get(amenidad_norm, 0) + 1
-    
-    # Ordenar por frecuencia y mostrar las 10 más comunes
-    amenidades_sorted = sorted(amenidades_count.items(), key=lambda x: x[1], reverse=True)
-    for amenidad, count in amenidades_sorted[:10]:
+    for amenidad, count in amenidades.most_common(10):
         porcentaje = (count / total) * 100
         print(f"   {amenidad}: {count} ({porcentaje:.1f}%)")
     
-    # Analizar elementos de seguridad
+    # Elementos de seguridad, todos ordenados por frecuencia
     print("\n6. ELEMENTOS DE SEGURIDAD:")
-    seguridad_count = {}
-    for prop in propiedades:
-        if "caracteristicas" in prop and "seguridad" in prop["caracteristicas"]:
-            for elemento in prop["caracteristicas"]["seguridad"]:
-                elemento_norm = normalizar_texto(elemento)
-                seguridad_count[elemento_norm] = seguridad_count.get(elemento_norm, 0) + 1
-    
-    # Ordenar por frecuencia y mostrar todos
-    seguridad_sorted = sorted(seguridad_count.items(), key=lambda x: x[1], reverse=True)
-    for elemento, count in seguridad_sorted:
+    for elemento, count in seguridad.most_common():
         porcentaje = (count / total) * 100
         print(f"   {elemento}: {count} ({porcentaje:.1f}%)")
     
@@ -1,9 +1,12 @@
 import json
 import re
 from collections import defaultdict
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 import logging
 
+from repositorio_io import cargar_json_cacheado, iterar_propiedades
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,14 +53,13 @@ def normalizar_precio(texto: str) -> float:
 def cargar_datos(archivo: str) -> List[Dict[str, Any]]:
     """Carga los datos del archivo JSON."""
     try:
-        with open(archivo, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-            if isinstance(datos, dict):
-                # Si es un diccionario, extraer las propiedades
-                if "propiedades" in datos:
-                    return datos["propiedades"]
-                return list(datos.values())
-            return datos
+        datos = cargar_json_cacheado(archivo)
+        if isinstance(datos, dict):
+            # Si es un diccionario, extraer las propiedades
+            if "propiedades" in datos:
+                return datos["propiedades"]
+            return list(datos.values())
+        return datos
     except Exception as e:
         logger.error(f"Error cargando archivo {archivo}: {e}")
         return []
@@ -92,8 +94,9 @@ def analizar_tipos_propiedad(propiedades: List[Dict[str, Any]]) -> Dict[str, int
         
         if not tipo:
             tipos["No especificado"] += 1
-            # Loggear los primeros 5 casos sin tipo para análisis
-            if i < 5:
+            # Loggear los primeros 5 casos sin tipo para análisis; el volcado JSON
+            # solo se arma si el nivel DEBUG está activo
+            if i < 5 and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Propiedad sin tipo encontrado (índice {i}):")
                 logger.debug(json.dumps(prop, indent=2, ensure_ascii=False))
         else:
@@ -130,15 +133,50 @@ def analizar_precios(propiedades: List[Dict[str, Any]]) -> Dict[str, Any]:
         "total_propiedades": len(precios)
     }
 
+@dataclass(slots=True)
+class EstadisticaMedida:
+    """Acumula mínimo, máximo, suma y cantidad de una medida en m²."""
+    minimo: Optional[float] = None
+    maximo: Optional[float] = None
+    suma: float = 0
+    cantidad: int = 0
+    
+    def agregar(self, valor: float) -> None:
+        if self.cantidad == 0:
+            self.minimo = self.maximo = valor
+        elif valor < self.minimo:
+            self.minimo = valor
+        elif valor > self.maximo:
+            self.maximo = valor
+        self.suma += valor
+        self.cantidad += 1
+    
+    def resumen(self) -> Dict[str, Any]:
+        """Resumen min/max/promedio con el formato del reporte."""
+        if not self.cantidad:
+            return {"min": 0, "max": 0, "promedio": 0, "total_con_datos": 0}
+        return {
+            "min": self.minimo,
+            "max": self.maximo,
+            "promedio": self.suma / self.cantidad,
+            "total_con_datos": self.cantidad
+        }
+
 def analizar_caracteristicas(propiedades: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Analiza las características principales de las propiedades."""
     stats = {
         "recamaras": defaultdict(int),
         "banos": defaultdict(int),
-        "estacionamientos": defaultdict(int),
-        "superficie_m2": [],
-        "construccion_m2": []
+        "estacionamientos": defaultdict(int)
     }
+    conteo_recamaras = stats["recamaras"]
+    conteo_banos = stats["banos"]
+    conteo_estacionamientos = stats["estacionamientos"]
+    
+    # Superficie y construcción se acumulan (min, max, suma, cantidad) en lugar
+    # de guardar cada valor en una lista
+    superficie = EstadisticaMedida()
+    construccion = EstadisticaMedida()
     
     for prop in propiedades:
         caract = prop.get("caracteristicas", {})
@@ -146,62 +184,37 @@ def analizar_caracteristicas(propiedades: List[Dict[str, Any]]) -> Dict[str, Any
         # Recámaras
         rec = caract.get("recamaras")
         if isinstance(rec, (int, float)) and rec > 0:
-            stats["recamaras"][rec] += 1
+            conteo_recamaras[rec] += 1
             
         # Baños (sumar baños completos y medios baños)
         banos = caract.get("banos", 0)
         medio_bano = caract.get("medio_bano", 0)
         total_banos = (banos if isinstance(banos, (int, float)) else 0) + (0.5 * medio_bano if isinstance(medio_bano, (int, float)) else 0)
         if total_banos > 0:
-            stats["banos"][total_banos] += 1
+            conteo_banos[total_banos] += 1
             
         # Estacionamientos
         est = caract.get("estacionamientos")
         if isinstance(est, (int, float)) and est > 0:
-            stats["estacionamientos"][est] += 1
+            conteo_estacionamientos[est] += 1
             
         # Superficie
         sup = caract.get("superficie_m2")
         if isinstance(sup, (int, float)) and sup > 0:
-            stats["superficie_m2"].append(sup)
+            superficie.agregar(sup)
             
         # Construcción
         con = caract.get("construccion_m2")
         if isinstance(con, (int, float)) and con > 0:
-            stats["construccion_m2"].append(con)
+            construccion.agregar(con)
     
     # Calcular promedios para superficies
-    if stats["superficie_m2"]:
-        stats["superficie_m2"] = {
-            "min": min(stats["superficie_m2"]),
-            "max": max(stats["superficie_m2"]),
-            "promedio": sum(stats["superficie_m2"]) / len(stats["superficie_m2"]),
-            "total_con_datos": len(stats["superficie_m2"])
-        }
-    else:
-        stats["superficie_m2"] = {
-            "min": 0, "max": 0, "promedio": 0, "total_con_datos": 0
-        }
-        
-    if stats["construccion_m2"]:
-        stats["construccion_m2"] = {
-            "min": min(stats["construccion_m2"]),
-            "max": max(stats["construccion_m2"]),
-            "promedio": sum(stats["construccion_m2"]) / len(stats["construccion_m2"]),
-            "total_con_datos": len(stats["construccion_m2"])
-        }
-    else:
-        stats["construccion_m2"] = {
-            "min": 0, "max": 0, "promedio": 0, "total_con_datos": 0
-        }
+    stats["superficie_m2"] = superficie.resumen()
+    stats["construccion_m2"] = construccion.resumen()
     
     return dict(stats)
 
 def analizar_distribucion():
-    # Cargar datos
-    with open('resultados/propiedades_estructuradas.json', 'r') as f:
-        datos = json.load(f)
-
     # Inicializar contadores
     conteo_operaciones = defaultdict(int)
     conteo_precios = {
@@ -210,8 +223,8 @@ def analizar_distribucion():
         "<300k": {"venta": 0, "renta": 0, "desconocido": 0}
     }
 
-    # Analizar cada propiedad
-    for prop in datos["propiedades"]:
+    # Analizar cada propiedad (lectura en streaming del archivo)
+    for prop in iterar_propiedades('resultados/propiedades_estructuradas.json'):
         tipo_op = prop["propiedad"]["tipo_operacion"]
         precio_info = prop["propiedad"]["precio"]
         
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+busqueda_texto.py
+
+Búsqueda de catálogos de palabras clave {campo: [palabras]} en descripciones,
+compartida por el extractor y el procesador de propiedades.
+"""
+
+from typing import Dict, List
+
+# Autómata Aho-Corasick para buscar muchas palabras clave en una sola pasada
+try:
+    import ahocorasick
+    AHOCORASICK_DISPONIBLE = True
+except ImportError:
+    AHOCORASICK_DISPONIBLE = False
+
+def compilar_catalogo(catalogo: Dict[str, List[str]]):
+    """
+    Construye un autómata con todas las palabras del catálogo {campo: [palabras]}.
+    Cada palabra guarda los campos a los que pertenece.
+    """
+    if not AHOCORASICK_DISPONIBLE:
+        return None
+
+    campos_por_palabra = {}
+    for campo, palabras in catalogo.items():
+        for palabra in palabras:
+            campos_por_palabra.setdefault(palabra, set()).add(campo)
+
+    automata = ahocorasick.Automaton()
+    for palabra, campos in campos_por_palabra.items():
+        automata.add_word(palabra, frozenset(campos))
+    automata.make_automaton()
+    return automata
+
+def campos_presentes(texto: str, catalogo: Dict[str, List[str]], automata) -> set:
+    """
+    Retorna los campos del catálogo que tienen al menos una palabra en el texto.
+    """
+    if automata is None:
+        return {campo for campo, palabras in catalogo.items() if any(palabra in texto for palabra in palabras)}
+
+    campos = set()
+    for _, encontrados in automata.iter(texto):
+        campos |= encontrados
+    return campos
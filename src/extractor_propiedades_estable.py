@@ -1,7 +1,15 @@
-import json
+import os
 import re
+import hashlib
+import shelve
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Union, Optional, Tuple
 
+import busqueda_texto
+from busqueda_texto import compilar_catalogo, campos_presentes
+from repositorio_io import cargar_json, guardar_json
+
 def normalizar_precio(texto: str) -> Tuple[float, str]:
     """
     Extrae y normaliza el precio y la moneda desde el texto.
@@ -43,6 +51,28 @@ def normalizar_precio(texto: str) -> Tuple[float, str]:
     
     return 0, 'MXN'
 
+# Patrones de tipo de operación compilados una sola vez al importar el módulo.
+# Cada grupo es una sola alternación: una pasada por el texto en lugar de una por patrón.
+_INDICADORES_VENTA = (
+    r'\bventa\b', r'\bvendo\b', r'\bse vende\b', r'\ben venta\b',
+    r'\bcompra\b', r'\badquiere\b', r'\bprecio de venta\b'
+)
+
+_INDICADORES_RENTA = (
+    r'\brenta\b', r'\bse renta\b', r'\ben renta\b', r'\barrendamiento\b',
+    r'\barriendo\b', r'\brentar?\b', r'\bprecio de renta\b',
+    r'\bmensual\b', r'\bal mes\b', r'\bpor mes\b'
+)
+
+_RE_VENTA = re.compile("|".join(f"(?:{p})" for p in _INDICADORES_VENTA))
+_RE_RENTA = re.compile("|".join(f"(?:{p})" for p in _INDICADORES_RENTA))
+
+_RE_PRECIO_MENSUAL = re.compile(r'\$[\d,\.]+\s*(?:al mes|mensuales?|por mes)')
+
+# Literales presentes en cualquier coincidencia de cada grupo; si faltan, se omiten las regex
+_LITERALES_VENTA = ("vent", "vend", "compra", "adquiere")
+_LITERALES_RENTA = ("rent", "arrendamiento", "arriendo", "mensual", "al mes", "por mes")
+
 def extraer_tipo_operacion(texto: str) -> str:
     """
     Extrae el tipo de operación (venta/renta) del texto.
@@ -50,27 +80,14 @@ def extraer_tipo_operacion(texto: str) -> str:
     """
     texto = texto.lower()
     
-    indicadores_venta = [
-        r'\bventa\b', r'\bvendo\b', r'\bse vende\b', r'\ben venta\b',
-        r'\bcompra\b', r'\badquiere\b', r'\bprecio de venta\b'
-    ]
+    if any(literal in texto for literal in _LITERALES_VENTA) and _RE_VENTA.search(texto):
+        return "venta"
     
-    indicadores_renta = [
-        r'\brenta\b', r'\bse renta\b', r'\ben renta\b', r'\barrendamiento\b',
-        r'\barriendo\b', r'\brentar?\b', r'\bprecio de renta\b',
-        r'\bmensual\b', r'\bal mes\b', r'\bpor mes\b'
-    ]
-    
-    for patron in indicadores_venta:
-        if re.search(patron, texto):
-            return "venta"
-            
-    for patron in indicadores_renta:
-        if re.search(patron, texto):
-            return "renta"
+    if any(literal in texto for literal in _LITERALES_RENTA) and _RE_RENTA.search(texto):
+        return "renta"
     
     # Si hay un precio mensual, es renta
-    if re.search(r'\$[\d,\.]+\s*(?:al mes|mensuales?|por mes)', texto):
+    if "$" in texto and _RE_PRECIO_MENSUAL.search(texto):
         return "renta"
         
     return "No especificado"
@@ -124,11 +141,12 @@ def extraer_tipo_propiedad(texto: str) -> str:
     
     return "No especificado"
 
-def extraer_superficie(texto: str) -> Dict[str, int]:
+def extraer_superficie(texto_minusculas: str) -> Dict[str, int]:
     """
     Extrae superficie total y construida con patrones mejorados.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower().strip()
+    texto = texto_minusculas.strip()
     resultado = {"superficie_m2": 0, "construccion_m2": 0}
     
     # Limpiar el texto para facilitar la detección
@@ -288,12 +306,36 @@ def extraer_superficie(texto: str) -> Dict[str, int]:
     
     return resultado
 
-def extraer_caracteristicas(texto: str) -> Dict:
+# Patrones de características compilados una sola vez al importar el módulo
+_PATRONES_RECAMARAS = [re.compile(p) for p in (
+    r'(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?|cuartos?)',
+    r'(?:rec[aá]maras?|habitaciones?|dormitorios?)\s*:\s*(\d+)'
+)]
+
+_RE_BANOS_COMPLETOS = re.compile(r'baño(?:s)?\s+completo(?:s)?')
+_RE_BANOS = re.compile(r'(\d+)\s*baño(?:s)?(?!\s*(?:medio|1/2))')
+_RE_MEDIOS_BANOS = re.compile(r'(?:medio|1/2)\s+baño(?:s)?')
+_RE_NIVELES = re.compile(r'(\d+)\s*(?:nivele?s?|piso?s?|plantas?)')
+
+_PATRONES_ESTACIONAMIENTO = [re.compile(p) for p in (
+    r'(\d+)\s*(?:cajones?|lugares?|espacios?)\s*(?:de\s*)?estacionamiento',
+    r'estacionamiento\s*(?:para)?\s*(\d+)\s*(?:auto|carro|coche|vehículo)',
+    r'(\d+)\s*(?:autos?|carros?|coches?|vehículos?)\s*(?:en\s*)?(?:estacionamiento|cochera)'
+)]
+
+_RE_EDAD_ANIOS = re.compile(r'(\d+)\s*años?(?:\s*de\s*(?:antigüedad|construcción))?')
+
+# Literales que aparecen en cualquier coincidencia de cada grupo de patrones:
+# si ninguno está en el texto, el grupo no puede coincidir y se omite la regex.
+_LITERALES_RECAMARAS = ("rec", "habitacion", "dormitorio", "cuarto")
+_LITERALES_NIVELES = ("nivel", "pis", "planta")
+_LITERALES_ESTACIONAMIENTO = ("estacionamiento", "cochera")
+
+def extraer_caracteristicas(texto_minusculas: str) -> Dict:
     """
     Extrae características con patrones mejorados.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower()
-    
     caracteristicas = {
         "recamaras": 0,
         "banos": 0,
@@ -306,113 +348,72 @@ def extraer_caracteristicas(texto: str) -> Dict:
     }
     
     # Recámaras
-    recamaras_patterns = [
-        r'(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?|cuartos?)',
-        r'(?:rec[aá]maras?|habitaciones?|dormitorios?)\s*:\s*(\d+)'
-    ]
-    
-    for pattern in recamaras_patterns:
-        if match := re.search(pattern, texto):
-            caracteristicas["recamaras"] = int(match.group(1))
-            break
-    
-    # Baños
-    banos_completos = len(re.findall(r'baño(?:s)?\s+completo(?:s)?', texto))
-    if banos_completos > 0:
-        caracteristicas["banos"] = banos_completos
-    else:
-        if match := re.search(r'(\d+)\s*baño(?:s)?(?!\s*(?:medio|1/2))', texto):
-            caracteristicas["banos"] = int(match.group(1))
+    if any(literal in texto_minusculas for literal in _LITERALES_RECAMARAS):
+        for pattern in _PATRONES_RECAMARAS:
+            if match := pattern.search(texto_minusculas):
+                caracteristicas["recamaras"] = int(match.group(1))
+                break
     
-    # Medios baños
-    medios_banos = len(re.findall(r'(?:medio|1/2)\s+baño(?:s)?', texto))
-    if medios_banos > 0:
-        caracteristicas["medio_bano"] = medios_banos
+    # Baños y medios baños (todos los patrones contienen "baño")
+    if "baño" in texto_minusculas:
+        banos_completos = len(_RE_BANOS_COMPLETOS.findall(texto_minusculas))
+        if banos_completos > 0:
+            caracteristicas["banos"] = banos_completos
+        else:
+            if match := _RE_BANOS.search(texto_minusculas):
+                caracteristicas["banos"] = int(match.group(1))
+        
+        medios_banos = len(_RE_MEDIOS_BANOS.findall(texto_minusculas))
+        if medios_banos > 0:
+            caracteristicas["medio_bano"] = medios_banos
     
     # Niveles
-    if "planta alta" in texto or "segundo piso" in texto:
+    if "planta alta" in texto_minusculas or "segundo piso" in texto_minusculas:
         caracteristicas["niveles"] = max(2, caracteristicas["niveles"])
-    if match := re.search(r'(\d+)\s*(?:nivele?s?|piso?s?|plantas?)', texto):
-        caracteristicas["niveles"] = int(match.group(1))
+    if any(literal in texto_minusculas for literal in _LITERALES_NIVELES):
+        if match := _RE_NIVELES.search(texto_minusculas):
+            caracteristicas["niveles"] = int(match.group(1))
     
     # Estacionamientos
-    estacionamiento_patterns = [
-        r'(\d+)\s*(?:cajones?|lugares?|espacios?)\s*(?:de\s*)?estacionamiento',
-        r'estacionamiento\s*(?:para)?\s*(\d+)\s*(?:auto|carro|coche|vehículo)',
-        r'(\d+)\s*(?:autos?|carros?|coches?|vehículos?)\s*(?:en\s*)?(?:estacionamiento|cochera)'
-    ]
-    
-    for pattern in estacionamiento_patterns:
-        if match := re.search(pattern, texto):
-            caracteristicas["estacionamientos"] = int(match.group(1))
-            break
+    if any(literal in texto_minusculas for literal in _LITERALES_ESTACIONAMIENTO):
+        for pattern in _PATRONES_ESTACIONAMIENTO:
+            if match := pattern.search(texto_minusculas):
+                caracteristicas["estacionamientos"] = int(match.group(1))
+                break
     
     # Características booleanas
-    caracteristicas["recamara_planta_baja"] = "recámara en planta baja" in texto or ("recamara" in texto and "planta baja" in texto)
-    caracteristicas["cisterna"] = any(term in texto for term in ["cisterna", "aljibe"])
+    caracteristicas["recamara_planta_baja"] = "recámara en planta baja" in texto_minusculas or ("recamara" in texto_minusculas and "planta baja" in texto_minusculas)
+    caracteristicas["cisterna"] = any(term in texto_minusculas for term in ["cisterna", "aljibe"])
     
     # Edad/Antigüedad
-    if "nueva" in texto or "nuevo" in texto or "estrenar" in texto:
+    if "nueva" in texto_minusculas or "nuevo" in texto_minusculas or "estrenar" in texto_minusculas:
         caracteristicas["edad"] = "nuevo"
-    elif match := re.search(r'(\d+)\s*años?(?:\s*de\s*(?:antigüedad|construcción))?', texto):
+    elif "año" in texto_minusculas and (match := _RE_EDAD_ANIOS.search(texto_minusculas)):
         caracteristicas["edad"] = f"{match.group(1)} años"
     
     return caracteristicas
 
-def extraer_amenidades(texto: str) -> Dict[str, bool]:
+_CATALOGO_AMENIDADES = {
+    "seguridad": ["seguridad", "vigilancia", "privada", "caseta", "acceso controlado"],
+    "alberca": ["alberca", "piscina", "pool"],
+    "patio": ["patio", "área exterior"],
+    "bodega": ["bodega", "storage"],
+    "terraza": ["terraza", "balcón", "balcon"],
+    "jardin": ["jardin", "jardín", "área verde"],
+    "estudio": ["estudio", "oficina", "despacho"],
+    "roof_garden": ["roof garden", "roofgarden", "roof-garden", "terraza en azotea"]
+}
+_AUTOMATA_AMENIDADES = compilar_catalogo(_CATALOGO_AMENIDADES)
+
+def extraer_amenidades(texto_minusculas: str) -> Dict[str, bool]:
     """
     Extrae amenidades con patrones mejorados.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower()
-    
-    amenidades = {
-        "seguridad": False,
-        "alberca": False,
-        "patio": False,
-        "bodega": False,
-        "terraza": False,
-        "jardin": False,
-        "estudio": False,
-        "roof_garden": False
-    }
-    
-    # Seguridad
-    amenidades["seguridad"] = any(term in texto for term in [
-        "seguridad", "vigilancia", "privada", "caseta", "acceso controlado"
-    ])
-    
-    # Alberca
-    amenidades["alberca"] = any(term in texto for term in [
-        "alberca", "piscina", "pool"
-    ])
-    
-    # Patio
-    amenidades["patio"] = "patio" in texto or "área exterior" in texto
+    # Un solo recorrido del texto para todas las amenidades
+    presentes = campos_presentes(texto_minusculas, _CATALOGO_AMENIDADES, _AUTOMATA_AMENIDADES)
     
-    # Bodega
-    amenidades["bodega"] = "bodega" in texto or "storage" in texto
-    
-    # Terraza
-    amenidades["terraza"] = any(term in texto for term in [
-        "terraza", "balcón", "balcon"
-    ])
-    
-    # Jardín
-    amenidades["jardin"] = any(term in texto for term in [
-        "jardin", "jardín", "área verde"
-    ])
-    
-    # Estudio
-    amenidades["estudio"] = any(term in texto for term in [
-        "estudio", "oficina", "despacho"
-    ])
-    
-    # Roof Garden
-    amenidades["roof_garden"] = any(term in texto for term in [
-        "roof garden", "roofgarden", "roof-garden", "terraza en azotea"
-    ])
-    
-    return amenidades
+    return {amenidad: amenidad in presentes for amenidad in _CATALOGO_AMENIDADES}
 
 def limpiar_y_normalizar_referencias(referencias: List[str]) -> List[str]:
     """
@@ -1148,40 +1149,31 @@ def extraer_ubicacion(texto: str, location: str = "", ciudad: str = "") -> Dict[
     
     return ubicacion
 
-def extraer_legal(texto: str) -> Dict:
+_FORMAS_DE_PAGO = ("contado", "crédito", "infonavit")
+
+_CATALOGO_LEGAL = {
+    "escrituras": ["escrituras", "escriturada", "título de propiedad"],
+    "cesion_derechos": ["cesión de derechos", "cesion de derechos", "traspaso"],
+    # Formas de pago
+    "contado": ["contado", "efectivo"],
+    "crédito": ["credito", "crédito", "bancario", "hipotecario"],
+    "infonavit": ["infonavit", "fovissste", "issste"],
+}
+_AUTOMATA_LEGAL = compilar_catalogo(_CATALOGO_LEGAL)
+
+def extraer_legal(texto_minusculas: str) -> Dict:
     """
     Extrae información legal con patrones mejorados.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower()
-    
-    legal = {
-        "escrituras": False,
-        "cesion_derechos": False,
-        "formas_de_pago": []
-    }
+    # Un solo recorrido del texto para escrituras, cesión y formas de pago
+    presentes = campos_presentes(texto_minusculas, _CATALOGO_LEGAL, _AUTOMATA_LEGAL)
     
-    # Escrituras
-    legal["escrituras"] = any(term in texto for term in [
-        "escrituras", "escriturada", "título de propiedad"
-    ])
-    
-    # Cesión de derechos
-    legal["cesion_derechos"] = any(term in texto for term in [
-        "cesión de derechos", "cesion de derechos", "traspaso"
-    ])
-    
-    # Formas de pago
-    formas_pago = {
-        "contado": ["contado", "efectivo"],
-        "crédito": ["credito", "crédito", "bancario", "hipotecario"],
-        "infonavit": ["infonavit", "fovissste", "issste"],
+    return {
+        "escrituras": "escrituras" in presentes,
+        "cesion_derechos": "cesion_derechos" in presentes,
+        "formas_de_pago": [forma for forma in _FORMAS_DE_PAGO if forma in presentes]
     }
-    
-    for forma, keywords in formas_pago.items():
-        if any(keyword in texto for keyword in keywords):
-            legal["formas_de_pago"].append(forma)
-    
-    return legal
 
 def extraer_precios(texto: str) -> Dict[str, Union[str, float]]:
     """
@@ -1320,12 +1312,11 @@ def validar_precio_por_zona(precio: float, zona: str, tipo_operacion: str) -> bo
     min_precio, max_precio = rango
     return min_precio <= precio <= max_precio
 
-def extraer_mantenimiento(texto: str) -> Dict[str, str]:
+def extraer_mantenimiento(texto_minusculas: str) -> Dict[str, str]:
     """
     Extrae información sobre mantenimiento y cuotas.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower()
-    
     resultado = {
         "cuota_mantenimiento": "",
         "periodo": "",
@@ -1343,14 +1334,14 @@ def extraer_mantenimiento(texto: str) -> Dict[str, str]:
     ]
     
     # Detectar periodo
-    if 'mensual' in texto or 'al mes' in texto or 'por mes' in texto:
+    if 'mensual' in texto_minusculas or 'al mes' in texto_minusculas or 'por mes' in texto_minusculas:
         resultado["periodo"] = "mensual"
-    elif 'anual' in texto or 'al año' in texto or 'por año' in texto:
+    elif 'anual' in texto_minusculas or 'al año' in texto_minusculas or 'por año' in texto_minusculas:
         resultado["periodo"] = "anual"
     
     # Buscar monto de mantenimiento
     for patron in patrones:
-        if match := re.search(patron, texto):
+        if match := re.search(patron, texto_minusculas):
             try:
                 valor = float(match.group(1).replace(',', ''))
                 # Validar que el valor sea razonable
@@ -1379,7 +1370,7 @@ def extraer_mantenimiento(texto: str) -> Dict[str, str]:
     }
     
     # Buscar menciones de servicios incluidos
-    contexto_incluye = re.findall(r'(?:incluye|con|cubre)\s*(?::|los siguientes servicios)?([^\.]+)', texto)
+    contexto_incluye = re.findall(r'(?:incluye|con|cubre)\s*(?::|los siguientes servicios)?([^\.]+)', texto_minusculas)
     for contexto in contexto_incluye:
         for servicio, patrones_servicio in servicios.items():
             for patron in patrones_servicio:
@@ -1389,11 +1380,11 @@ def extraer_mantenimiento(texto: str) -> Dict[str, str]:
     
     return resultado
 
-def obtener_puntos_interes(texto: str) -> List[Dict[str, str]]:
+def obtener_puntos_interes(texto_minusculas: str) -> List[Dict[str, str]]:
     """
     Detecta referencias a puntos de interés en el texto.
+    El texto debe llegar en minúsculas (procesar_propiedad lo normaliza una sola vez).
     """
-    texto = texto.lower()
     
     # Diccionario de puntos de interés conocidos
     puntos_interes = {
@@ -1487,7 +1478,7 @@ def obtener_puntos_interes(texto: str) -> List[Dict[str, str]]:
                 # Buscar la mejor referencia para este lugar
                 for patron_dist in patrones_distancia:
                     patron_completo = f"{patron_dist}.*?{lugar}"
-                    if match := re.search(patron_completo, texto):
+                    if match := re.search(patron_completo, texto_minusculas):
                         referencia = {
                             "tipo": categoria,
                             "subtipo": subcategoria,
@@ -1509,7 +1500,7 @@ def obtener_puntos_interes(texto: str) -> List[Dict[str, str]]:
                                 mejor_referencia = referencia
                 
                 # Si no encontramos referencia con patrón pero el lugar está mencionado
-                if not mejor_referencia and lugar in texto:
+                if not mejor_referencia and lugar in texto_minusculas:
                     mejor_referencia = {
                         "tipo": categoria,
                         "subtipo": subcategoria,
@@ -1538,32 +1529,38 @@ def procesar_propiedad(id_prop: str, datos: Dict) -> Dict:
     link = str(datos.get("link", ""))
     titulo = str(datos.get("titulo", ""))
     
+    # Descripción y título se unen una sola vez para ambos clasificadores
+    texto_con_titulo = descripcion + " " + titulo
+    
     # Extraer tipo de operación
-    tipo_operacion = extraer_tipo_operacion(descripcion + " " + titulo)
+    tipo_operacion = extraer_tipo_operacion(texto_con_titulo)
     
     # Extraer tipo de propiedad
-    tipo_propiedad = extraer_tipo_propiedad(descripcion + " " + titulo)
+    tipo_propiedad = extraer_tipo_propiedad(texto_con_titulo)
+    
+    # Normalizar la descripción una sola vez para todos los extractores
+    texto_completo = descripcion.lower()
     
     # Extraer superficie y construcción
-    superficies = extraer_superficie(descripcion)
+    superficies = extraer_superficie(texto_completo)
     
     # Extraer características
-    caracteristicas = extraer_caracteristicas(descripcion)
+    caracteristicas = extraer_caracteristicas(texto_completo)
     
     # Extraer amenidades
-    amenidades = extraer_amenidades(descripcion)
+    amenidades = extraer_amenidades(texto_completo)
     
     # Extraer ubicación
     ubicacion = extraer_ubicacion(descripcion, location, ciudad)
     
     # Extraer información legal
-    legal = extraer_legal(descripcion)
+    legal = extraer_legal(texto_completo)
     
     # Extraer mantenimiento
-    mantenimiento = extraer_mantenimiento(descripcion)
+    mantenimiento = extraer_mantenimiento(texto_completo)
     
     # Extraer puntos de interés
-    puntos_interes = obtener_puntos_interes(descripcion)
+    puntos_interes = obtener_puntos_interes(texto_completo)
     
     # Agregar puntos de interés a la ubicación
     if puntos_interes:
@@ -1591,6 +1588,193 @@ def procesar_propiedad(id_prop: str, datos: Dict) -> Dict:
         }
     }
 
+# Caché en disco de procesar_propiedad. La huella forma parte de la clave, así que
+# cualquier cambio en los extractores invalida lo guardado: cubre este módulo,
+# busqueda_texto (búsqueda de catálogos) y si se usa el autómata o la búsqueda
+# de subcadenas, según esté instalado pyahocorasick.
+CACHE_EXTRACCION = "resultados/cache_extraccion"
+_huella = hashlib.blake2b(digest_size=8)
+for _ruta in (__file__, busqueda_texto.__file__):
+    with open(_ruta, "rb") as _f:
+        _huella.update(_f.read())
+_huella.update(b"ahocorasick" if busqueda_texto.AHOCORASICK_DISPONIBLE else b"subcadenas")
+_HUELLA_EXTRACTOR = _huella.hexdigest()
+
+def _clave_cache(id_prop: str, datos: Dict) -> str:
+    """Hash de los campos que usa procesar_propiedad."""
+    campos = [_HUELLA_EXTRACTOR, str(id_prop)]
+    campos += [str(datos.get(c, "")) for c in ("description", "precio", "location", "ciudad", "link", "titulo")]
+    return hashlib.blake2b("\x1f".join(campos).encode("utf-8"), digest_size=16).hexdigest()
+
+# procesar_propiedad tarda decenas de ms por propiedad; las que no están en caché
+# se reparten entre procesos cuando son suficientes para compensar el arranque del pool
+PROCESOS_EXTRACCION = os.cpu_count() or 1
+MINIMO_PARA_PARALELO = 64
+
+def _procesar_en_proceso(pendiente: Tuple[str, Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+    """Ejecuta procesar_propiedad en un proceso del pool; devuelve (resultado, error)."""
+    id_prop, datos = pendiente
+    try:
+        return procesar_propiedad(id_prop, datos), None
+    except Exception as e:
+        return None, str(e)
+
+def procesar_pendientes(pendientes: List[Tuple[str, Dict]]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Procesa una lista de (id, datos) y devuelve sus (resultado, error) en el mismo orden,
+    en paralelo con ProcessPoolExecutor si hay suficientes propiedades.
+    """
+    if PROCESOS_EXTRACCION < 2 or len(pendientes) < MINIMO_PARA_PARALELO:
+        return [_procesar_en_proceso(p) for p in pendientes]
+    # Lotes grandes para que el costo de serializar cada tarea sea despreciable
+    tamano_lote = max(1, len(pendientes) // (PROCESOS_EXTRACCION * 4))
+    with ProcessPoolExecutor(max_workers=PROCESOS_EXTRACCION) as pool:
+        return list(pool.map(_procesar_en_proceso, pendientes, chunksize=tamano_lote))
+
+# Patrones de es_propiedad. Cada lista se une en una sola alternación compilada
+# al importar: una búsqueda recorre el texto una vez en lugar de una por patrón.
+_PATRONES_DESCRIPCION_PROPIEDAD = [
+    # Patrones en español
+    r'(?:casa|departamento|terreno|local|propiedad)\s+(?:en|de)\s+(?:venta|renta)',
+    r'\d+\s*(?:habitaciones|recamaras|banos|cuartos)',
+    r'(?:superficie|terreno|construccion):\s*\d+\s*m2',
+    r'(?:bienes raices|inmobiliaria)',
+    r'codigo\s+[a-z]\d+',  # Para códigos de inmobiliarias
+    r'\$[\d,\.]+(?:\s*(?:m\.n\.|mxn|pesos))?',  # Para precios en formato mexicano
+    r'(?:planta\s+(?:baja|alta))',  # Para descripciones de niveles
+    r'(?:estancia|comedor|cocina|area\s+de\s+lavado)',  # Áreas comunes
+    r'(?:habitaciones?|recamaras?|dormitorios?|cuartos?)',  # Dormitorios
+    r'(?:bano\s+completo|medio\s+bano|bano\s+privado)',  # Baños
+    r'(?:estacionamiento|cochera)',  # Estacionamiento
+    r'(?:balcon|terraza|patio)',  # Áreas exteriores
+    r'(?:escrituras?|titulo\s+de\s+propiedad)',  # Documentación
+    r'(?:infonavit|fovissste|credito)',  # Financiamiento
+    r'(?:m2|metros\s+cuadrados)',  # Medidas
+    r'(?:ubicado|ubicada)\s+en',  # Ubicación
+    r'(?:cerca\s+de|proximo\s+a|a\s+unos\s+pasos)',  # Referencias
+    r'(?:vigilancia|seguridad)\s+24',  # Seguridad
+    r'(?:acabados|remodelado|nuevo)',  # Estado
+    r'(?:oportunidad|inversion|plusvalia)',  # Términos de venta
+    r'(?:rento|alquilo)\s+(?:cuarto|habitacion|recamara|departamento)',  # Rentas
+    r'(?:servicios?|internet|luz|agua)\s+incluidos?',  # Servicios incluidos
+    r'(?:amueblado|sin amueblar)',  # Amueblado
+    r'(?:estudiantes?|profesionistas?)',  # Público objetivo
+    r'entrada\s+independiente',  # Características específicas
+    
+    # Patrones en inglés
+    r'(?:house|home|apartment|condo|townhouse|property)\s+(?:for\s+)?(?:sale|rent)',
+    r'(?:\d+)\s*(?:bed|bath|bedroom|bathroom)',
+    r'(?:sq\s*ft|square\s*feet)',
+    r'(?:real\s+estate|realty)',
+    r'(?:listing|mls)',
+    r'(?:residential|commercial)\s+(?:property|building)',
+    r'(?:utilities|internet|water|electricity)\s+included',
+    r'(?:furnished|unfurnished)',
+    r'(?:private|shared)\s+(?:bathroom|entrance)',
+    r'(?:parking|garage)',
+    r'(?:yard|garden|patio)',
+    r'(?:location|near|close\s+to)',
+    r'(?:investment|opportunity)',
+    r'(?:remodeled|updated|new)',
+    r'(?:students|professionals)',
+    r'(?:lease|rental)',
+    r'(?:studio|loft)',
+    r'(?:amenities|features)',
+    r'(?:security|gated)',
+    r'(?:community|complex)'
+]
+
+_PATRONES_DIMENSION = [
+    r'\d+\s*m2', r'\d+\s*metros?\s*cuadrados?',
+    r'terreno\s*(?:de)?\s*\d+',
+    r'construccion\s*(?:de)?\s*\d+',
+    r'superficie\s*(?:de)?\s*\d+',
+    r'\d+\s*mts?2?',  # Detectar "200 mt2", "200 mts", etc.
+    r'\d+\s*m²',  # Detectar con símbolo especial de metros cuadrados
+    r'(?:terreno|construccion|superficie):\s*\d+\s*m?2?',  # "terreno: 200m2"
+    r'frente\s*(?:de)?\s*\d+(?:\.\d+)?\s*mts?',  # "frente de 23.71 mts"
+    r'superficie\s*plana\s*(?:de)?\s*\d+',  # "superficie plana de 300"
+    r'\$\s*\d+(?:,\d+)*(?:\.\d+)?\s*(?:m2|mt2|mts2|por\s+metro\s+cuadrado)',  # "$3,000 por metro cuadrado"
+    r'\d+(?:\.\d+)?\s*(?:x|por)\s*\d+(?:\.\d+)?\s*(?:m2|mts?)?',  # "10 x 20", "10.5 x 20.5 m2"
+    r'\d+\s*sq\s*ft',  # Medidas en inglés
+    r'\d+\s*square\s*feet'
+]
+
+_RE_DESCRIPCION_PROPIEDAD = re.compile("|".join(f"(?:{p})" for p in _PATRONES_DESCRIPCION_PROPIEDAD), re.IGNORECASE)
+_RE_DIMENSION = re.compile("|".join(f"(?:{p})" for p in _PATRONES_DIMENSION), re.IGNORECASE)
+
+# Palabras clave que indican una propiedad (algunas repetidas: cada repetición cuenta)
+_PALABRAS_CLAVE_PROPIEDAD = [
+    'casa', 'depto', 'departamento', 'terreno', 'lote', 'venta', 'renta',
+    'recamara', 'recamaras', 'habitacion', 'habitaciones', 'm2', 'metros',
+    'fraccionamiento', 'privada', 'condominio', 'alberca', 'jardin', 'jardin',
+    'estacionamiento', 'garage', 'cochera', 'bano', 'banos', 'cocina',
+    'sala', 'comedor', 'escrituras', 'infonavit', 'fovissste', 'credito',
+    'construccion', 'construccion', 'plusvalia', 'plusvalia', 'inversion',
+    'bienes raices', 'inmobiliaria', 'amenidades', 'vigilancia', 'seguridad',
+    'roof garden', 'terraza', 'balcon', 'balcon', 'cuarto de servicio',
+    'area de lavado', 'area de lavado', 'cisterna', 'tinaco', 'gas estacionario',
+    'propiedad', 'inmueble', 'finca', 'residencia', 'vivienda', 'hogar',
+    'duplex', 'triplex', 'penthouse', 'ph', 'suite', 'estudio', 'oficina',
+    'local', 'bodega', 'nave', 'consultorio', 'edificio', 'planta baja',
+    'planta alta', 'piso', 'nivel', 'acabados', 'remodelada', 'nueva',
+    'estrenar', 'ubicada', 'ubicado', 'cerca de', 'zona', 'colonia',
+    'fraccion', 'fracc', 'unidad', 'conjunto', 'residencial', 'habitacional',
+    'minisplit', 'closet', 'vestidor', 'porton', 'porton', 'reja',
+    'constancia comunal', 'sesion de derechos', 'superficie plana',
+    'bardado', 'toma de agua', 'frente', 'calefaccion solar',
+    'regadera exterior', 'iluminacion natural', 'ventilacion',
+    'preventa', 'estrena ya', 'meses sin intereses', 'caseta',
+    'green', 'hoyo', 'country club', 'residencial', 'exclusiva',
+    'desarrollo', 'lotificar', 'avenida principal', 'monoambiente',
+    'loft', 'bungalo', 'bungalow', 'townhouse', 'tiny house',
+    'cuarto', 'recamara', 'habitacion',
+    # Palabras clave en inglés
+    'house', 'home', 'apartment', 'condo', 'townhouse', 'property',
+    'real estate', 'bedroom', 'bathroom', 'kitchen', 'living room',
+    'dining room', 'garage', 'yard', 'garden', 'patio', 'pool',
+    'security', 'gated', 'community', 'complex', 'utilities',
+    'furnished', 'unfurnished', 'remodeled', 'updated', 'new',
+    'location', 'near', 'close to', 'investment', 'opportunity',
+    'residential', 'commercial', 'studio', 'loft', 'amenities',
+    'features', 'parking', 'storage', 'laundry'
+]
+
+# Ubicaciones específicas de Morelos
+_UBICACIONES_MORELOS = [
+    'cuernavaca', 'jiutepec', 'temixco', 'emiliano zapata', 'xochitepec',
+    'yautepec', 'cuautla', 'jojutla', 'zacatepec', 'tepoztlan', 'tepoztlan',
+    'civac', 'tezoyuca', 'tejalpa', 'zapata', 'las fuentes',
+    'la pradera', 'la joya', 'el miraval', 'la herradura',
+    'lomas de la herradura', 'lomas de cuernavaca', 'lomas de cocoyoc',
+    'club de golf', 'hacienda de las palmas', 'rinconada',
+    'buenavista', 'centro', 'la carolina', 'las palmas',
+    'los pinos', 'los ciruelos', 'los limones', 'los naranjos',
+    'los sabinos', 'los laureles', 'los cedros', 'los robles',
+    'los almendros', 'los olivos', 'los mangos', 'los duraznos',
+    'las flores', 'las rosas', 'las margaritas', 'las violetas',
+    'las azucenas', 'las orquideas', 'las bugambilias',
+    'ahuatepec', 'ocotepec', 'chapultepec', 'tlaltenango',
+    'vista hermosa', 'palmira', 'delicias', 'reforma',
+    'san anton', 'san jeronimo', 'santa maria',
+    'burgos', 'sumiya', 'tabachines', 'los cizos', 'acapantzingo',
+    'campo verde', 'las aguilas', 'las aguilas', 'las palmas',
+    'chipitlan', 'antonio barona', 'atlacomulco', 'huitzilac',
+    'paraiso', 'country club', 'milpillas', 'paseos del rio',
+    'jardines de delicias', 'nueva santa maria', 'tulipanes',
+    'texcal', 'upemor', 'satelite'  # Agregadas nuevas ubicaciones
+]
+
+# es_propiedad cuenta cuántas entradas de la lista aparecen en el texto. Un solo
+# autómata encuentra las palabras distintas presentes en una pasada y la
+# multiplicidad conserva el conteo de las repetidas.
+_MULTIPLICIDAD_PALABRAS_CLAVE = Counter(_PALABRAS_CLAVE_PROPIEDAD)
+_CATALOGO_PALABRAS_CLAVE = {palabra: [palabra] for palabra in _MULTIPLICIDAD_PALABRAS_CLAVE}
+_AUTOMATA_PALABRAS_CLAVE = compilar_catalogo(_CATALOGO_PALABRAS_CLAVE)
+
+_CATALOGO_UBICACIONES = {"ubicacion": _UBICACIONES_MORELOS}
+_AUTOMATA_UBICACIONES = compilar_catalogo(_CATALOGO_UBICACIONES)
+
 def es_propiedad(texto: str, titulo: str, precio: str = "", location: str = "") -> bool:
     """
     Determina si el elemento es una propiedad inmobiliaria o no.
@@ -1641,8 +1825,8 @@ def es_propiedad(texto: str, titulo: str, precio: str = "", location: str = "")
     # Si el título es genérico ("Chats" o "Marketplace"), nos enfocamos en la descripción
     if titulo in ["chats", "marketplace", "(20+) marketplace - venta", "notificaciones"]:
         # Verificar si la primera línea de la descripción contiene información de propiedad
-        primera_linea = texto.split('\n')[0] if texto else ""
-        if any(palabra in primera_linea.lower() for palabra in [
+        primera_linea = (texto.split('\n')[0] if texto else "").lower()
+        if any(palabra in primera_linea for palabra in [
             'casa', 'departamento', 'terreno', 'local', 'propiedad', 'venta', 'renta',
             'habitaciones', 'recamaras', 'baños', 'inmueble', 'bienes raices', 'cuarto',
             'recamara', 'habitacion', 'monoambiente', 'loft', 'bungalo', 'bungalow'
@@ -1650,155 +1834,30 @@ def es_propiedad(texto: str, titulo: str, precio: str = "", location: str = "")
             return True
             
         # Buscar patrones específicos en la descripción completa
-        patrones_descripcion = [
-            # Patrones en español
-            r'(?:casa|departamento|terreno|local|propiedad)\s+(?:en|de)\s+(?:venta|renta)',
-            r'\d+\s*(?:habitaciones|recamaras|banos|cuartos)',
-            r'(?:superficie|terreno|construccion):\s*\d+\s*m2',
-            r'(?:bienes raices|inmobiliaria)',
-            r'codigo\s+[a-z]\d+',  # Para códigos de inmobiliarias
-            r'\$[\d,\.]+(?:\s*(?:m\.n\.|mxn|pesos))?',  # Para precios en formato mexicano
-            r'(?:planta\s+(?:baja|alta))',  # Para descripciones de niveles
-            r'(?:estancia|comedor|cocina|area\s+de\s+lavado)',  # Áreas comunes
-            r'(?:habitaciones?|recamaras?|dormitorios?|cuartos?)',  # Dormitorios
-            r'(?:bano\s+completo|medio\s+bano|bano\s+privado)',  # Baños
-            r'(?:estacionamiento|cochera)',  # Estacionamiento
-            r'(?:balcon|terraza|patio)',  # Áreas exteriores
-            r'(?:escrituras?|titulo\s+de\s+propiedad)',  # Documentación
-            r'(?:infonavit|fovissste|credito)',  # Financiamiento
-            r'(?:m2|metros\s+cuadrados)',  # Medidas
-            r'(?:ubicado|ubicada)\s+en',  # Ubicación
-            r'(?:cerca\s+de|proximo\s+a|a\s+unos\s+pasos)',  # Referencias
-            r'(?:vigilancia|seguridad)\s+24',  # Seguridad
-            r'(?:acabados|remodelado|nuevo)',  # Estado
-            r'(?:oportunidad|inversion|plusvalia)',  # Términos de venta
-            r'(?:rento|alquilo)\s+(?:cuarto|habitacion|recamara|departamento)',  # Rentas
-            r'(?:servicios?|internet|luz|agua)\s+incluidos?',  # Servicios incluidos
-            r'(?:amueblado|sin amueblar)',  # Amueblado
-            r'(?:estudiantes?|profesionistas?)',  # Público objetivo
-            r'entrada\s+independiente',  # Características específicas
-            
-            # Patrones en inglés
-            r'(?:house|home|apartment|condo|townhouse|property)\s+(?:for\s+)?(?:sale|rent)',
-            r'(?:\d+)\s*(?:bed|bath|bedroom|bathroom)',
-            r'(?:sq\s*ft|square\s*feet)',
-            r'(?:real\s+estate|realty)',
-            r'(?:listing|mls)',
-            r'(?:residential|commercial)\s+(?:property|building)',
-            r'(?:utilities|internet|water|electricity)\s+included',
-            r'(?:furnished|unfurnished)',
-            r'(?:private|shared)\s+(?:bathroom|entrance)',
-            r'(?:parking|garage)',
-            r'(?:yard|garden|patio)',
-            r'(?:location|near|close\s+to)',
-            r'(?:investment|opportunity)',
-            r'(?:remodeled|updated|new)',
-            r'(?:students|professionals)',
-            r'(?:lease|rental)',
-            r'(?:studio|loft)',
-            r'(?:amenities|features)',
-            r'(?:security|gated)',
-            r'(?:community|complex)'
-        ]
-        
-        if any(re.search(patron, texto, re.IGNORECASE) for patron in patrones_descripcion):
+        if _RE_DESCRIPCION_PROPIEDAD.search(texto):
             return True
     
     # Si tiene dimensiones típicas de una propiedad
-    patrones_dimension = [
-        r'\d+\s*m2', r'\d+\s*metros?\s*cuadrados?',
-        r'terreno\s*(?:de)?\s*\d+',
-        r'construccion\s*(?:de)?\s*\d+',
-        r'superficie\s*(?:de)?\s*\d+',
-        r'\d+\s*mts?2?',  # Detectar "200 mt2", "200 mts", etc.
-        r'\d+\s*m²',  # Detectar con símbolo especial de metros cuadrados
-        r'(?:terreno|construccion|superficie):\s*\d+\s*m?2?',  # "terreno: 200m2"
-        r'frente\s*(?:de)?\s*\d+(?:\.\d+)?\s*mts?',  # "frente de 23.71 mts"
-        r'superficie\s*plana\s*(?:de)?\s*\d+',  # "superficie plana de 300"
-        r'\$\s*\d+(?:,\d+)*(?:\.\d+)?\s*(?:m2|mt2|mts2|por\s+metro\s+cuadrado)',  # "$3,000 por metro cuadrado"
-        r'\d+(?:\.\d+)?\s*(?:x|por)\s*\d+(?:\.\d+)?\s*(?:m2|mts?)?',  # "10 x 20", "10.5 x 20.5 m2"
-        r'\d+\s*sq\s*ft',  # Medidas en inglés
-        r'\d+\s*square\s*feet'
-    ]
-    
-    for patron in patrones_dimension:
-        if re.search(patron, texto, re.IGNORECASE):
-            return True
-    
-    # Verificar si hay palabras clave que indiquen una propiedad
-    palabras_clave_propiedad = [
-        'casa', 'depto', 'departamento', 'terreno', 'lote', 'venta', 'renta',
-        'recamara', 'recamaras', 'habitacion', 'habitaciones', 'm2', 'metros',
-        'fraccionamiento', 'privada', 'condominio', 'alberca', 'jardin', 'jardin',
-        'estacionamiento', 'garage', 'cochera', 'bano', 'banos', 'cocina',
-        'sala', 'comedor', 'escrituras', 'infonavit', 'fovissste', 'credito',
-        'construccion', 'construccion', 'plusvalia', 'plusvalia', 'inversion',
-        'bienes raices', 'inmobiliaria', 'amenidades', 'vigilancia', 'seguridad',
-        'roof garden', 'terraza', 'balcon', 'balcon', 'cuarto de servicio',
-        'area de lavado', 'area de lavado', 'cisterna', 'tinaco', 'gas estacionario',
-        'propiedad', 'inmueble', 'finca', 'residencia', 'vivienda', 'hogar',
-        'duplex', 'triplex', 'penthouse', 'ph', 'suite', 'estudio', 'oficina',
-        'local', 'bodega', 'nave', 'consultorio', 'edificio', 'planta baja',
-        'planta alta', 'piso', 'nivel', 'acabados', 'remodelada', 'nueva',
-        'estrenar', 'ubicada', 'ubicado', 'cerca de', 'zona', 'colonia',
-        'fraccion', 'fracc', 'unidad', 'conjunto', 'residencial', 'habitacional',
-        'minisplit', 'closet', 'vestidor', 'porton', 'porton', 'reja',
-        'constancia comunal', 'sesion de derechos', 'superficie plana',
-        'bardado', 'toma de agua', 'frente', 'calefaccion solar',
-        'regadera exterior', 'iluminacion natural', 'ventilacion',
-        'preventa', 'estrena ya', 'meses sin intereses', 'caseta',
-        'green', 'hoyo', 'country club', 'residencial', 'exclusiva',
-        'desarrollo', 'lotificar', 'avenida principal', 'monoambiente',
-        'loft', 'bungalo', 'bungalow', 'townhouse', 'tiny house',
-        'cuarto', 'recamara', 'habitacion',
-        # Palabras clave en inglés
-        'house', 'home', 'apartment', 'condo', 'townhouse', 'property',
-        'real estate', 'bedroom', 'bathroom', 'kitchen', 'living room',
-        'dining room', 'garage', 'yard', 'garden', 'patio', 'pool',
-        'security', 'gated', 'community', 'complex', 'utilities',
-        'furnished', 'unfurnished', 'remodeled', 'updated', 'new',
-        'location', 'near', 'close to', 'investment', 'opportunity',
-        'residential', 'commercial', 'studio', 'loft', 'amenities',
-        'features', 'parking', 'storage', 'laundry'
-    ]
+    if _RE_DIMENSION.search(texto):
+        return True
     
-    texto_completo = f"{texto} {titulo} {location}"
-    palabras_encontradas = sum(1 for palabra in palabras_clave_propiedad if palabra in texto_completo.lower())
+    # Verificar si hay palabras clave que indiquen una propiedad.
+    # Se pasa a minúsculas una sola vez en lugar de en cada comparación
+    texto_completo = f"{texto} {titulo} {location}".lower()
+    presentes = campos_presentes(texto_completo, _CATALOGO_PALABRAS_CLAVE, _AUTOMATA_PALABRAS_CLAVE)
+    palabras_encontradas = sum(_MULTIPLICIDAD_PALABRAS_CLAVE[palabra] for palabra in presentes)
     
     # Si encontramos al menos 2 palabras clave de propiedad
     if palabras_encontradas >= 2:
         return True
     
-    # Ubicaciones específicas de Morelos
-    ubicaciones = [
-        'cuernavaca', 'jiutepec', 'temixco', 'emiliano zapata', 'xochitepec',
-        'yautepec', 'cuautla', 'jojutla', 'zacatepec', 'tepoztlan', 'tepoztlan',
-        'civac', 'tezoyuca', 'tejalpa', 'zapata', 'las fuentes',
-        'la pradera', 'la joya', 'el miraval', 'la herradura',
-        'lomas de la herradura', 'lomas de cuernavaca', 'lomas de cocoyoc',
-        'club de golf', 'hacienda de las palmas', 'rinconada',
-        'buenavista', 'centro', 'la carolina', 'las palmas',
-        'los pinos', 'los ciruelos', 'los limones', 'los naranjos',
-        'los sabinos', 'los laureles', 'los cedros', 'los robles',
-        'los almendros', 'los olivos', 'los mangos', 'los duraznos',
-        'las flores', 'las rosas', 'las margaritas', 'las violetas',
-        'las azucenas', 'las orquideas', 'las bugambilias',
-        'ahuatepec', 'ocotepec', 'chapultepec', 'tlaltenango',
-        'vista hermosa', 'palmira', 'delicias', 'reforma',
-        'san anton', 'san jeronimo', 'santa maria',
-        'burgos', 'sumiya', 'tabachines', 'los cizos', 'acapantzingo',
-        'campo verde', 'las aguilas', 'las aguilas', 'las palmas',
-        'chipitlan', 'antonio barona', 'atlacomulco', 'huitzilac',
-        'paraiso', 'country club', 'milpillas', 'paseos del rio',
-        'jardines de delicias', 'nueva santa maria', 'tulipanes',
-        'texcal', 'upemor', 'satelite'  # Agregadas nuevas ubicaciones
-    ]
-    
     # Verificar si la ubicación es de Morelos y hay al menos una palabra clave
-    for ubicacion in ubicaciones:
-        if ubicacion in texto_completo.lower() or ubicacion in location.lower():
-            if any(palabra in texto_completo.lower() for palabra in palabras_clave_propiedad):
-                return True
+    # (palabras_encontradas ya cuenta las palabras clave presentes en texto_completo)
+    if palabras_encontradas == 0:
+        return False
+    for texto_ubicacion in (texto_completo, location.lower()):
+        if campos_presentes(texto_ubicacion, _CATALOGO_UBICACIONES, _AUTOMATA_UBICACIONES):
+            return True
     
     return False
 
@@ -1808,8 +1867,7 @@ def procesar_archivo():
     """
     try:
         # Leer archivo de entrada
-        with open('resultados/repositorio_propiedades.json', 'r', encoding='utf-8') as f:
-            propiedades_dict = json.load(f)
+        propiedades_dict = cargar_json('resultados/repositorio_propiedades.json')
         
         # Procesar propiedades
         propiedades_procesadas = []
@@ -1821,128 +1879,160 @@ def procesar_archivo():
         items_sin_descripcion = 0
         items_sin_precio = 0
         
-        for id_prop, datos in propiedades_dict.items():
-            try:
-                if id_prop != "None":
-                    # Obtener campos asegurándonos de que existan, probando diferentes nombres
-                    descripcion = ""
-                    # Lista expandida de posibles nombres para el campo descripción
-                    campos_descripcion = [
-                        "description", "desc", "texto", "descripcion", "descripcion_raw",
-                        "descrition", "descripion", "description_raw", "texto_raw",
-                        "texto_original", "descripcion_original", "description_original",
-                        "desc_raw", "desc_original"
-                    ]
-                    
-                    for campo in campos_descripcion:
-                        if campo in datos:
-                            descripcion = str(datos[campo]).strip()
-                            if descripcion:
-                                break
-                    
-                    # También buscar en el diccionario ignorando mayúsculas/minúsculas
-                    if not descripcion:
+        # Propiedades sin resultado en caché: (id, datos) y su (posición, clave de caché)
+        pendientes = []
+        posiciones_pendientes = []
+        
+        # Resultados de ejecuciones anteriores para no re-extraer propiedades sin cambios
+        with shelve.open(CACHE_EXTRACCION) as cache:
+            for id_prop, datos in propiedades_dict.items():
+                try:
+                    if id_prop != "None":
+                        # Obtener campos asegurándonos de que existan, probando diferentes nombres
+                        descripcion = ""
+                        # Lista expandida de posibles nombres para el campo descripción
+                        campos_descripcion = [
+                            "description", "desc", "texto", "descripcion", "descripcion_raw",
+                            "descrition", "descripion", "description_raw", "texto_raw",
+                            "texto_original", "descripcion_original", "description_original",
+                            "desc_raw", "desc_original"
+                        ]
+                        
                         for campo in campos_descripcion:
-                            for key in datos.keys():
-                                if key.lower() == campo.lower():
-                                    descripcion = str(datos[key]).strip()
-                                    if descripcion:
-                                        break
-                            if descripcion:
-                                break
-                    
-                    titulo = ""
-                    for campo in ["titulo", "title", "titulo_raw", "title_raw"]:
-                        if campo in datos:
-                            titulo = str(datos[campo]).strip()
-                            if titulo:
-                                break
-                    
-                    precio = ""
-                    for campo in ["precio", "price", "precio_raw", "price_raw"]:
-                        if campo in datos:
-                            precio = str(datos[campo]).strip()
-                            if precio:
-                                break
-                    
-                    location = ""
-                    for campo in ["location", "ubicacion", "ciudad", "location_raw", "ubicacion_raw"]:
-                        if campo in datos:
-                            location = str(datos[campo]).strip()
-                            if location:
-                                break
-                    
-                    # Contar campos vacíos
-                    if not descripcion:
-                        items_sin_descripcion += 1
-                    if not precio:
-                        items_sin_precio += 1
-                    
-                    # Verificar si es una propiedad
-                    if es_propiedad(descripcion, titulo, precio, location):
-                        resultado = procesar_propiedad(id_prop, datos)
-                        if resultado:
-                            propiedades_procesadas.append(resultado)
-                    else:
-                        # Asegurarnos de obtener la descripción original
-                        descripcion_original = ""
-                        for campo in ["descripcion_raw", "description_raw", "description", "descripcion_original", "texto_original"]:
                             if campo in datos:
-                                descripcion_original = str(datos[campo]).strip()
-                                if descripcion_original:
+                                descripcion = str(datos[campo]).strip()
+                                if descripcion:
                                     break
                         
-                        no_propiedades.append({
-                            "id": id_prop,
-                            "link": datos.get("link", ""),
-                            "titulo": titulo,
-                            "descripcion": descripcion,
-                            "descripcion_original": descripcion_original or descripcion,  # Si no hay original, usar la descripción normal
-                            "precio": precio,
-                            "precio_original": datos.get("precio_original", datos.get("price_original", "")),
-                            "location": location,
-                            "ciudad": datos.get("ciudad", ""),
-                            "fecha": datos.get("fecha", datos.get("date", "")),
-                            "vendedor": datos.get("vendedor", datos.get("seller", "")),
-                            "vendedor_id": datos.get("vendedor_id", datos.get("seller_id", "")),
-                            "categoria": datos.get("categoria", datos.get("category", "")),
-                            "subcategoria": datos.get("subcategoria", datos.get("subcategory", "")),
-                            "estado_producto": datos.get("estado_producto", datos.get("condition", "")),
-                            "razon": "No es una propiedad inmobiliaria"
-                        })
-            except Exception as e:
-                errores.append({
-                    "id": id_prop,
-                    "error": str(e),
-                    "datos": datos
-                })
+                        # También buscar en el diccionario ignorando mayúsculas/minúsculas
+                        if not descripcion:
+                            for campo in campos_descripcion:
+                                for key in datos.keys():
+                                    if key.lower() == campo.lower():
+                                        descripcion = str(datos[key]).strip()
+                                        if descripcion:
+                                            break
+                                if descripcion:
+                                    break
+                        
+                        titulo = ""
+                        for campo in ["titulo", "title", "titulo_raw", "title_raw"]:
+                            if campo in datos:
+                                titulo = str(datos[campo]).strip()
+                                if titulo:
+                                    break
+                        
+                        precio = ""
+                        for campo in ["precio", "price", "precio_raw", "price_raw"]:
+                            if campo in datos:
+                                precio = str(datos[campo]).strip()
+                                if precio:
+                                    break
+                        
+                        location = ""
+                        for campo in ["location", "ubicacion", "ciudad", "location_raw", "ubicacion_raw"]:
+                            if campo in datos:
+                                location = str(datos[campo]).strip()
+                                if location:
+                                    break
+                        
+                        # Contar campos vacíos
+                        if not descripcion:
+                            items_sin_descripcion += 1
+                        if not precio:
+                            items_sin_precio += 1
+                        
+                        # Verificar si es una propiedad
+                        if es_propiedad(descripcion, titulo, precio, location):
+                            if not isinstance(datos, dict):
+                                errores.append({
+                                    "id": id_prop,
+                                    "error": f"Registro con formato inválido: {type(datos).__name__}",
+                                    "datos": datos
+                                })
+                                continue
+                            clave = _clave_cache(id_prop, datos)
+                            if clave in cache:
+                                propiedades_procesadas.append(cache[clave])
+                            else:
+                                # Se reserva su lugar; se procesa después junto con las demás nuevas
+                                pendientes.append((id_prop, datos))
+                                posiciones_pendientes.append((len(propiedades_procesadas), clave))
+                                propiedades_procesadas.append(None)
+                        else:
+                            # Asegurarnos de obtener la descripción original
+                            descripcion_original = ""
+                            for campo in ["descripcion_raw", "description_raw", "description", "descripcion_original", "texto_original"]:
+                                if campo in datos:
+                                    descripcion_original = str(datos[campo]).strip()
+                                    if descripcion_original:
+                                        break
+                            
+                            no_propiedades.append({
+                                "id": id_prop,
+                                "link": datos.get("link", ""),
+                                "titulo": titulo,
+                                "descripcion": descripcion,
+                                "descripcion_original": descripcion_original or descripcion,  # Si no hay original, usar la descripción normal
+                                "precio": precio,
+                                "precio_original": datos.get("precio_original", datos.get("price_original", "")),
+                                "location": location,
+                                "ciudad": datos.get("ciudad", ""),
+                                "fecha": datos.get("fecha", datos.get("date", "")),
+                                "vendedor": datos.get("vendedor", datos.get("seller", "")),
+                                "vendedor_id": datos.get("vendedor_id", datos.get("seller_id", "")),
+                                "categoria": datos.get("categoria", datos.get("category", "")),
+                                "subcategoria": datos.get("subcategoria", datos.get("subcategory", "")),
+                                "estado_producto": datos.get("estado_producto", datos.get("condition", "")),
+                                "razon": "No es una propiedad inmobiliaria"
+                            })
+                except Exception as e:
+                    errores.append({
+                        "id": id_prop,
+                        "error": str(e),
+                        "datos": datos
+                    })
+            
+            # Extraer las propiedades nuevas o modificadas y guardarlas en caché
+            resultados_pendientes = procesar_pendientes(pendientes)
+            for (id_prop, datos), (posicion, clave), (resultado, error) in zip(
+                    pendientes, posiciones_pendientes, resultados_pendientes):
+                if error is not None:
+                    errores.append({
+                        "id": id_prop,
+                        "error": error,
+                        "datos": datos
+                    })
+                    continue
+                cache[clave] = resultado
+                propiedades_procesadas[posicion] = resultado
+        
+        # Quitar los lugares de propiedades sin resultado
+        propiedades_procesadas = [p for p in propiedades_procesadas if p]
         
         # Guardar resultados de propiedades válidas
-        with open('resultados/propiedades_estructuradas.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                "propiedades": propiedades_procesadas,
-                "metadata": {
-                    "total_procesadas": len(propiedades_procesadas),
-                    "total_errores": len(errores),
-                    "total_no_propiedades": len(no_propiedades)
-                }
-            }, f, ensure_ascii=False, indent=2)
+        guardar_json('resultados/propiedades_estructuradas.json', {
+            "propiedades": propiedades_procesadas,
+            "metadata": {
+                "total_procesadas": len(propiedades_procesadas),
+                "total_errores": len(errores),
+                "total_no_propiedades": len(no_propiedades)
+            }
+        })
         
         # Guardar elementos que no son propiedades
-        with open('resultados/no_propiedades.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                "items": no_propiedades,
-                "metadata": {
-                    "total": len(no_propiedades),
-                    "items_sin_descripcion": items_sin_descripcion,
-                    "items_sin_precio": items_sin_precio
-                }
-            }, f, ensure_ascii=False, indent=2)
+        guardar_json('resultados/no_propiedades.json', {
+            "items": no_propiedades,
+            "metadata": {
+                "total": len(no_propiedades),
+                "items_sin_descripcion": items_sin_descripcion,
+                "items_sin_precio": items_sin_precio
+            }
+        })
         
         # Guardar log de errores si hay alguno
         if errores:
-            with open('resultados/errores_procesamiento.json', 'w', encoding='utf-8') as f:
-                json.dump(errores, f, ensure_ascii=False, indent=2)
+            guardar_json('resultados/errores_procesamiento.json', errores)
         
         print(f"Procesamiento completado:")
         print(f"- Total de items en repositorio: {total_items}")
@@ -1,17 +1,32 @@
 import os
+import glob
+import gzip
 import json
+import asyncio
+import logging
+import shutil
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup, CData, NavigableString
+
+from repositorio_io import cargar_json_cacheado, guardar_json, linea_ndjson
+
+try:
+    import ijson
+    IJSON_DISPONIBLE = True
+except ImportError:
+    IJSON_DISPONIBLE = False
 
 # Barra de progreso personalizada estilo tqdm en magenta, mostrando faltantes y tiempo por extracción
 class ProgressBar:
     MAGENTA = "\033[35m"
     RESET = "\033[0m"
 
-    def __init__(self, total, desc='', unit=''):
+    def __init__(self, total, desc='', unit='', mininterval=0.5):
         self.total = total
         self.n = 0
         self.ok = 0
@@ -20,10 +35,13 @@ class ProgressBar:
         self.desc = desc
         self.unit = unit
         self.length = 40
+        self.mininterval = mininterval  # Segundos mínimos entre repintados de la barra
         self.start_time = time.time()
+        self.last_print = 0.0
         self._print()
 
     def _print(self):
+        self.last_print = time.time()
         filled = int(self.length * self.n / self.total) if self.total else self.length
         bar = '█' * filled + '-' * (self.length - filled)
         percent = (self.n / self.total * 100) if self.total else 100
@@ -41,9 +59,11 @@ class ProgressBar:
         if ok is not None: self.ok = ok
         if err is not None: self.err = err
         if last_time is not None: self.last_time = last_time
-        self._print()
+        if self.n >= self.total or time.time() - self.last_print >= self.mininterval:
+            self._print()
 
     def close(self):
+        self._print()
         print()
 
 # Rutas de configuración
@@ -52,19 +72,84 @@ CARPETA_RESULTADOS = "resultados"
 CARPETA_REPO_MASTER = os.path.join(CARPETA_RESULTADOS, "repositorio_propiedades.json")
 ESTADO_FB = "fb_state.json"
 BASE_URL = "https://www.facebook.com"
+LOG_ERRORES = "errores_extraccion_html.log"
+PAGINAS_CONCURRENTES = 4  # Pestañas de Playwright extrayendo en paralelo
+ESPERA_CONTENIDO_MS = 5000  # Máximo a esperar que la publicación pinte su título
+NAVEGADOR_VISIBLE = False  # True para ver las pestañas (p. ej. al revisar la sesión de Facebook)
+# Probar primero un GET simple antes de abrir la pestaña. Apagado por defecto: el
+# HTML inicial de Facebook casi nunca trae precio y descripción completa, así que
+# la mayoría de las publicaciones pagaría el GET y abriría la pestaña de todos modos
+INTENTAR_SIN_NAVEGADOR = False
+AGENTE_USUARIO = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Sesión HTTP compartida: reutiliza conexiones keep-alive entre descargas de portadas.
+# Los errores transitorios (conexión, 429, 5xx) se reintentan con espera creciente.
+SESSION = requests.Session()
+REINTENTOS_HTTP = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=REINTENTOS_HTTP))
+# Las páginas de Facebook no se reintentan: un 429 ahí es el límite de peticiones
+# y reintentar solo lo alarga; si el GET falla, la publicación se abre en Playwright
+SESSION.mount(BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=PAGINAS_CONCURRENTES))
+
+# Los avisos por propiedad van a archivo para no interrumpir la barra en la terminal
+logger = logging.getLogger("genera_repositorio")
+logger.setLevel(logging.INFO)
+_handler_errores = logging.FileHandler(LOG_ERRORES, encoding="utf-8")
+_handler_errores.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_handler_errores)
+logger.propagate = False
 
 # 1) Cargar repositorio maestro de propiedades
+# (la copia pickle junto al JSON evita volver a parsearlo en cada corrida)
 data_master = {}
 if os.path.exists(CARPETA_REPO_MASTER):
-    with open(CARPETA_REPO_MASTER, "r", encoding="utf-8") as f:
-        data_master = json.load(f)
+    data_master = cargar_json_cacheado(CARPETA_REPO_MASTER)
+
+def recuperar_registros_ndjson(data_master):
+    """
+    Agrega a data_master los registros de los propiedades.ndjson diarios escritos
+    después del último guardado del maestro, p. ej. si una corrida se cortó antes
+    de guardarlo. Devuelve cuántos registros se recuperaron.
+    """
+    fecha_maestro = os.path.getmtime(CARPETA_REPO_MASTER) if os.path.exists(CARPETA_REPO_MASTER) else 0
+    recuperados = 0
+    for ruta in sorted(glob.glob(os.path.join(CARPETA_RESULTADOS, "*", "propiedades.ndjson"))):
+        if os.path.getmtime(ruta) <= fecha_maestro:
+            continue
+        with open(ruta, "rb") as f:
+            for linea in f:
+                try:
+                    datos = json.loads(linea)
+                except ValueError:
+                    continue  # Última línea a medias si el proceso murió escribiéndola
+                pid = datos.get("id") if isinstance(datos, dict) else None
+                if pid and pid not in data_master:
+                    data_master[pid] = datos
+                    recuperados += 1
+    return recuperados
+
+registros_recuperados = recuperar_registros_ndjson(data_master)
 existing_ids = set(data_master.keys())
 
 # 2) Cargar y normalizar enlaces desde repositorio_unico
-with open(CARPETA_LINKS, "r", encoding="utf-8") as f:
-    raw_links = json.load(f)
-links = []
-for item in raw_links:
+def iterar_links_crudos(ruta):
+    """Recorre los enlaces del repositorio; con ijson se leen en streaming sin cargar toda la lista."""
+    if IJSON_DISPONIBLE:
+        with open(ruta, "rb") as f:
+            yield from ijson.items(f, "item")
+    else:
+        with open(ruta, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+# 3) Normalizar y filtrar pendientes en una sola pasada. Los ids ya vistos
+# (procesados o repetidos en el archivo de links) se descartan para que dos
+# pestañas no extraigan la misma propiedad.
+pending_links = []
+ids_vistos = set(existing_ids)
+for item in iterar_links_crudos(CARPETA_LINKS):
     if isinstance(item, str):
         href = BASE_URL + item if item.startswith("/") else item
         city = "cuernavaca"
@@ -77,10 +162,10 @@ for item in raw_links:
     if not href.startswith(BASE_URL):
         continue
     pid = href.rstrip("/").split("/")[-1]
-    links.append({"link": href, "id": pid, "ciudad": city})
-
-# 3) Filtrar solo links pendientes
-pending_links = [l for l in links if l["id"] not in existing_ids]
+    if pid in ids_vistos:
+        continue
+    ids_vistos.add(pid)
+    pending_links.append({"link": href, "id": pid, "ciudad": city})
 
 # 4) Preparar carpeta de resultados diaria
 date_str = datetime.now().strftime("%Y-%m-%d")
@@ -88,146 +173,311 @@ carpeta_destino = os.path.join(CARPETA_RESULTADOS, date_str)
 os.makedirs(carpeta_destino, exist_ok=True)
 
 # Funciones de extracción
+ETIQUETAS_DESCRIPCION = ("Descripción", "Detalles")
+
 def extraer_descripcion_estable(soup):
-    for div in soup.find_all("div"):
-        if div.get_text(strip=True) in ["Descripción", "Detalles"]:
+    # Partir de los nodos de texto con la etiqueta y subir solo por sus <div>,
+    # en vez de llamar get_text() sobre cada <div> de la página
+    for nodo in soup.find_all(string=lambda t: t.strip() in ETIQUETAS_DESCRIPCION):
+        candidatos = []
+        div = nodo.find_parent("div")
+        while div is not None and div.get_text(strip=True) in ETIQUETAS_DESCRIPCION:
+            candidatos.append(div)
+            div = div.find_parent("div")
+        # Del más externo al más interno, como en el recorrido del documento
+        for div in reversed(candidatos):
             siguiente = div.find_next_sibling("div")
             if siguiente:
                 return siguiente.get_text(separator="\n", strip=True).replace("Ver menos", "").strip()
     return ""
 
 
+def _empieza_con_pesos(texto):
+    # Solo texto visible: get_text() omite comentarios, scripts y estilos
+    return type(texto) in (NavigableString, CData) and texto.lstrip().startswith("$")
+
 def extraer_precio(soup):
-    for span in soup.find_all("span"):
-        texto = span.get_text(strip=True)
-        if texto.startswith("$") and len(texto) < 30:
-            return texto
+    # El texto de un <span> empieza con "$" solo si alguno de sus nodos de texto
+    # empieza así: se parte de esos nodos en vez de llamar get_text() sobre cada
+    # <span> de la página. El primer span en orden del documento es el más
+    # externo del primer nodo que cumple.
+    revisados = set()
+    for nodo in soup.find_all(string=_empieza_con_pesos):
+        for span in reversed(nodo.find_parents("span")):
+            if id(span) in revisados:
+                continue
+            revisados.add(id(span))
+            texto = span.get_text(strip=True)
+            if texto.startswith("$") and len(texto) < 30:
+                return texto
     return ""
 
 
 def extraer_vendedor(soup):
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "facebook.com/profile.php?id=" in href:
-            link_vendedor = href.split("?")[0]
-            strong = a.find("strong")
-            if strong:
-                vendedor = strong.get_text(strip=True)
-            else:
-                span = a.find("span")
-                vendedor = span.get_text(strip=True) if span else ""
-            return vendedor, link_vendedor
-    return "", ""
-
-# 5) Descargar portada usando Playwright
-def descargar_imagen_por_playwright(page, ciudad, pid):
-    try:
-        src = page.locator('img[alt^="Foto de"]').first.get_attribute('src')
-    except:
-        try:
-            src = page.locator('img').first.get_attribute('src')
-        except:
-            return ""
+    a = soup.select_one('a[href*="facebook.com/profile.php?id="]')
+    if a is None:
+        return "", ""
+    link_vendedor = a["href"].split("?")[0]
+    strong = a.find("strong")
+    if strong:
+        vendedor = strong.get_text(strip=True)
+    else:
+        span = a.find("span")
+        vendedor = span.get_text(strip=True) if span else ""
+    return vendedor, link_vendedor
+
+# 5) Descargar portada
+# La portada se lee del HTML ya parseado (sin otro round-trip al navegador):
+# primero la foto del anuncio y, si no existe, la primera imagen de la página.
+def src_portada(soup):
+    img = soup.select_one('img[alt^="Foto de"]') or soup.find("img")
+    return img.get("src") if img else None
+
+def _descargar_archivo(url, ruta):
+    """Descarga url a ruta en streaming; devuelve True si respondió 200."""
+    with SESSION.get(url, timeout=10, stream=True) as resp:
+        if resp.status_code != 200:
+            return False
+        resp.raw.decode_content = True
+        with open(ruta, "wb") as f:
+            shutil.copyfileobj(resp.raw, f)
+    return True
+
+async def descargar_portada(soup, ciudad, pid):
+    src = src_portada(soup)
     if not src or not src.startswith("http"):
         return ""
     filename = f"{ciudad}-{date_str}-{pid}.jpg"
     path_img = os.path.join(carpeta_destino, filename)
     try:
-        resp = requests.get(src, timeout=10)
-        if resp.status_code == 200:
-            with open(path_img, "wb") as f:
-                f.write(resp.content)
+        # requests es bloqueante: se ejecuta en un hilo para no frenar las demás pestañas
+        if await asyncio.to_thread(_descargar_archivo, src, path_img):
             return filename
     except Exception as e:
-        print(f"⚠️ No se pudo descargar portada: {e}")
+        logger.warning(f"{pid} - No se pudo descargar portada: {e}")
     return ""
 
-# 6) Guardar HTML y JSON
-def guardar_html_y_json(html, datos, ciudad, pid):
-    base = f"{ciudad}-{date_str}-{pid}"
-    ruta_html = os.path.join(carpeta_destino, base + ".html")
-    ruta_json = os.path.join(carpeta_destino, base + ".json")
-    with open(ruta_html, "w", encoding="utf-8") as f:
+# 6) Guardar HTML y registro. Los registros del día se agregan a un solo
+# archivo NDJSON (una línea por propiedad) en vez de un .json por propiedad
+ARCHIVO_REGISTROS = os.path.join(carpeta_destino, "propiedades.ndjson")
+salida_registros = None  # Se abre una sola vez en main()
+
+def guardar_html_y_registro(html, datos, ciudad, pid):
+    ruta_html = os.path.join(carpeta_destino, f"{ciudad}-{date_str}-{pid}.html.gz")
+    # El HTML de Facebook pesa varios MB; comprimido ocupa ~10 veces menos
+    with gzip.open(ruta_html, "wt", encoding="utf-8", compresslevel=3) as f:
         f.write(html)
-    with open(ruta_json, "w", encoding="utf-8") as f:
-        json.dump(datos, f, ensure_ascii=False, indent=2)
+    # Una sola llamada a write por línea: las escrituras desde hilos no se mezclan
+    salida_registros.write(linea_ndjson(datos))
 
-# 7) Ejecución principal
-def main():
-    # Mostrar cantidad de HTMLs ya en repositorio maestro
-    print(f"Propiedades ya procesadas: {len(existing_ids)}")
-    total = len(pending_links)
-    success_count = 0
-    error_count = 0
-    pbar = ProgressBar(total, desc="Extrayendo propiedades", unit="propiedad")
+# 7) Guardar repositorio maestro completo
+def guardar_repositorio_maestro():
+    # Compacto: el maestro crece con cada corrida y nadie lo lee a mano
+    guardar_json(CARPETA_REPO_MASTER, data_master, indentar=False)
+
+# 8) Extraer una propiedad en la pestaña indicada
+async def extraer_propiedad(page, item):
+    pid = item["id"]
+    url = item["link"]
+    ciudad = item["ciudad"]
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(storage_state=ESTADO_FB)
-        page = context.new_page()
+    await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+    # Esperar a que se pinte el título en vez de una pausa fija de 3 s
+    try:
+        await page.wait_for_selector("h1", timeout=ESPERA_CONTENIDO_MS)
+    except PlaywrightTimeoutError:
+        pass
 
-        for item in pending_links:
+    # Expandir descripción "Ver más" si existe. El bloque de descripción se pinta
+    # después del título: se espera a su etiqueta o al botón antes de decidir
+    vm = page.locator("text=Ver más").first
+    bloque_descripcion = vm
+    for etiqueta in ETIQUETAS_DESCRIPCION:
+        bloque_descripcion = bloque_descripcion.or_(page.get_by_text(etiqueta, exact=True))
+    try:
+        await bloque_descripcion.first.wait_for(timeout=ESPERA_CONTENIDO_MS)
+    except PlaywrightTimeoutError:
+        pass
+    try:
+        if await vm.is_visible():
+            await vm.click()
+            await page.wait_for_timeout(1000)
+    except:
+        pass
+
+    html = await page.content()
+    soup = BeautifulSoup(html, "lxml")
+
+    # Extracciones
+    titulo = h1.get_text(strip=True) if (h1 := soup.find("h1")) else ""
+    descripcion = extraer_descripcion_estable(soup)
+    precio = extraer_precio(soup)
+    vendedor, link_vendedor = extraer_vendedor(soup)
+    imagen_portada = await descargar_portada(soup, ciudad, pid)
+
+    datos = {
+        "id": pid,
+        "link": url,
+        "titulo": titulo,
+        "precio": precio,
+        "ciudad": ciudad,
+        "vendedor": vendedor,
+        "link_vendedor": link_vendedor,
+        "descripcion": descripcion,
+        "imagen_portada": imagen_portada
+    }
+
+    guardar_html_y_registro(html, datos, ciudad, pid)
+    return datos
+
+# 8b) Intento sin navegador: muchas publicaciones traen las etiquetas Open Graph
+# en el HTML inicial, así que basta un GET con la sesión de Facebook
+def cargar_cookies_sesion():
+    """Copia las cookies de ESTADO_FB (storage_state de Playwright) a SESSION."""
+    try:
+        with open(ESTADO_FB, "r", encoding="utf-8") as f:
+            estado = json.load(f)
+    except (OSError, ValueError):
+        return
+    for cookie in estado.get("cookies", []):
+        SESSION.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+def _meta_og(soup, propiedad):
+    meta = soup.find("meta", attrs={"property": propiedad})
+    return meta.get("content", "").strip() if meta else ""
+
+def extraer_propiedad_sin_navegador(item):
+    """
+    Extrae la propiedad con un GET simple. Devuelve None (y se usa Playwright)
+    si el HTML no trae og:title, el precio y el bloque "Descripción" completo:
+    el HTML inicial de Facebook suele traer solo las etiquetas Open Graph, con
+    la descripción recortada.
+    """
+    pid = item["id"]
+    url = item["link"]
+    ciudad = item["ciudad"]
+
+    try:
+        resp = SESSION.get(url, timeout=10, headers={"User-Agent": AGENTE_USUARIO})
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+
+    html = resp.text
+    soup = BeautifulSoup(html, "lxml")
+    titulo = _meta_og(soup, "og:title")
+    if not titulo:
+        return None
+    precio = extraer_precio(soup)
+    if not precio:
+        return None
+    descripcion = extraer_descripcion_estable(soup)
+    if not descripcion:
+        return None
+
+    vendedor, link_vendedor = extraer_vendedor(soup)
+    imagen_portada = ""
+    src = _meta_og(soup, "og:image")
+    if src.startswith("http"):
+        filename = f"{ciudad}-{date_str}-{pid}.jpg"
+        try:
+            if _descargar_archivo(src, os.path.join(carpeta_destino, filename)):
+                imagen_portada = filename
+        except Exception as e:
+            logger.warning(f"{pid} - No se pudo descargar portada: {e}")
+
+    datos = {
+        "id": pid,
+        "link": url,
+        "titulo": titulo,
+        "precio": precio,
+        "ciudad": ciudad,
+        "vendedor": vendedor,
+        "link_vendedor": link_vendedor,
+        "descripcion": descripcion,
+        "imagen_portada": imagen_portada
+    }
+
+    guardar_html_y_registro(html, datos, ciudad, pid)
+    return datos
+
+# 9) Trabajador: una pestaña propia que consume la cola de pendientes
+async def trabajador(context, cola, contadores, pbar):
+    page = await context.new_page()
+    try:
+        while True:
+            try:
+                item = cola.get_nowait()
+            except asyncio.QueueEmpty:
+                return
             pid = item["id"]
-            url = item["link"]
-            ciudad = item["ciudad"]
             start_time = time.time()
             try:
-                page.goto(url, timeout=60000)
-                page.wait_for_timeout(3000)
-
-                # Expandir descripción "Ver más" si existe
-                try:
-                    vm = page.locator("text=Ver más").first
-                    if vm.is_visible():
-                        vm.click()
-                        page.wait_for_timeout(1000)
-                except:
-                    pass
-
-                html = page.content()
-                soup = BeautifulSoup(html, "html.parser")
-
-                # Extracciones
-                titulo = soup.find("h1").get_text(strip=True) if soup.find("h1") else ""
-                descripcion = extraer_descripcion_estable(soup)
-                precio = extraer_precio(soup)
-                vendedor, link_vendedor = extraer_vendedor(soup)
-                imagen_portada = descargar_imagen_por_playwright(page, ciudad, pid)
-
-                datos = {
-                    "id": pid,
-                    "link": url,
-                    "titulo": titulo,
-                    "precio": precio,
-                    "ciudad": ciudad,
-                    "vendedor": vendedor,
-                    "link_vendedor": link_vendedor,
-                    "descripcion": descripcion,
-                    "imagen_portada": imagen_portada
-                }
-
-                guardar_html_y_json(html, datos, ciudad, pid)
-
-                # Actualizar repositorio maestro
+                datos = None
+                if INTENTAR_SIN_NAVEGADOR:
+                    datos = await asyncio.to_thread(extraer_propiedad_sin_navegador, item)
+                if datos is None:
+                    datos = await extraer_propiedad(page, item)
+                # Actualizar repositorio maestro (se guarda en disco al terminar).
+                # Todas las pestañas corren en el mismo hilo del event loop, así que
+                # no hace falta un candado para data_master ni para los contadores.
                 data_master[pid] = datos
-                with open(CARPETA_REPO_MASTER, "w", encoding="utf-8") as mf:
-                    json.dump(data_master, mf, ensure_ascii=False, indent=2)
-
-                success_time = time.time() - start_time
-                success_count += 1
+                contadores["ok"] += 1
             except Exception as e:
-                success_time = time.time() - start_time
-                error_count += 1
-                print(f"❌ Error en {pid}: {e}")
-                with open("errores_extraccion_html.log", "a", encoding="utf-8") as log:
-                    log.write(f"{pid} - {e}\n")
+                contadores["err"] += 1
+                logger.error(f"{pid} - {e}")
             finally:
-                pbar.update(1, ok=success_count, err=error_count, last_time=success_time)
+                pbar.update(1, ok=contadores["ok"], err=contadores["err"], last_time=time.time() - start_time)
+    finally:
+        await page.close()
+
+# 10) Ejecución principal
+async def main():
+    global salida_registros
+    # Mostrar cantidad de HTMLs ya en repositorio maestro
+    print(f"Propiedades ya procesadas: {len(existing_ids)}")
+    if registros_recuperados:
+        print(f"Recuperadas de corridas interrumpidas: {registros_recuperados}")
+    total = len(pending_links)
+    contadores = {"ok": 0, "err": 0}
+    pbar = ProgressBar(total, desc="Extrayendo propiedades", unit="propiedad")
+
+    if INTENTAR_SIN_NAVEGADOR:
+        cargar_cookies_sesion()
+
+    cola = asyncio.Queue()
+    for item in pending_links:
+        cola.put_nowait(item)
+
+    async with async_playwright() as p:
+        # Sin ventana Chromium no pinta las pestañas y cada una ocupa menos memoria
+        browser = await p.chromium.launch(headless=not NAVEGADOR_VISIBLE)
+        context = await browser.new_context(storage_state=ESTADO_FB)
+
+        salida_registros = open(ARCHIVO_REGISTROS, "ab")
+        try:
+            await asyncio.gather(*(
+                trabajador(context, cola, contadores, pbar)
+                for _ in range(min(PAGINAS_CONCURRENTES, total))
+            ))
+        finally:
+            # El NDJSON se cierra antes de guardar el maestro para que este quede
+            # más reciente y no se vuelva a recuperar en la siguiente corrida
+            salida_registros.close()
+            # Un solo guardado del maestro, también si la ejecución se interrumpe;
+            # sin propiedades nuevas ni recuperadas el archivo queda intacto. Si el
+            # proceso muere sin llegar aquí, los registros se recuperan del NDJSON
+            if contadores["ok"] or registros_recuperados:
+                guardar_repositorio_maestro()
 
         pbar.close()
-        browser.close()
+        await browser.close()
         # Imprimir total de propiedades en el repositorio maestro
-        print(f"\nTotal de propiedades en el repositorio maestro: {len(data_master)}")
+        if contadores["err"]:
+            print(f"⚠️ {contadores['err']} propiedades con error, detalle en {LOG_ERRORES}")
+        print(f"Total de propiedades en el repositorio maestro: {len(data_master)}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
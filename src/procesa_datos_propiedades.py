@@ -8,7 +8,6 @@ completo con todos los campos necesarios.
 """
 
 import os
-import json
 import logging
 import shutil
 import re
@@ -16,6 +15,8 @@ from datetime import datetime
 from collections import defaultdict
 from typing import Dict, Any, List, Optional, Tuple, Union
 
+from repositorio_io import cargar_json, guardar_json
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -1604,8 +1605,7 @@ def procesar_datos_crudos(archivo_entrada: str, archivo_salida: str) -> None:
             logger.info(f"Backup creado en {backup_path}")
         
         # Cargar datos crudos
-        with open(archivo_entrada, 'r', encoding='utf-8') as f:
-            datos_crudos = json.load(f)
+        datos_crudos = cargar_json(archivo_entrada)
             
         # Inicializar estructura de salida
         propiedades_estructuradas = {
@@ -1810,13 +1810,11 @@ def procesar_datos_crudos(archivo_entrada: str, archivo_salida: str) -> None:
                 continue
         
         # Guardar resultados
-        with open(archivo_salida, 'w', encoding='utf-8') as f:
-            json.dump(propiedades_estructuradas, f, ensure_ascii=False, indent=2)
+        guardar_json(archivo_salida, propiedades_estructuradas)
             
         # Guardar propiedades descartadas
         archivo_descartadas = os.path.join(os.path.dirname(archivo_salida), "propiedades_descartadas.json")
-        with open(archivo_descartadas, 'w', encoding='utf-8') as f:
-            json.dump(propiedades_descartadas, f, ensure_ascii=False, indent=2)
+        guardar_json(archivo_descartadas, propiedades_descartadas)
             
         logger.info("Procesamiento completado")
         logger.info(f"Total propiedades procesadas: {propiedades_estructuradas['estadisticas']['total_procesadas']}")
@@ -8,14 +8,17 @@ completo con todos los campos necesarios.
 """
 
 import os
-import json
 import logging
 import shutil
 import re
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple, Union
 
+from busqueda_texto import compilar_catalogo, campos_presentes
+from repositorio_io import cargar_json, guardar_json
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -254,6 +257,116 @@ def extraer_colonia(texto, ubicacion):
     
     return None
 
+# Patrones de extraer_tipo_propiedad, compilados una sola vez al importar. El texto
+# llega en minúsculas (normalizar_texto), así que no hace falta re.IGNORECASE.
+# Menciones explícitas de cada tipo
+_MENCIONES_EXPLICITAS = {
+    'Casa': [
+        r'(?:hermosa|bonita|preciosa|bella|linda|nueva|amplia|moderna|vendo|rento)\s+casa',
+        r'casa(?:\s+(?:sola|nueva|individual|habitacional|residencial|unifamiliar))?(?:\s+en\s+(?:venta|renta))?',
+        r'casa\s+(?:en|con|de|nueva)',
+        r'residencia(?:\s+(?:nueva|moderna|amplia))?',
+        r'chalet',
+        r'vivienda(?:\s+unifamiliar)?'
+    ],
+    'Departamento': [
+        r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|moderno|vendo|rento)\s+departamento',
+        r'departamento(?:\s+(?:nuevo|tipo|estudio))?(?:\s+en\s+(?:venta|renta))?',
+        r'depto(?:\.|\s+)',
+        r'dpto(?:\.|\s+)',
+        r'apartamento',
+        r'apto(?:\.|\s+)',
+        r'pent\s*house',
+        r'penthouse',
+        r'loft'
+    ],
+    'Terreno': [
+        r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|vendo|rento)\s+terreno',
+        r'terreno(?:s)?(?:\s+(?:plano|urbano|residencial))?(?:\s+en\s+(?:venta|renta))?',
+        r'lote(?:s)?(?:\s+(?:residencial|urbano|comercial))?',
+        r'predio(?:\s+(?:urbano|residencial))?',
+        r'parcela',
+        r'solar(?:\s+urbano)?',
+        r'remate\s+de\s+terreno',
+        r'hectareas?(?:\s+de\s+terreno)?',
+        r'has?(?:\.|\s+)(?:de\s+terreno)?',
+        r'm2\s+(?:de\s+)?terreno',
+        r'metros?\s+(?:cuadrados?\s+)?(?:de\s+)?terreno'
+    ],
+    'Local': [
+        r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|moderno|vendo|rento)\s+local',
+        r'local(?:\s+(?:comercial|nuevo))?(?:\s+en\s+(?:venta|renta))?',
+        r'bodega(?:\s+comercial)?',
+        r'nave(?:\s+industrial)?',
+        r'oficina(?:\s+comercial)?',
+        r'consultorio',
+        r'despacho',
+        r'plaza(?:\s+comercial)?'
+    ]
+}
+
+# Basta una mención por tipo: cada lista se une en una sola alternación
+_RE_MENCIONES = {
+    tipo: re.compile("|".join(f"(?:{p})" for p in patrones))
+    for tipo, patrones in _MENCIONES_EXPLICITAS.items()
+}
+
+# Características físicas de cada tipo (cada coincidencia suma puntos)
+_CARACTERISTICAS_TIPO = {
+    'Casa': [
+        r'\d+\s*(?:recamaras?|rec(?:s|\.|amaras?)?|habitaciones?|cuartos?|dormitorios?)',
+        r'(?:ba[ñn]os?|wc|sanitarios?)',
+        r'cocina\s+(?:integral|equipada)',
+        r'sala\s*(?:y|,)?\s*comedor',
+        r'cochera|garage|estacionamiento',
+        r'planta\s+(?:alta|baja)',
+        r'jardin|patio',
+        r'terraza|balcon'
+    ],
+    'Departamento': [
+        r'edificio',
+        r'torre',
+        r'nivel\s+\d+',
+        r'piso\s+\d+',
+        r'\d+(?:er|do|ro|to|vo|°)?\s+piso',
+        r'elevador',
+        r'ascensor',
+        r'condominio\s+vertical',
+        r'desarrollo\s+vertical'
+    ],
+    'Terreno': [
+        r'(?:terreno|lote)\s+(?:\d+\s*)?(?:x|por)\s*\d+',
+        r'(?:uso\s+de\s+)?suelo\s+(?:habitacional|comercial|mixto)',
+        r'escrituras?\s+(?:en\s+)?regla',
+        r'ejidal(?:es)?',
+        r'colindancias',
+        r'medidas\s+y\s+colindancias',
+        r'poligonal',
+        r'topografia'
+    ],
+    'Local': [
+        r'cortina\s+metalica',
+        r'zona\s+comercial',
+        r'uso\s+comercial',
+        r'local(?:es)?\s+(?:adjuntos?|contiguos?)',
+        r'area\s+de\s+exhibicion',
+        r'vitrina|aparador',
+        r'almacen|bodega'
+    ]
+}
+
+_RE_CARACTERISTICAS = {
+    tipo: tuple(re.compile(p) for p in patrones)
+    for tipo, patrones in _CARACTERISTICAS_TIPO.items()
+}
+
+_RE_CONTEXTO_TIPO = (
+    ('Casa', re.compile(r'(?:casa|vivienda|hogar|residencia)(?:\s+en\s+(?:venta|renta))?')),
+    ('Departamento', re.compile(r'(?:departamento|depto|dpto|apartamento|apto)(?:\s+en\s+(?:venta|renta))?')),
+    ('Terreno', re.compile(r'(?:terreno|lote|predio|solar)(?:\s+en\s+(?:venta|renta))?')),
+    ('Local', re.compile(r'(?:local|bodega|nave|oficina|consultorio)(?:\s+en\s+(?:venta|renta))?')),
+)
+
 def extraer_tipo_propiedad(texto):
     """Extrae el tipo de propiedad con mejor categorización."""
     if not texto:
@@ -265,115 +378,28 @@ def extraer_tipo_propiedad(texto):
     titulo = texto.split('\n')[0] if '\n' in texto else texto
     descripcion = '\n'.join(texto.split('\n')[1:]) if '\n' in texto else ''
     
-    # Patrones de mención explícita por tipo
-    menciones_explicitas = {
-        'Casa': [
-            r'(?:hermosa|bonita|preciosa|bella|linda|nueva|amplia|moderna|vendo|rento)\s+casa',
-            r'casa(?:\s+(?:sola|nueva|individual|habitacional|residencial|unifamiliar))?(?:\s+en\s+(?:venta|renta))?',
-            r'casa\s+(?:en|con|de|nueva)',
-            r'residencia(?:\s+(?:nueva|moderna|amplia))?',
-            r'chalet',
-            r'vivienda(?:\s+unifamiliar)?'
-        ],
-        'Departamento': [
-            r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|moderno|vendo|rento)\s+departamento',
-            r'departamento(?:\s+(?:nuevo|tipo|estudio))?(?:\s+en\s+(?:venta|renta))?',
-            r'depto(?:\.|\s+)',
-            r'dpto(?:\.|\s+)',
-            r'apartamento',
-            r'apto(?:\.|\s+)',
-            r'pent\s*house',
-            r'penthouse',
-            r'loft'
-        ],
-        'Terreno': [
-            r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|vendo|rento)\s+terreno',
-            r'terreno(?:s)?(?:\s+(?:plano|urbano|residencial))?(?:\s+en\s+(?:venta|renta))?',
-            r'lote(?:s)?(?:\s+(?:residencial|urbano|comercial))?',
-            r'predio(?:\s+(?:urbano|residencial))?',
-            r'parcela',
-            r'solar(?:\s+urbano)?',
-            r'remate\s+de\s+terreno',
-            r'hectareas?(?:\s+de\s+terreno)?',
-            r'has?(?:\.|\s+)(?:de\s+terreno)?',
-            r'm2\s+(?:de\s+)?terreno',
-            r'metros?\s+(?:cuadrados?\s+)?(?:de\s+)?terreno'
-        ],
-        'Local': [
-            r'(?:hermoso|bonito|precioso|bello|lindo|nuevo|amplio|moderno|vendo|rento)\s+local',
-            r'local(?:\s+(?:comercial|nuevo))?(?:\s+en\s+(?:venta|renta))?',
-            r'bodega(?:\s+comercial)?',
-            r'nave(?:\s+industrial)?',
-            r'oficina(?:\s+comercial)?',
-            r'consultorio',
-            r'despacho',
-            r'plaza(?:\s+comercial)?'
-        ]
-    }
     
     # Buscar menciones explícitas en la descripción primero
-    for tipo, patrones in menciones_explicitas.items():
+    for tipo, patron in _RE_MENCIONES.items():
         # Dar prioridad a la descripción
-        if descripcion and any(re.search(patron, descripcion, re.IGNORECASE) for patron in patrones):
+        if descripcion and patron.search(descripcion):
             return tipo
             
     # Si no hay mención explícita en la descripción, buscar en el título
-    for tipo, patrones in menciones_explicitas.items():
-        if any(re.search(patron, titulo, re.IGNORECASE) for patron in patrones):
+    for tipo, patron in _RE_MENCIONES.items():
+        if patron.search(titulo):
             return tipo
             
     # Si aún no hay match, buscar características físicas
-    caracteristicas = {
-        'Casa': [
-            r'\d+\s*(?:recamaras?|rec(?:s|\.|amaras?)?|habitaciones?|cuartos?|dormitorios?)',
-            r'(?:ba[ñn]os?|wc|sanitarios?)',
-            r'cocina\s+(?:integral|equipada)',
-            r'sala\s*(?:y|,)?\s*comedor',
-            r'cochera|garage|estacionamiento',
-            r'planta\s+(?:alta|baja)',
-            r'jardin|patio',
-            r'terraza|balcon'
-        ],
-        'Departamento': [
-            r'edificio',
-            r'torre',
-            r'nivel\s+\d+',
-            r'piso\s+\d+',
-            r'\d+(?:er|do|ro|to|vo|°)?\s+piso',
-            r'elevador',
-            r'ascensor',
-            r'condominio\s+vertical',
-            r'desarrollo\s+vertical'
-        ],
-        'Terreno': [
-            r'(?:terreno|lote)\s+(?:\d+\s*)?(?:x|por)\s*\d+',
-            r'(?:uso\s+de\s+)?suelo\s+(?:habitacional|comercial|mixto)',
-            r'escrituras?\s+(?:en\s+)?regla',
-            r'ejidal(?:es)?',
-            r'colindancias',
-            r'medidas\s+y\s+colindancias',
-            r'poligonal',
-            r'topografia'
-        ],
-        'Local': [
-            r'cortina\s+metalica',
-            r'zona\s+comercial',
-            r'uso\s+comercial',
-            r'local(?:es)?\s+(?:adjuntos?|contiguos?)',
-            r'area\s+de\s+exhibicion',
-            r'vitrina|aparador',
-            r'almacen|bodega'
-        ]
-    }
     
     # Contar características de cada tipo
-    puntos = {tipo: 0 for tipo in caracteristicas.keys()}
+    puntos = {tipo: 0 for tipo in _RE_CARACTERISTICAS}
     
     # Dar más peso a las características en la descripción
-    for tipo, patrones in caracteristicas.items():
+    for tipo, patrones in _RE_CARACTERISTICAS.items():
         if descripcion:
-            puntos[tipo] += 2 * sum(1 for patron in patrones if re.search(patron, descripcion, re.IGNORECASE))
-        puntos[tipo] += sum(1 for patron in patrones if re.search(patron, titulo, re.IGNORECASE))
+            puntos[tipo] += 2 * sum(1 for patron in patrones if patron.search(descripcion))
+        puntos[tipo] += sum(1 for patron in patrones if patron.search(titulo))
     
     # Si hay características claras de un tipo, usarlas
     max_puntos = max(puntos.values())
@@ -383,14 +409,9 @@ def extraer_tipo_propiedad(texto):
                 return tipo
     
     # Si no hay características claras, intentar inferir por el contexto
-    if re.search(r'(?:casa|vivienda|hogar|residencia)(?:\s+en\s+(?:venta|renta))?', texto, re.IGNORECASE):
-        return 'Casa'
-    elif re.search(r'(?:departamento|depto|dpto|apartamento|apto)(?:\s+en\s+(?:venta|renta))?', texto, re.IGNORECASE):
-        return 'Departamento'
-    elif re.search(r'(?:terreno|lote|predio|solar)(?:\s+en\s+(?:venta|renta))?', texto, re.IGNORECASE):
-        return 'Terreno'
-    elif re.search(r'(?:local|bodega|nave|oficina|consultorio)(?:\s+en\s+(?:venta|renta))?', texto, re.IGNORECASE):
-        return 'Local'
+    for tipo, patron in _RE_CONTEXTO_TIPO:
+        if patron.search(texto):
+            return tipo
     
     return None
 
@@ -472,50 +493,73 @@ def extraer_legal(texto):
         }
     }
 
+# Mapeo de colonias a ciudades
+_COLONIAS_CIUDADES = {
+    # Cuernavaca
+    "Lomas de Cortés": "Cuernavaca", "Acapantzingo": "Cuernavaca",
+    "Delicias": "Cuernavaca", "Palmira": "Cuernavaca",
+    "Tlaltenango": "Cuernavaca", "Vista Hermosa": "Cuernavaca",
+    "Rancho Cortés": "Cuernavaca", "Reforma": "Cuernavaca",
+    "Chapultepec": "Cuernavaca", "Buenavista": "Cuernavaca",
+    "Maravillas": "Cuernavaca", "Amatitlán": "Cuernavaca",
+    "Antonio Barona": "Cuernavaca", "Lomas de la Selva": "Cuernavaca",
+    "Lomas de Tzompantle": "Cuernavaca", "Lomas de Atzingo": "Cuernavaca",
+    "Lomas de Tetela": "Cuernavaca", "Alta Vista": "Cuernavaca",
+    "Jardines de Cuernavaca": "Cuernavaca", "Real de Tetela": "Cuernavaca",
+    "Provincias de Morelos": "Cuernavaca", "Teopanzolco": "Cuernavaca",
+    "Lomas de Ahuatlán": "Cuernavaca", "Las Palmas": "Cuernavaca",
+    "Cantarranas": "Cuernavaca", "Centro": "Cuernavaca",
+    "Chipitlán": "Cuernavaca", "Lomas de Cortes": "Cuernavaca",
+    "Ahuatepec": "Cuernavaca",
+    # Temixco
+    "Burgos": "Temixco", "Tres de Mayo": "Temixco",
+    "Burgos Bugambilias": "Temixco", "Lomas de Cuernavaca": "Temixco",
+    "Campo Verde": "Temixco", "Los Presidentes": "Temixco",
+    "Alta Palmira": "Temixco", "Azteca": "Temixco",
+    "Las Rosas": "Temixco",
+    # Jiutepec
+    "Jardines de la Hacienda": "Jiutepec", "Tejalpa": "Jiutepec",
+    "Civac": "Jiutepec", "La Calera": "Jiutepec",
+    "Independencia": "Jiutepec", "Morelos": "Jiutepec",
+    "Tlahuapan": "Jiutepec", "Las Fincas": "Jiutepec",
+    "Kloster Sumiya": "Jiutepec", "Sumiya": "Jiutepec",
+    # Emiliano Zapata
+    "Tezoyuca": "Emiliano Zapata", "1 de Mayo": "Emiliano Zapata",
+    "El Capiri": "Emiliano Zapata", "Las Garzas": "Emiliano Zapata",
+    # Yautepec
+    "Oaxtepec": "Yautepec", "Cocoyoc": "Yautepec",
+    "Oacalco": "Yautepec", "La Joya": "Yautepec",
+    # Monte Casino
+    "Monte Casino": "Cuernavaca"
+}
+
+# Ciudades buscadas por nombre; gana la primera del diccionario que aparezca
+_CIUDADES_CONOCIDAS = {
+    "cuernavaca": "Cuernavaca",
+    "temixco": "Temixco",
+    "jiutepec": "Jiutepec",
+    "zapata": "Emiliano Zapata",
+    "yautepec": "Yautepec",
+    "xochitepec": "Xochitepec",
+    "tepoztlan": "Tepoztlán",
+    "emiliano zapata": "Emiliano Zapata"
+}
+
+# Un solo recorrido del texto por catálogo en lugar de una búsqueda por nombre
+_CATALOGO_CIUDADES = {clave: [clave] for clave in _CIUDADES_CONOCIDAS}
+_AUTOMATA_CIUDADES = compilar_catalogo(_CATALOGO_CIUDADES)
+_CATALOGO_COLONIAS = {colonia: [colonia.lower()] for colonia in _COLONIAS_CIUDADES}
+_AUTOMATA_COLONIAS = compilar_catalogo(_CATALOGO_COLONIAS)
+
+def _primer_campo_presente(texto, catalogo, automata):
+    """Devuelve el primer campo del catálogo (en su orden) con alguna palabra en el texto."""
+    presentes = campos_presentes(texto, catalogo, automata)
+    return next((campo for campo in catalogo if campo in presentes), None)
+
 def extraer_ubicacion_detallada(texto, ubicacion_original):
     """Extrae información detallada de ubicación."""
     ubicacion = {}  # Empezar con un diccionario vacío
     
-    # Mapeo de colonias a ciudades
-    colonias_ciudades = {
-        # Cuernavaca
-        "Lomas de Cortés": "Cuernavaca", "Acapantzingo": "Cuernavaca",
-        "Delicias": "Cuernavaca", "Palmira": "Cuernavaca",
-        "Tlaltenango": "Cuernavaca", "Vista Hermosa": "Cuernavaca",
-        "Rancho Cortés": "Cuernavaca", "Reforma": "Cuernavaca",
-        "Chapultepec": "Cuernavaca", "Buenavista": "Cuernavaca",
-        "Maravillas": "Cuernavaca", "Amatitlán": "Cuernavaca",
-        "Antonio Barona": "Cuernavaca", "Lomas de la Selva": "Cuernavaca",
-        "Lomas de Tzompantle": "Cuernavaca", "Lomas de Atzingo": "Cuernavaca",
-        "Lomas de Tetela": "Cuernavaca", "Alta Vista": "Cuernavaca",
-        "Jardines de Cuernavaca": "Cuernavaca", "Real de Tetela": "Cuernavaca",
-        "Provincias de Morelos": "Cuernavaca", "Teopanzolco": "Cuernavaca",
-        "Lomas de Ahuatlán": "Cuernavaca", "Las Palmas": "Cuernavaca",
-        "Cantarranas": "Cuernavaca", "Centro": "Cuernavaca",
-        "Chipitlán": "Cuernavaca", "Lomas de Cortes": "Cuernavaca",
-        "Ahuatepec": "Cuernavaca",
-        # Temixco
-        "Burgos": "Temixco", "Tres de Mayo": "Temixco",
-        "Burgos Bugambilias": "Temixco", "Lomas de Cuernavaca": "Temixco",
-        "Campo Verde": "Temixco", "Los Presidentes": "Temixco",
-        "Alta Palmira": "Temixco", "Azteca": "Temixco",
-        "Las Rosas": "Temixco",
-        # Jiutepec
-        "Jardines de la Hacienda": "Jiutepec", "Tejalpa": "Jiutepec",
-        "Civac": "Jiutepec", "La Calera": "Jiutepec",
-        "Independencia": "Jiutepec", "Morelos": "Jiutepec",
-        "Tlahuapan": "Jiutepec", "Las Fincas": "Jiutepec",
-        "Kloster Sumiya": "Jiutepec", "Sumiya": "Jiutepec",
-        # Emiliano Zapata
-        "Tezoyuca": "Emiliano Zapata", "1 de Mayo": "Emiliano Zapata",
-        "El Capiri": "Emiliano Zapata", "Las Garzas": "Emiliano Zapata",
-        # Yautepec
-        "Oaxtepec": "Yautepec", "Cocoyoc": "Yautepec",
-        "Oacalco": "Yautepec", "La Joya": "Yautepec",
-        # Monte Casino
-        "Monte Casino": "Cuernavaca"
-    }
-    
     # Mantener la dirección completa y texto original si existen
     if ubicacion_original and isinstance(ubicacion_original, dict):
         ubicacion["direccion_completa"] = ubicacion_original.get("direccion_completa", "")
@@ -535,51 +579,27 @@ def extraer_ubicacion_detallada(texto, ubicacion_original):
     ]
     
     # Primero buscar ciudad en la descripción
-    ciudades_conocidas = {
-        "cuernavaca": "Cuernavaca",
-        "temixco": "Temixco",
-        "jiutepec": "Jiutepec",
-        "zapata": "Emiliano Zapata",
-        "yautepec": "Yautepec",
-        "xochitepec": "Xochitepec",
-        "tepoztlan": "Tepoztlán",
-        "emiliano zapata": "Emiliano Zapata"
-    }
-    
     texto_lower = texto.lower()
-    for ciudad_key, ciudad_nombre in ciudades_conocidas.items():
-        if ciudad_key in texto_lower:
-            ubicacion["ciudad"] = ciudad_nombre
-            break
+    if ciudad_key := _primer_campo_presente(texto_lower, _CATALOGO_CIUDADES, _AUTOMATA_CIUDADES):
+        ubicacion["ciudad"] = _CIUDADES_CONOCIDAS[ciudad_key]
     
     # Si no se encontró ciudad en la descripción, buscar en direccion_completa
     if "ciudad" not in ubicacion and ubicacion_original and isinstance(ubicacion_original, dict):
         dir_completa = ubicacion_original.get("direccion_completa", "").lower()
-        for ciudad_key, ciudad_nombre in ciudades_conocidas.items():
-            if ciudad_key in dir_completa:
-                ubicacion["ciudad"] = ciudad_nombre
-                break
+        if ciudad_key := _primer_campo_presente(dir_completa, _CATALOGO_CIUDADES, _AUTOMATA_CIUDADES):
+            ubicacion["ciudad"] = _CIUDADES_CONOCIDAS[ciudad_key]
     
     # Buscar colonia primero en la descripción
-    colonia = None
-    for col, ciudad in colonias_ciudades.items():
-        if col.lower() in texto_lower:
-            colonia = col
-            # Si no tenemos ciudad aún, usar la ciudad asociada a la colonia
-            if "ciudad" not in ubicacion:
-                ubicacion["ciudad"] = ciudad
-            break
+    colonia = _primer_campo_presente(texto_lower, _CATALOGO_COLONIAS, _AUTOMATA_COLONIAS)
     
     # Si no se encontró colonia en la descripción, buscar en direccion_completa
     if not colonia and ubicacion_original and isinstance(ubicacion_original, dict):
         dir_completa = ubicacion_original.get("direccion_completa", "").lower()
-        for col, ciudad in colonias_ciudades.items():
-            if col.lower() in dir_completa:
-                colonia = col
-                # Si no tenemos ciudad aún, usar la ciudad asociada a la colonia
-                if "ciudad" not in ubicacion:
-                    ubicacion["ciudad"] = ciudad
-                break
+        colonia = _primer_campo_presente(dir_completa, _CATALOGO_COLONIAS, _AUTOMATA_COLONIAS)
+    
+    # Si no tenemos ciudad aún, usar la ciudad asociada a la colonia
+    if colonia and "ciudad" not in ubicacion:
+        ubicacion["ciudad"] = _COLONIAS_CIUDADES[colonia]
     
     # Buscar referencias en ambos textos
     textos_busqueda = [texto_lower]
@@ -605,6 +625,9 @@ def extraer_ubicacion_detallada(texto, ubicacion_original):
     
     return ubicacion
 
+# Cualquier carácter que no forma parte del número marca su fin
+_RE_FIN_NUMERO = re.compile(r'[^0-9,.KkMm]')
+
 def procesar_numero_mexicano(texto: str) -> Optional[float]:
     """
     Procesa un número en formato mexicano (con comas y puntos) y lo convierte a float.
@@ -627,7 +650,7 @@ def procesar_numero_mexicano(texto: str) -> Optional[float]:
     texto = texto.replace("$", "").replace(" ", "")
     
     # Remover texto adicional después del número
-    texto = re.split(r'[^0-9,.KkMm]', texto)[0]
+    texto = _RE_FIN_NUMERO.split(texto, 1)[0]
     
     # Detectar el formato del número
     tiene_punto = "." in texto
@@ -767,6 +790,48 @@ def extraer_precio(texto: str) -> Dict:
         "formato": "Precio no disponible"
     }
 
+# Patrones para recámaras
+_PATRONES_RECAMARAS = tuple(re.compile(p) for p in (
+    r"(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?|cuartos?|alcobas?)",
+    r"(?:rec[aá]maras?|habitaciones?|dormitorios?)\\s*:\\s*(\\d+)",
+    r"(?:con|tiene)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?)",
+    r"(\d+)\s*(?:rec|hab|dorm)\.?",
+    r"casa\s*(?:de|con)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?)",
+    r"departamento\s*(?:de|con)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?)",
+    r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?)"
+))
+
+# Patrones para baños completos y medios baños combinados
+_PATRONES_BANOS_COMBINADOS = tuple(re.compile(p) for p in (
+    r"(\d+)(?:\s*baños?)?\s*(?:y|,)?\s*(?:medio|1\/2)",
+    r"(\d+)\s*\.5\s*(?:baños?|sanitarios?)",
+    r"(\d+)\s*baños?\s*1\/2",
+    r"(\d+)\s*baños?\s*y\s*medio",
+    r"(\d+)\s*baños?\s*y\s*1\/2"
+))
+
+# Patrones para baños completos
+_PATRONES_BANOS = tuple(re.compile(p) for p in (
+    r"(\d+)\s*(?:baños?|sanitarios?|wc)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
+    r"(?:baños?|sanitarios?)\\s*:\\s*(\d+)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
+    r"(?:con|tiene)\s*(\d+)\s*(?:baños?|sanitarios?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
+    r"(\d+)\s*(?:baño completo|b\.?c\.?)",
+    r"(\d+)\s*(?:baños?\s*completos?)",
+    r"casa\s*(?:de|con)\s*(\d+)\s*(?:baños?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
+    r"departamento\s*(?:de|con)\s*(\d+)\s*(?:baños?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
+    r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:baños?|sanitarios?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))"
+))
+
+# Patrones para medios baños independientes
+_PATRONES_MEDIO_BANO = tuple(re.compile(p) for p in (
+    r"(\d+)\s*(?:medio\s*baño|baño\s*medio)",
+    r"(\d+)\s*(?:m\.?\s*b\.?|b\.?\s*m\.?)",
+    r"(?:con|tiene)\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)",
+    r"(?:y|más)\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)",
+    r"(\d+)\s*(?:sanitario\s*medio|wc\s*medio)",
+    r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)"
+))
+
 def extraer_recamaras_y_banos(texto):
     """Extrae el número de recámaras y baños con validación mejorada."""
     texto = texto.lower()
@@ -776,51 +841,9 @@ def extraer_recamaras_y_banos(texto):
         "medio_bano": None
     }
     
-    # Patrones para recámaras
-    patrones_recamaras = [
-        r"(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?|cuartos?|alcobas?)",
-        r"(?:rec[aá]maras?|habitaciones?|dormitorios?)\\s*:\\s*(\\d+)",
-        r"(?:con|tiene)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?)",
-        r"(\d+)\s*(?:rec|hab|dorm)\.?",
-        r"casa\s*(?:de|con)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?)",
-        r"departamento\s*(?:de|con)\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?)",
-        r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:rec[aá]maras?|habitaciones?|dormitorios?)"
-    ]
-    
-    # Patrones para baños completos y medios baños combinados
-    patrones_banos_combinados = [
-        r"(\d+)(?:\s*baños?)?\s*(?:y|,)?\s*(?:medio|1\/2)",
-        r"(\d+)\s*\.5\s*(?:baños?|sanitarios?)",
-        r"(\d+)\s*baños?\s*1\/2",
-        r"(\d+)\s*baños?\s*y\s*medio",
-        r"(\d+)\s*baños?\s*y\s*1\/2"
-    ]
-    
-    # Patrones para baños completos
-    patrones_banos = [
-        r"(\d+)\s*(?:baños?|sanitarios?|wc)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
-        r"(?:baños?|sanitarios?)\\s*:\\s*(\d+)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
-        r"(?:con|tiene)\s*(\d+)\s*(?:baños?|sanitarios?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
-        r"(\d+)\s*(?:baño completo|b\.?c\.?)",
-        r"(\d+)\s*(?:baños?\s*completos?)",
-        r"casa\s*(?:de|con)\s*(\d+)\s*(?:baños?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
-        r"departamento\s*(?:de|con)\s*(\d+)\s*(?:baños?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))",
-        r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:baños?|sanitarios?)(?!\s*(?:y|,)?\s*(?:medio|1\/2))"
-    ]
-    
-    # Patrones para medios baños independientes
-    patrones_medio_bano = [
-        r"(\d+)\s*(?:medio\s*baño|baño\s*medio)",
-        r"(\d+)\s*(?:m\.?\s*b\.?|b\.?\s*m\.?)",
-        r"(?:con|tiene)\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)",
-        r"(?:y|más)\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)",
-        r"(\d+)\s*(?:sanitario\s*medio|wc\s*medio)",
-        r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:medio\s*baño|baño\s*medio)"
-    ]
-    
     # Buscar recámaras
-    for patron in patrones_recamaras:
-        if match := re.search(patron, texto):
+    for patron in _PATRONES_RECAMARAS:
+        if match := patron.search(texto):
             try:
                 valor = int(match.group(1))
                 if 1 <= valor <= 10:  # Validación de rango lógico
@@ -830,8 +853,8 @@ def extraer_recamaras_y_banos(texto):
                 continue
     
     # Primero buscar patrones combinados de baños completos y medios
-    for patron in patrones_banos_combinados:
-        if match := re.search(patron, texto):
+    for patron in _PATRONES_BANOS_COMBINADOS:
+        if match := patron.search(texto):
             try:
                 valor = int(match.group(1))
                 if 1 <= valor <= 6:  # Validación de rango lógico
@@ -843,8 +866,8 @@ def extraer_recamaras_y_banos(texto):
     
     # Si no se encontró patrón combinado, buscar baños completos
     if resultado["banos"] is None:
-        for patron in patrones_banos:
-            if match := re.search(patron, texto):
+        for patron in _PATRONES_BANOS:
+            if match := patron.search(texto):
                 try:
                     valor = int(match.group(1))
                     if 1 <= valor <= 6:  # Validación de rango lógico
@@ -855,8 +878,8 @@ def extraer_recamaras_y_banos(texto):
     
     # Buscar medios baños específicamente si no se encontró en patrón combinado
     if resultado["medio_bano"] is None:
-        for patron in patrones_medio_bano:
-            if match := re.search(patron, texto):
+        for patron in _PATRONES_MEDIO_BANO:
+            if match := patron.search(texto):
                 try:
                     valor = int(match.group(1))
                     if 1 <= valor <= 2:  # Validación de rango lógico
@@ -874,45 +897,34 @@ def extraer_recamaras_y_banos(texto):
     
     return resultado
 
-def extraer_niveles(texto, tipo_propiedad=None):
-    """Extrae el número de niveles con validación mejorada."""
-    texto = texto.lower()
-    
-    # Si es un departamento, no puede ser de un nivel
-    es_departamento = tipo_propiedad == "departamento" or any(frase in texto for frase in [
+# Frases de extraer_niveles por indicador, buscadas todas en una sola pasada
+_FRASES_NIVELES = {
+    "departamento": [
         "departamento", "depto", "condominio vertical",
         "edificio", "torre"
-    ])
-    
-    # Detectar menciones de recámaras en planta baja
-    tiene_recamara_pb = any(frase in texto for frase in [
+    ],
+    "recamara_pb": [
         "recamara en planta baja", "recámara en planta baja",
         "habitacion en planta baja", "habitación en planta baja",
         "dormitorio en planta baja"
-    ])
-    
-    # Detectar si es de un nivel explícitamente
-    es_un_nivel = not es_departamento and any(frase in texto for frase in [
+    ],
+    "un_nivel": [
         "un nivel", "una planta", "planta baja solamente",
         "sin escaleras", "todo en un nivel",
         "todo en planta baja", "casa en un nivel",
         "casa de un nivel", "1 nivel", "un piso solamente",
         "casa en planta baja", "todo en pb",
         "solo planta baja", "únicamente planta baja"
-    ])
-    
-    # Detectar si tiene opción a crecer
-    opcion_crecer = any(frase in texto for frase in [
+    ],
+    "opcion_crecer": [
         "opción de crecimiento", "opcion de crecimiento",
         "posibilidad de crecer", "puede crecer",
         "con opción a segundo piso", "con opcion a segundo piso",
         "se puede construir arriba", "preparada para segundo piso",
         "preparado para segundo piso", "con preparación para segundo piso",
         "con preparacion para segundo piso"
-    ])
-    
-    # Detectar si tiene planta alta o segundo piso de manera más precisa
-    tiene_planta_alta = any(frase in texto for frase in [
+    ],
+    "planta_alta": [
         "planta alta", "segundo piso", "2do piso",
         "segunda planta", "piso superior", "planta superior",
         "nivel superior", "dos niveles", "2 niveles",
@@ -921,22 +933,44 @@ def extraer_niveles(texto, tipo_propiedad=None):
         "habitaciones en planta alta", "dormitorios en planta alta",
         "escaleras interiores", "escaleras a segundo piso",
         "escalera a planta alta"
-    ])
-    
-    # Patrones para números específicos de niveles
-    patrones_niveles = [
-        r"(\d+)\s*(?:niveles?|pisos?|plantas?)",
-        r"(?:de|con)\s*(\d+)\s*(?:niveles?|pisos?|plantas?)",
-        r"(?:niveles?|pisos?|plantas?)\s*:\s*(\d+)",
-        r"(?:casa|propiedad)\s*(?:de|con)\s*(\d+)\s*(?:niveles?|pisos?|plantas?)",
-        r"(\d+)\s*(?:niv\.?|p\.?b\.?\s*\+\s*p\.?a\.?)"
     ]
+}
+_AUTOMATA_NIVELES = compilar_catalogo(_FRASES_NIVELES)
+
+# Patrones para números específicos de niveles
+_PATRONES_NIVELES = tuple(re.compile(p) for p in (
+    r"(\d+)\s*(?:niveles?|pisos?|plantas?)",
+    r"(?:de|con)\s*(\d+)\s*(?:niveles?|pisos?|plantas?)",
+    r"(?:niveles?|pisos?|plantas?)\s*:\s*(\d+)",
+    r"(?:casa|propiedad)\s*(?:de|con)\s*(\d+)\s*(?:niveles?|pisos?|plantas?)",
+    r"(\d+)\s*(?:niv\.?|p\.?b\.?\s*\+\s*p\.?a\.?)"
+))
+
+def extraer_niveles(texto, tipo_propiedad=None):
+    """Extrae el número de niveles con validación mejorada."""
+    texto = texto.lower()
+    presentes = campos_presentes(texto, _FRASES_NIVELES, _AUTOMATA_NIVELES)
+    
+    # Si es un departamento, no puede ser de un nivel
+    es_departamento = tipo_propiedad == "departamento" or "departamento" in presentes
+    
+    # Detectar menciones de recámaras en planta baja
+    tiene_recamara_pb = "recamara_pb" in presentes
+    
+    # Detectar si es de un nivel explícitamente
+    es_un_nivel = not es_departamento and "un_nivel" in presentes
+    
+    # Detectar si tiene opción a crecer
+    opcion_crecer = "opcion_crecer" in presentes
+    
+    # Detectar si tiene planta alta o segundo piso de manera más precisa
+    tiene_planta_alta = "planta_alta" in presentes
     
     niveles = None
     
     # Buscar número específico de niveles
-    for patron in patrones_niveles:
-        if match := re.search(patron, texto):
+    for patron in _PATRONES_NIVELES:
+        if match := patron.search(texto):
             try:
                 valor = int(match.group(1))
                 if 1 <= valor <= 4:  # Validación de rango lógico
@@ -962,43 +996,44 @@ def extraer_niveles(texto, tipo_propiedad=None):
         "es_departamento": es_departamento
     }
 
+# Patrones para número de estacionamientos
+_PATRONES_ESTACIONAMIENTO = tuple(re.compile(p) for p in (
+    r"(\d+)\s*(?:estacionamientos?|cajone?s?|lugares?\s*de\s*estacionamiento)",
+    r"(?:estacionamiento|cajon|lugar)\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"(?:con|tiene)\s*(\d+)\s*(?:estacionamientos?|cajone?s?|lugares?\s*de\s*estacionamiento)",
+    r"garage\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"(\d+)\s*(?:auto|carro|coche)s?\s*en\s*(?:estacionamiento|garage)",
+    r"cochera\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"(\d+)\s*(?:lugar|espacio)s?\s*(?:de|para)\s*(?:auto|carro|coche)s?",
+    r"capacidad\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"estacionamiento\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"cochera\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"garaje\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
+    r"(\d+)\s*autos?\s*en\s*(?:cochera|garage|estacionamiento)",
+    r"(\d+)\s*lugares?\s*de\s*estacionamiento",
+    r"estacionamiento\s*(\d+)\s*autos?",
+    r"garaje\s*(\d+)\s*autos?",
+    r"cochera\s*(\d+)\s*autos?",
+    r"(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
+    r"garaje\s*(?:para|con)\s*(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
+    r"cochera\s*(?:para|con)\s*(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
+    r"(\d+)\s*(?:cajone?s?|lugares?)\s*(?:cubiertos?|techados?)",
+    r"(\d+)\s*(?:estacionamientos?)\s*(?:cubiertos?|techados?)",
+    r"(\d+)\s*(?:autos?|carros?|coches?)\s*(?:en\s*)?(?:estacionamiento|garage|cochera)\s*(?:cubiertos?|techados?)",
+    r"garaje\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
+    r"cochera\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
+    r"estacionamiento\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
+    r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:autos?|lugares?|cajone?s?)",
+    r"(?:^|\n)\s*▪️?\s*estacionamiento\s*(?:para|de)?\s*(\d+)\s*(?:autos?|carros?|coches?)"
+))
+
 def extraer_estacionamientos(texto):
     """Extrae el número de estacionamientos con validación mejorada."""
     texto = texto.lower()
     
-    patrones_estacionamiento = [
-        r"(\d+)\s*(?:estacionamientos?|cajone?s?|lugares?\s*de\s*estacionamiento)",
-        r"(?:estacionamiento|cajon|lugar)\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"(?:con|tiene)\s*(\d+)\s*(?:estacionamientos?|cajone?s?|lugares?\s*de\s*estacionamiento)",
-        r"garage\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"(\d+)\s*(?:auto|carro|coche)s?\s*en\s*(?:estacionamiento|garage)",
-        r"cochera\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"(\d+)\s*(?:lugar|espacio)s?\s*(?:de|para)\s*(?:auto|carro|coche)s?",
-        r"capacidad\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"estacionamiento\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"cochera\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"garaje\s*(?:para|de)\s*(\d+)\s*(?:auto|carro|coche)s?",
-        r"(\d+)\s*autos?\s*en\s*(?:cochera|garage|estacionamiento)",
-        r"(\d+)\s*lugares?\s*de\s*estacionamiento",
-        r"estacionamiento\s*(\d+)\s*autos?",
-        r"garaje\s*(\d+)\s*autos?",
-        r"cochera\s*(\d+)\s*autos?",
-        r"(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
-        r"garaje\s*(?:para|con)\s*(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
-        r"cochera\s*(?:para|con)\s*(\d+)\s*autos?\s*(?:cubiertos?|techados?)",
-        r"(\d+)\s*(?:cajone?s?|lugares?)\s*(?:cubiertos?|techados?)",
-        r"(\d+)\s*(?:estacionamientos?)\s*(?:cubiertos?|techados?)",
-        r"(\d+)\s*(?:autos?|carros?|coches?)\s*(?:en\s*)?(?:estacionamiento|garage|cochera)\s*(?:cubiertos?|techados?)",
-        r"garaje\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
-        r"cochera\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
-        r"estacionamiento\s*(?:para|con)?\s*(\d+)\s*(?:autos?|carros?|coches?)\s*(?:cubiertos?|techados?)",
-        r"(?:^|\n)\s*▪️?\s*(\d+)\s*(?:autos?|lugares?|cajone?s?)",
-        r"(?:^|\n)\s*▪️?\s*estacionamiento\s*(?:para|de)?\s*(\d+)\s*(?:autos?|carros?|coches?)"
-    ]
-    
     # Buscar coincidencias en los patrones
-    for patron in patrones_estacionamiento:
-        if match := re.search(patron, texto):
+    for patron in _PATRONES_ESTACIONAMIENTO:
+        if match := patron.search(texto):
             try:
                 valor = int(match.group(1))
                 if 1 <= valor <= 10:  # Validación de rango lógico
@@ -1063,6 +1098,22 @@ def extraer_estacionamientos(texto):
         "tipo": None
     }
 
+# Patrones para superficie de terreno
+_PATRONES_TERRENO = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:superficie|terreno)(?:\s+de)?:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
+    r'([\d,.]+)\s*(?:m2|metros?|mt2|mts2)(?:\s+de)?(?:\s+terreno|superficie)',
+    r'(?:lote|terreno)\s+(?:de|con)?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
+    r'([\d,.]+)\s*(?:x|por)\s*([\d,.]+)(?:\s*(?:m2|metros?|mt2|mts2))?',
+    r'(?:frente|fondo)\s*(?:de)?\s*([\d,.]+)(?:\s*(?:m2|metros?|mt2|mts2))?'
+))
+
+# Patrones para superficie de construcción
+_PATRONES_CONSTRUCCION = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:construccion|construidos?)(?:\s+de)?:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
+    r'([\d,.]+)\s*(?:m2|metros?|mt2|mts2)(?:\s+de)?(?:\s+construccion|construidos?)',
+    r'(?:area|superficie)\s+construida:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)'
+))
+
 def extraer_superficies(texto):
     """Extrae superficies de terreno y construcción con validación mejorada."""
     if not texto:
@@ -1078,25 +1129,9 @@ def extraer_superficies(texto):
         "construccion_m2": None
     }
     
-    # Patrones para superficie de terreno
-    patrones_terreno = [
-        r'(?:superficie|terreno)(?:\s+de)?:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
-        r'([\d,.]+)\s*(?:m2|metros?|mt2|mts2)(?:\s+de)?(?:\s+terreno|superficie)',
-        r'(?:lote|terreno)\s+(?:de|con)?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
-        r'([\d,.]+)\s*(?:x|por)\s*([\d,.]+)(?:\s*(?:m2|metros?|mt2|mts2))?',
-        r'(?:frente|fondo)\s*(?:de)?\s*([\d,.]+)(?:\s*(?:m2|metros?|mt2|mts2))?'
-    ]
-    
-    # Patrones para superficie de construcción
-    patrones_construccion = [
-        r'(?:construccion|construidos?)(?:\s+de)?:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)',
-        r'([\d,.]+)\s*(?:m2|metros?|mt2|mts2)(?:\s+de)?(?:\s+construccion|construidos?)',
-        r'(?:area|superficie)\s+construida:?\s*([\d,.]+)\s*(?:m2|metros?|mt2|mts2)'
-    ]
-    
     # Buscar superficie de terreno
-    for patron in patrones_terreno:
-        match = re.search(patron, texto, re.IGNORECASE)
+    for patron in _PATRONES_TERRENO:
+        match = patron.search(texto)
         if match:
             try:
                 # Si el patrón captura dos números (frente x fondo)
@@ -1112,8 +1147,8 @@ def extraer_superficies(texto):
                 continue
     
     # Buscar superficie de construcción
-    for patron in patrones_construccion:
-        match = re.search(patron, texto, re.IGNORECASE)
+    for patron in _PATRONES_CONSTRUCCION:
+        match = patron.search(texto)
         if match:
             try:
                 valor = match.group(1).replace(',', '')
@@ -1168,6 +1203,20 @@ def extraer_caracteristicas(texto, tipo_propiedad=None):
         "opcion_crecer": False
     }
 
+# Patrones para la capacidad de la cisterna
+_PATRONES_CISTERNA = tuple(re.compile(p) for p in (
+    r"cisterna\s*(?:de|con)?\s*(\d+(?:,\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
+    r"cisterna\s*(?:de|con)?\s*(\d+(?:,\d+)?)\s*(?:mil)",
+    r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:,\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
+    r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:,\d+)?)\s*(?:mil)",
+    r"cisterna\s*(?:de|con)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
+    r"cisterna\s*(?:de|con)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)",
+    r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
+    r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)"
+))
+
+_RE_EDAD = re.compile(r"(\d+)\s*(?:años?|year)")
+
 def extraer_caracteristicas_detalladas(texto, caracteristicas_orig=None):
     """
     Extrae características detalladas de la propiedad.
@@ -1249,19 +1298,8 @@ def extraer_caracteristicas_detalladas(texto, caracteristicas_orig=None):
         caract["cisterna"] = "cisterna" in texto_lower
         if caract["cisterna"]:
             # Buscar capacidad de la cisterna
-            patrones_cisterna = [
-                r"cisterna\s*(?:de|con)?\s*(\d+(?:,\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
-                r"cisterna\s*(?:de|con)?\s*(\d+(?:,\d+)?)\s*(?:mil)",
-                r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:,\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
-                r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:,\d+)?)\s*(?:mil)",
-                r"cisterna\s*(?:de|con)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
-                r"cisterna\s*(?:de|con)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)",
-                r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)?\s*(?:litros?|lts?|m3)",
-                r"cisterna\s*(?:con\s*)?capacidad\s*(?:de|para)?\s*(\d+(?:[.,]\d+)?)\s*(?:mil)"
-            ]
-            
-            for patron in patrones_cisterna:
-                if match := re.search(patron, texto_lower):
+            for patron in _PATRONES_CISTERNA:
+                if match := patron.search(texto_lower):
                     try:
                         # Reemplazar comas y puntos por punto decimal
                         valor = match.group(1).replace(",", ".")
@@ -1278,7 +1316,7 @@ def extraer_caracteristicas_detalladas(texto, caracteristicas_orig=None):
     
     # Extraer edad de la propiedad si no existe
     if caract["edad"] is None:
-        match = re.search(r"(\d+)\s*(?:años?|year)", texto.lower())
+        match = _RE_EDAD.search(texto.lower())
         if match:
             try:
                 edad = int(match.group(1))
@@ -1495,6 +1533,27 @@ def extraer_amenidades_detalladas(texto: str) -> Dict:
     
     return amenidades
 
+# Patrones de extraer_tipo_operacion. Cada grupo es una sola alternación
+# compilada: una pasada por el texto en lugar de una por patrón.
+_PATRONES_VENTA = (
+    r'\b(?:venta|vendo|vendemos|se\s+vende)\b',
+    r'\ben\s+venta\b',
+    r'\bprecio\s+de\s+venta\b',
+    r'\bpropiedad\s+(?:en|de)\s+venta\b'
+)
+
+_PATRONES_RENTA = (
+    r'\b(?:renta|rento|rentamos|se\s+renta)\b',
+    r'\ben\s+renta\b',
+    r'\bprecio\s+de\s+renta\b',
+    r'\bpropiedad\s+(?:en|de)\s+renta\b',
+    r'\barrendamiento\b',
+    r'\balquiler\b'
+)
+
+_RE_VENTA = re.compile("|".join(f"(?:{p})" for p in _PATRONES_VENTA))
+_RE_RENTA = re.compile("|".join(f"(?:{p})" for p in _PATRONES_RENTA))
+
 def extraer_tipo_operacion(texto, precio=None):
     """Extrae el tipo de operación con mejor detección."""
     if not texto:
@@ -1503,30 +1562,12 @@ def extraer_tipo_operacion(texto, precio=None):
     texto = normalizar_texto(texto)
     
     # Detectar venta
-    patrones_venta = [
-        r'\b(?:venta|vendo|vendemos|se\s+vende)\b',
-        r'\ben\s+venta\b',
-        r'\bprecio\s+de\s+venta\b',
-        r'\bpropiedad\s+(?:en|de)\s+venta\b'
-    ]
-    
-    for patron in patrones_venta:
-        if re.search(patron, texto):
-            return "venta"
+    if _RE_VENTA.search(texto):
+        return "venta"
     
     # Detectar renta
-    patrones_renta = [
-        r'\b(?:renta|rento|rentamos|se\s+renta)\b',
-        r'\ben\s+renta\b',
-        r'\bprecio\s+de\s+renta\b',
-        r'\bpropiedad\s+(?:en|de)\s+renta\b',
-        r'\barrendamiento\b',
-        r'\balquiler\b'
-    ]
-    
-    for patron in patrones_renta:
-        if re.search(patron, texto):
-            return "renta"
+    if _RE_RENTA.search(texto):
+        return "renta"
             
     # Si el precio es mayor a $300,000, asumimos que es venta
     if precio and precio > 300000:
@@ -1534,6 +1575,26 @@ def extraer_tipo_operacion(texto, precio=None):
     
     return None
 
+# Patrones de es_publicacion_no_inmobiliaria, compilados una sola vez al importar.
+# Los que indican claramente otro producto o servicio van en una sola alternación.
+_PATRONES_NO_INMOBILIARIOS = [
+    r"(?:vendo|venta de|se vende|vendemos)\s+(?:celular|moto|ropa|zapatos|juguetes)",
+    r"(?:rento|renta de|se renta|rentamos)\s+(?:celular|moto|ropa|zapatos|juguetes)",
+    r"(?:vendo|venta de|se vende|vendemos)\s+(?:computadora|laptop|tablet|electrodomestico)",
+    r"(?:rento|renta de|se renta|rentamos)\s+(?:computadora|laptop|tablet|electrodomestico)",
+    r"(?:vendo|venta de|se vende|vendemos)\s+(?:mueble|sillon|cama|colchon)",
+    r"(?:rento|renta de|se renta|rentamos)\s+(?:mueble|sillon|cama|colchon)",
+    r"(?:vendo|venta de|se vende|vendemos)\s+(?:refrigerador|lavadora|secadora|estufa)",
+    r"(?:rento|renta de|se renta|rentamos)\s+(?:refrigerador|lavadora|secadora|estufa)",
+    r"(?:vendo|venta de|se vende|vendemos)\s+(?:herramienta|maquinaria|camion|trailer)",
+    r"(?:rento|renta de|se renta|rentamos)\s+(?:herramienta|maquinaria|camion|trailer)",
+    r"(?:servicio|servicios)\s+de\s+(?:instalacion|reparacion|mantenimiento)",
+    r"(?:se hacen|hacemos|realizo|realizamos)\s+(?:instalaciones|reparaciones|mantenimiento)"
+]
+_RE_NO_INMOBILIARIO = re.compile("|".join(f"(?:{p})" for p in _PATRONES_NO_INMOBILIARIOS))
+_RE_DIMENSIONES = re.compile(r'\d+\s*(?:m2|mts?2|metros?(?:\s+cuadrados?)?)')
+_RE_PRECIO_PESOS = re.compile(r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+
 def es_publicacion_no_inmobiliaria(texto: str) -> bool:
     """
     Detecta si una publicación NO es sobre propiedades inmobiliarias.
@@ -1579,11 +1640,11 @@ def es_publicacion_no_inmobiliaria(texto: str) -> bool:
         return False
         
     # Si menciona metros cuadrados o dimensiones, es válida
-    if re.search(r'\d+\s*(?:m2|mts?2|metros?(?:\s+cuadrados?)?)', texto_lower):
+    if _RE_DIMENSIONES.search(texto_lower):
         return False
         
     # Si tiene un precio alto (>$100,000) y al menos una palabra inmobiliaria o de ubicación
-    precio_match = re.search(r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', texto)
+    precio_match = _RE_PRECIO_PESOS.search(texto)
     if precio_match and (contador_inmobiliarias >= 1 or contador_ubicacion >= 1):
         try:
             precio = float(precio_match.group(1).replace(',', ''))
@@ -1598,24 +1659,8 @@ def es_publicacion_no_inmobiliaria(texto: str) -> bool:
     ]):
         return False
     
-    # Patrones que indican claramente que NO es una propiedad inmobiliaria
-    patrones_no_inmobiliarios = [
-        r"(?:vendo|venta de|se vende|vendemos)\s+(?:celular|moto|ropa|zapatos|juguetes)",
-        r"(?:rento|renta de|se renta|rentamos)\s+(?:celular|moto|ropa|zapatos|juguetes)",
-        r"(?:vendo|venta de|se vende|vendemos)\s+(?:computadora|laptop|tablet|electrodomestico)",
-        r"(?:rento|renta de|se renta|rentamos)\s+(?:computadora|laptop|tablet|electrodomestico)",
-        r"(?:vendo|venta de|se vende|vendemos)\s+(?:mueble|sillon|cama|colchon)",
-        r"(?:rento|renta de|se renta|rentamos)\s+(?:mueble|sillon|cama|colchon)",
-        r"(?:vendo|venta de|se vende|vendemos)\s+(?:refrigerador|lavadora|secadora|estufa)",
-        r"(?:rento|renta de|se renta|rentamos)\s+(?:refrigerador|lavadora|secadora|estufa)",
-        r"(?:vendo|venta de|se vende|vendemos)\s+(?:herramienta|maquinaria|camion|trailer)",
-        r"(?:rento|renta de|se renta|rentamos)\s+(?:herramienta|maquinaria|camion|trailer)",
-        r"(?:servicio|servicios)\s+de\s+(?:instalacion|reparacion|mantenimiento)",
-        r"(?:se hacen|hacemos|realizo|realizamos)\s+(?:instalaciones|reparaciones|mantenimiento)"
-    ]
-    
     # Si tiene patrones claros de otros productos/servicios, es no inmobiliaria
-    if any(re.search(patron, texto_lower) for patron in patrones_no_inmobiliarios):
+    if _RE_NO_INMOBILIARIO.search(texto_lower):
         return True
     
     # Si el precio es muy bajo (menos de $1000), probablemente no es inmobiliaria
@@ -1643,6 +1688,164 @@ def es_publicacion_no_inmobiliaria(texto: str) -> bool:
     # Si no podemos determinar claramente, asumimos que no es inmobiliaria
     return True
 
+# Precio buscado en la descripción cuando el anuncio no trae uno, en orden de prioridad
+_PATRONES_PRECIO_DESCRIPCION = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\$\s*[\d,.]+\s*(?:mil|millones?)?',
+    r'(?:precio|costo|valor):\s*\$?\s*[\d,.]+\s*(?:mil|millones?)?',
+    r'[\d,.]+\s*(?:mil|millones?)\s*(?:de)?\s*pesos'
+))
+
+def procesar_registro(id_propiedad: str, datos: Any) -> Optional[Dict]:
+    """
+    Convierte un registro crudo del repositorio en una propiedad estructurada.
+    Devuelve None si la publicación no es inmobiliaria.
+    """
+    # Extraer descripción según el formato
+    descripcion = ""
+    titulo = ""
+    if isinstance(datos, dict):
+        if isinstance(datos.get("descripcion"), dict):
+            descripcion = datos["descripcion"].get("texto_original", "") or datos["descripcion"].get("texto_limpio", "")
+        elif isinstance(datos.get("descripcion"), str):
+            descripcion = datos["descripcion"]
+        
+        # Extraer título
+        if datos.get("titulo"):
+            titulo = datos["titulo"]
+            descripcion = titulo + ". " + descripcion
+    
+    # Validar si es una publicación inmobiliaria
+    if es_publicacion_no_inmobiliaria(descripcion):
+        return None
+    es_valida = True
+    motivos_invalidez = []
+    
+    # Extraer precio
+    precio_info = None
+    if isinstance(datos, dict):
+        if "precio" in datos:
+            precio_info = datos["precio"]
+        elif "precios" in datos:
+            precio_info = datos["precios"]
+        elif "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
+            precio_info = datos["caracteristicas"].get("precio")
+    
+    # Si el precio es un string o número, convertirlo a diccionario
+    if isinstance(precio_info, (str, int, float)):
+        precio_info = {"valor": str(precio_info), "moneda": "MXN"}
+    
+    # Si no hay precio, intentar extraerlo de la descripción
+    if not precio_info:
+        for patron in _PATRONES_PRECIO_DESCRIPCION:
+            if match := patron.search(descripcion):
+                precio_info = {"valor": match.group(0), "moneda": "MXN"}
+                break
+    
+    # Extraer tipo de propiedad
+    tipo_prop = None
+    if isinstance(datos, dict):
+        if "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
+            tipo_prop = datos["caracteristicas"].get("tipo_propiedad")
+        if not tipo_prop and "tipo_propiedad" in datos:
+            tipo_prop = datos["tipo_propiedad"]
+    
+    # Si no se encontró el tipo de propiedad, intentar extraerlo del texto
+    if not tipo_prop:
+        tipo_prop = extraer_tipo_propiedad(descripcion)
+    
+    # Si aún no hay tipo de propiedad, buscar en el título
+    if not tipo_prop and titulo:
+        tipo_prop = extraer_tipo_propiedad(titulo)
+    
+    # Si aún no hay tipo, usar "casa" como valor por defecto si hay indicadores
+    if not tipo_prop:
+        texto_completo = (titulo + " " + descripcion).lower()
+        if any(palabra in texto_completo for palabra in ["recámara", "recamara", "habitación", "habitacion", "baño", "bano", "cocina"]):
+            tipo_prop = "casa"
+        else:
+            tipo_prop = "propiedad"  # Valor por defecto si no se puede determinar
+    
+    # Extraer tipo de operación
+    tipo_op = None
+    if isinstance(datos, dict):
+        if "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
+            tipo_op = datos["caracteristicas"].get("tipo_operacion")
+        if not tipo_op and "tipo_operacion" in datos:
+            tipo_op = datos["tipo_operacion"]
+    
+    # Normalizar tipo_op si es un diccionario
+    if isinstance(tipo_op, dict):
+        tipo_op = tipo_op.get("tipo", None)
+    
+    # Si no hay tipo de operación, intentar inferirlo del precio
+    if not tipo_op and precio_info:
+        try:
+            valor = float(str(precio_info["valor"]).replace("$", "").replace(",", "").replace(" ", ""))
+            if valor >= 500_000:  # Si es mayor a 500 mil, probablemente es venta
+                tipo_op = "venta"
+            elif valor <= 100_000:  # Si es menor a 100 mil, probablemente es renta
+                tipo_op = "renta"
+        except:
+            pass
+    
+    # Si aún no hay tipo de operación, buscarlo en el texto
+    if not tipo_op:
+        texto_completo = (titulo + " " + descripcion).lower()
+        if any(palabra in texto_completo for palabra in ["venta", "vendo", "vendemos", "se vende"]):
+            tipo_op = "venta"
+        elif any(palabra in texto_completo for palabra in ["renta", "rento", "rentamos", "se renta", "alquiler"]):
+            tipo_op = "renta"
+        else:
+            tipo_op = "venta"  # Por defecto asumimos venta si no hay indicación clara
+    
+    # Crear propiedad procesada
+    propiedad_procesada = {
+        "id": id_propiedad,
+        "link": str(datos.get("link", "") or datos.get("url", "")) if isinstance(datos, dict) else "",
+        "titulo": titulo,
+        "descripcion_original": descripcion,
+        "ubicacion": extraer_ubicacion_detallada(descripcion, datos.get("ubicacion", {}) if isinstance(datos, dict) else {}),
+        "propiedad": {
+            "tipo_propiedad": tipo_prop,
+            "precio": extraer_precio(precio_info),
+            "tipo_operacion": tipo_op
+        },
+        "caracteristicas": extraer_caracteristicas_detalladas(descripcion),
+        "amenidades": extraer_amenidades_detalladas(descripcion),
+        "legal": extraer_legal(descripcion),
+        "fecha_procesamiento": datetime.now().isoformat(),
+        "es_valida": es_valida,
+        "motivos_invalidez": motivos_invalidez,
+        "imagen_portada": datos.get("imagen_portada", {}),  # Mantener la información de la imagen de portada
+        "imagenes": datos.get("imagenes", []),  # Mantener el array de imágenes adicionales
+        "datos_originales": datos  # Mantener todos los datos originales sin modificar
+    }
+    
+    return propiedad_procesada
+
+PROCESOS_PROCESAMIENTO = os.cpu_count() or 1
+MINIMO_PARA_PARALELO = 64
+
+def _procesar_en_proceso(registro: Tuple[str, Any]) -> Tuple[Optional[Dict], Optional[str]]:
+    """Ejecuta procesar_registro en un proceso del pool; devuelve (resultado, error)."""
+    id_propiedad, datos = registro
+    try:
+        return procesar_registro(id_propiedad, datos), None
+    except Exception as e:
+        return None, str(e)
+
+def procesar_registros(registros: List[Tuple[str, Any]]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Procesa una lista de (id, datos) y devuelve sus (resultado, error) en el mismo orden,
+    en paralelo con ProcessPoolExecutor si hay suficientes registros.
+    """
+    if PROCESOS_PROCESAMIENTO < 2 or len(registros) < MINIMO_PARA_PARALELO:
+        return [_procesar_en_proceso(r) for r in registros]
+    # Lotes grandes para que el costo de serializar cada tarea sea despreciable
+    tamano_lote = max(1, len(registros) // (PROCESOS_PROCESAMIENTO * 4))
+    with ProcessPoolExecutor(max_workers=PROCESOS_PROCESAMIENTO) as pool:
+        return list(pool.map(_procesar_en_proceso, registros, chunksize=tamano_lote))
+
 def procesar_datos_crudos(archivo_entrada: str, archivo_salida: str) -> None:
     """
     Procesa los datos crudos del archivo de entrada y genera un archivo estructurado.
@@ -1662,8 +1865,7 @@ def procesar_datos_crudos(archivo_entrada: str, archivo_salida: str) -> None:
             logger.info(f"Backup creado en {backup_path}")
         
         # Cargar datos crudos
-        with open(archivo_entrada, 'r', encoding='utf-8') as f:
-            datos_crudos = json.load(f)
+        datos_crudos = cargar_json(archivo_entrada)
             
         # Inicializar estructura de salida
         propiedades_estructuradas = {
@@ -1680,165 +1882,36 @@ def procesar_datos_crudos(archivo_entrada: str, archivo_salida: str) -> None:
             }
         }
         
-        # Procesar cada propiedad
-        for id_propiedad, datos in datos_crudos.items():
-            try:
-                # Asegurar que el ID sea string
-                id_propiedad = str(id_propiedad)
-                
-                # Extraer descripción según el formato
-                descripcion = ""
-                titulo = ""
-                if isinstance(datos, dict):
-                    if isinstance(datos.get("descripcion"), dict):
-                        descripcion = datos["descripcion"].get("texto_original", "") or datos["descripcion"].get("texto_limpio", "")
-                    elif isinstance(datos.get("descripcion"), str):
-                        descripcion = datos["descripcion"]
-                    
-                    # Extraer título
-                    if datos.get("titulo"):
-                        titulo = datos["titulo"]
-                        descripcion = titulo + ". " + descripcion
-                
-                # Validar si es una publicación inmobiliaria
-                es_valida = True
-                motivos_invalidez = []
-                
-                if es_publicacion_no_inmobiliaria(descripcion):
-                    es_valida = False
-                    motivo = "Publicación no relacionada con propiedades inmobiliarias"
-                    motivos_invalidez.append(motivo)
-                    propiedades_estructuradas["estadisticas"]["motivos_invalidez"]["no_inmobiliaria"] += 1
-                    continue
-                
-                # Extraer precio
-                precio_info = None
-                if isinstance(datos, dict):
-                    if "precio" in datos:
-                        precio_info = datos["precio"]
-                    elif "precios" in datos:
-                        precio_info = datos["precios"]
-                    elif "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
-                        precio_info = datos["caracteristicas"].get("precio")
-                
-                # Si el precio es un string o número, convertirlo a diccionario
-                if isinstance(precio_info, (str, int, float)):
-                    precio_info = {"valor": str(precio_info), "moneda": "MXN"}
-                
-                # Si no hay precio, intentar extraerlo de la descripción
-                if not precio_info:
-                    patrones_precio = [
-                        r'\$\s*[\d,.]+\s*(?:mil|millones?)?',
-                        r'(?:precio|costo|valor):\s*\$?\s*[\d,.]+\s*(?:mil|millones?)?',
-                        r'[\d,.]+\s*(?:mil|millones?)\s*(?:de)?\s*pesos'
-                    ]
-                    for patron in patrones_precio:
-                        if match := re.search(patron, descripcion, re.IGNORECASE):
-                            precio_info = {"valor": match.group(0), "moneda": "MXN"}
-                            break
-                
-                # Extraer tipo de propiedad
-                tipo_prop = None
-                if isinstance(datos, dict):
-                    if "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
-                        tipo_prop = datos["caracteristicas"].get("tipo_propiedad")
-                    if not tipo_prop and "tipo_propiedad" in datos:
-                        tipo_prop = datos["tipo_propiedad"]
-                
-                # Si no se encontró el tipo de propiedad, intentar extraerlo del texto
-                if not tipo_prop:
-                    tipo_prop = extraer_tipo_propiedad(descripcion)
-                
-                # Si aún no hay tipo de propiedad, buscar en el título
-                if not tipo_prop and titulo:
-                    tipo_prop = extraer_tipo_propiedad(titulo)
-                
-                # Si aún no hay tipo, usar "casa" como valor por defecto si hay indicadores
-                if not tipo_prop:
-                    texto_completo = (titulo + " " + descripcion).lower()
-                    if any(palabra in texto_completo for palabra in ["recámara", "recamara", "habitación", "habitacion", "baño", "bano", "cocina"]):
-                        tipo_prop = "casa"
-                    else:
-                        tipo_prop = "propiedad"  # Valor por defecto si no se puede determinar
-                
-                # Extraer tipo de operación
-                tipo_op = None
-                if isinstance(datos, dict):
-                    if "caracteristicas" in datos and isinstance(datos["caracteristicas"], dict):
-                        tipo_op = datos["caracteristicas"].get("tipo_operacion")
-                    if not tipo_op and "tipo_operacion" in datos:
-                        tipo_op = datos["tipo_operacion"]
-                
-                # Normalizar tipo_op si es un diccionario
-                if isinstance(tipo_op, dict):
-                    tipo_op = tipo_op.get("tipo", None)
-                
-                # Si no hay tipo de operación, intentar inferirlo del precio
-                if not tipo_op and precio_info:
-                    try:
-                        valor = float(str(precio_info["valor"]).replace("$", "").replace(",", "").replace(" ", ""))
-                        if valor >= 500_000:  # Si es mayor a 500 mil, probablemente es venta
-                            tipo_op = "venta"
-                        elif valor <= 100_000:  # Si es menor a 100 mil, probablemente es renta
-                            tipo_op = "renta"
-                    except:
-                        pass
-                
-                # Si aún no hay tipo de operación, buscarlo en el texto
-                if not tipo_op:
-                    texto_completo = (titulo + " " + descripcion).lower()
-                    if any(palabra in texto_completo for palabra in ["venta", "vendo", "vendemos", "se vende"]):
-                        tipo_op = "venta"
-                    elif any(palabra in texto_completo for palabra in ["renta", "rento", "rentamos", "se renta", "alquiler"]):
-                        tipo_op = "renta"
-                    else:
-                        tipo_op = "venta"  # Por defecto asumimos venta si no hay indicación clara
-                
-                # Crear propiedad procesada
-                propiedad_procesada = {
-                    "id": id_propiedad,
-                    "link": str(datos.get("link", "") or datos.get("url", "")) if isinstance(datos, dict) else "",
-                    "titulo": titulo,
-                    "descripcion_original": descripcion,
-                    "ubicacion": extraer_ubicacion_detallada(descripcion, datos.get("ubicacion", {}) if isinstance(datos, dict) else {}),
-                    "propiedad": {
-                        "tipo_propiedad": tipo_prop,
-                        "precio": extraer_precio(precio_info),
-                        "tipo_operacion": tipo_op
-                    },
-                    "caracteristicas": extraer_caracteristicas_detalladas(descripcion),
-                    "amenidades": extraer_amenidades_detalladas(descripcion),
-                    "legal": extraer_legal(descripcion),
-                    "fecha_procesamiento": datetime.now().isoformat(),
-                    "es_valida": es_valida,
-                    "motivos_invalidez": motivos_invalidez,
-                    "imagen_portada": datos.get("imagen_portada", {}),  # Mantener la información de la imagen de portada
-                    "imagenes": datos.get("imagenes", []),  # Mantener el array de imágenes adicionales
-                    "datos_originales": datos  # Mantener todos los datos originales sin modificar
-                }
-                
-                # Actualizar estadísticas
-                propiedades_estructuradas["estadisticas"]["total_procesadas"] += 1
-                
-                if es_valida:
-                    propiedades_estructuradas["estadisticas"]["total_validas"] += 1
-                    propiedades_estructuradas["estadisticas"]["tipos_propiedad"][tipo_prop] += 1
-                    propiedades_estructuradas["estadisticas"]["tipos_operacion"][tipo_op] += 1
-                else:
-                    propiedades_estructuradas["estadisticas"]["total_invalidas"] += 1
-                
-                # Agregar propiedad a la lista
-                propiedades_estructuradas["propiedades"].append(propiedad_procesada)
-                
-            except Exception as e:
-                logger.error(f"Error procesando propiedad {id_propiedad}: {str(e)}")
-                propiedades_estructuradas["estadisticas"]["total_invalidas"] += 1
-                propiedades_estructuradas["estadisticas"]["motivos_invalidez"]["error_procesamiento"] += 1
+        # Procesar cada propiedad (en paralelo si hay varios núcleos); las
+        # estadísticas se acumulan aquí, en el orden original
+        registros = [(str(id_propiedad), datos) for id_propiedad, datos in datos_crudos.items()]
+        estadisticas = propiedades_estructuradas["estadisticas"]
+        for (id_propiedad, _), (propiedad_procesada, error) in zip(registros, procesar_registros(registros)):
+            if error is not None:
+                logger.error(f"Error procesando propiedad {id_propiedad}: {error}")
+                estadisticas["total_invalidas"] += 1
+                estadisticas["motivos_invalidez"]["error_procesamiento"] += 1
+                continue
+            
+            if propiedad_procesada is None:
+                estadisticas["motivos_invalidez"]["no_inmobiliaria"] += 1
                 continue
+            
+            # Actualizar estadísticas
+            estadisticas["total_procesadas"] += 1
+            
+            if propiedad_procesada["es_valida"]:
+                estadisticas["total_validas"] += 1
+                estadisticas["tipos_propiedad"][propiedad_procesada["propiedad"]["tipo_propiedad"]] += 1
+                estadisticas["tipos_operacion"][propiedad_procesada["propiedad"]["tipo_operacion"]] += 1
+            else:
+                estadisticas["total_invalidas"] += 1
+            
+            # Agregar propiedad a la lista
+            propiedades_estructuradas["propiedades"].append(propiedad_procesada)
         
         # Guardar resultados
-        with open(archivo_salida, 'w', encoding='utf-8') as f:
-            json.dump(propiedades_estructuradas, f, ensure_ascii=False, indent=2)
+        guardar_json(archivo_salida, propiedades_estructuradas)
             
         logger.info("Procesamiento completado")
         logger.info(f"Total propiedades procesadas: {propiedades_estructuradas['estadisticas']['total_procesadas']}")
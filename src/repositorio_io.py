@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+repositorio_io.py
+
+Funciones compartidas para leer los repositorios JSON de propiedades
+(resultados/propiedades_estructuradas.json y similares).
+"""
+
+import gc
+import os
+import re
+import json
+import pickle
+
+try:
+    import ijson
+    IJSON_DISPONIBLE = True
+except ImportError:
+    IJSON_DISPONIBLE = False
+
+try:
+    import orjson
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    ORJSON_DISPONIBLE = False
+
+def cargar_json(ruta: str):
+    """Carga un archivo JSON completo; usa orjson si está instalado."""
+    if ORJSON_DISPONIBLE:
+        with open(ruta, "rb") as f:
+            return orjson.loads(f.read())
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _huella_archivo(ruta: str) -> tuple:
+    """(fecha de modificación en ns, tamaño) del archivo; cambia si el archivo cambia."""
+    estado = os.stat(ruta)
+    return (estado.st_mtime_ns, estado.st_size)
+
+def _leer_pickle_vigente(ruta_cache: str, huella: tuple):
+    """
+    Devuelve el contenido de ruta_cache si se generó del archivo con esa huella; si no, None.
+    Se exige la huella exacta (no solo una copia más reciente): un JSON restaurado
+    con su fecha original (cp -p, shutil.copy2, rsync) también invalida la copia.
+    """
+    try:
+        with open(ruta_cache, "rb") as f:
+            # La huella va primero: si no coincide, no se lee el resto
+            if pickle.load(f) != huella:
+                return None
+            # Sin el recolector de ciclos activo, reconstruir miles de dicts es ~3x más rápido
+            gc_activo = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_activo:
+                    gc.enable()
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    return None
+
+def _escribir_pickle(ruta_cache: str, huella: tuple, datos) -> None:
+    """Guarda la huella del archivo de origen y datos en ruta_cache; si no se puede escribir, se ignora."""
+    try:
+        # Escritura atómica: otra ejecución nunca ve una copia a medias
+        ruta_tmp = ruta_cache + ".tmp"
+        with open(ruta_tmp, "wb") as f:
+            pickle.dump(huella, f, protocol=5)
+            pickle.dump(datos, f, protocol=5)
+        os.replace(ruta_tmp, ruta_cache)
+    except OSError:
+        pass
+
+def cargar_json_cacheado(ruta: str):
+    """
+    Carga un JSON usando una copia pickle junto al archivo (ruta + ".pkl").
+    La copia se regenera cuando el JSON cambia (otra fecha de modificación o tamaño).
+    """
+    ruta_cache = ruta + ".pkl"
+    # La huella se toma antes de leer: si el JSON cambia mientras se lee, la
+    # copia queda con una huella vieja y se regenera en la siguiente carga
+    huella = _huella_archivo(ruta)
+    datos = _leer_pickle_vigente(ruta_cache, huella)
+    if datos is not None:
+        return datos
+    
+    datos = cargar_json(ruta)
+    _escribir_pickle(ruta_cache, huella, datos)
+    return datos
+
+def guardar_json(ruta: str, datos, indentar: bool = True) -> None:
+    """
+    Escribe datos como JSON en UTF-8, indentado con 2 espacios o compacto con
+    indentar=False (archivos grandes que no se revisan a mano); usa orjson si está instalado.
+    """
+    if ORJSON_DISPONIBLE:
+        opciones = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indentar else 0)
+        with open(ruta, "wb") as f:
+            f.write(orjson.dumps(datos, option=opciones))
+    else:
+        with open(ruta, "w", encoding="utf-8") as f:
+            if indentar:
+                json.dump(datos, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+
+def linea_ndjson(datos) -> bytes:
+    """Serializa datos como una línea NDJSON (JSON compacto terminado en salto de línea)."""
+    if ORJSON_DISPONIBLE:
+        return orjson.dumps(datos, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def _prefijo_propiedades(f) -> str:
+    """
+    Devuelve el prefijo ijson de la lista de propiedades según la forma del archivo:
+    una lista en la raíz o un objeto con la llave "propiedades".
+    """
+    while True:
+        caracter = f.read(1)
+        if not caracter or not caracter.isspace():
+            break
+    f.seek(0)
+    return "item" if caracter == b"[" else "propiedades.item"
+
+def iterar_propiedades(ruta: str):
+    """
+    Recorre las propiedades de un repositorio una por una.
+    Con ijson se leen en streaming, sin cargar el archivo completo en memoria.
+    """
+    if IJSON_DISPONIBLE:
+        with open(ruta, "rb") as f:
+            yield from ijson.items(f, _prefijo_propiedades(f), use_float=True)
+    else:
+        with open(ruta, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        yield from (datos if isinstance(datos, list) else datos.get("propiedades", []))
+
+_RE_ESPACIOS = re.compile(r"[ \t\n\r]*")
+
+def _indice_propiedades(ruta: str) -> dict:
+    """
+    Construye {id: (inicio, fin)} con la posición en bytes de cada propiedad del archivo,
+    para cualquiera de las dos formas (lista en la raíz u objeto con "propiedades").
+    """
+    # latin-1 asigna un carácter a cada byte, así que las posiciones en el texto son
+    # posiciones en el archivo. Los bytes de caracteres UTF-8 multibyte son >= 0x80
+    # y nunca se confunden con la sintaxis JSON.
+    with open(ruta, "rb") as f:
+        texto = f.read().decode("latin-1")
+    decodificador = json.JSONDecoder()
+    
+    def saltar_espacios(pos):
+        return _RE_ESPACIOS.match(texto, pos).end()
+    
+    def saltar_coma(pos):
+        pos = saltar_espacios(pos)
+        return saltar_espacios(pos + 1) if texto.startswith(",", pos) else pos
+    
+    pos = saltar_espacios(0)
+    if texto.startswith("{", pos):
+        # Avanzar por las llaves del objeto hasta el valor de "propiedades"
+        pos = saltar_espacios(pos + 1)
+        while not texto.startswith("}", pos):
+            llave, pos = decodificador.raw_decode(texto, pos)
+            pos = saltar_espacios(saltar_espacios(pos) + 1)
+            if llave == "propiedades":
+                break
+            _, pos = decodificador.raw_decode(texto, pos)
+            pos = saltar_coma(pos)
+        else:
+            return {}
+    if not texto.startswith("[", pos):
+        return {}
+    
+    indice = {}
+    pos = saltar_espacios(pos + 1)
+    while not texto.startswith("]", pos):
+        inicio = pos
+        prop, pos = decodificador.raw_decode(texto, pos)
+        if isinstance(prop, dict) and "id" in prop:
+            # Los ids son numéricos (ASCII), iguales en latin-1 y en UTF-8
+            indice.setdefault(str(prop["id"]), (inicio, pos))
+        pos = saltar_coma(pos)
+    return indice
+
+def buscar_propiedad(ruta: str, id_prop: str):
+    """
+    Devuelve la propiedad con el id indicado, o None si no existe.
+    Usa un índice id -> posición en bytes guardado junto al archivo (ruta + ".idx.pkl"),
+    que se reconstruye cuando el JSON cambia; después solo se lee esa propiedad.
+    """
+    ruta_indice = ruta + ".idx.pkl"
+    huella = _huella_archivo(ruta)
+    indice = _leer_pickle_vigente(ruta_indice, huella)
+    if indice is None:
+        indice = _indice_propiedades(ruta)
+        _escribir_pickle(ruta_indice, huella, indice)
+    
+    posicion = indice.get(str(id_prop))
+    if posicion is None:
+        return None
+    inicio, fin = posicion
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        fragmento = f.read(fin - inicio)
+    return orjson.loads(fragmento) if ORJSON_DISPONIBLE else json.loads(fragmento)
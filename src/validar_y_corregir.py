@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import re
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Union
 from pathlib import Path
 
+from repositorio_io import cargar_json, guardar_json
+
 # Constantes para validación
 RANGOS_PRECIO = {
     "venta": {
@@ -639,8 +640,7 @@ def procesar_repositorio():
     
     # 1. Cargar links
     try:
-        with open("resultados/links/repositorio_unico.json", "r", encoding="utf-8") as f:
-            links_raw = json.load(f)
+        links_raw = cargar_json("resultados/links/repositorio_unico.json")
             
         # Normalizar formato de links
         links = []
@@ -670,8 +670,7 @@ def procesar_repositorio():
     
     # 2. Cargar repositorio actual
     try:
-        with open("resultados/repositorio_propiedades.json", "r", encoding="utf-8") as f:
-            repositorio = json.load(f)
+        repositorio = cargar_json("resultados/repositorio_propiedades.json")
         print(f"📊 Total de propiedades en repositorio: {len(repositorio)}")
     except:
         print("💾 Creando nuevo repositorio")
@@ -680,8 +679,7 @@ def procesar_repositorio():
     # 3. Crear backup
     backup_path = "resultados/repositorio_propiedades.bak.json"
     print(f"💾 Creando backup en {backup_path}")
-    with open(backup_path, "w", encoding="utf-8") as f:
-        json.dump(repositorio, f, indent=2, ensure_ascii=False)
+    guardar_json(backup_path, repositorio)
     
     # 4. Procesar cada propiedad
     stats = {
@@ -783,17 +781,14 @@ def procesar_repositorio():
         
         # Guardar progreso cada 10 propiedades
         if stats["procesadas"] % 10 == 0:
-            with open("resultados/repositorio_propiedades.json", "w", encoding="utf-8") as f:
-                json.dump(repositorio, f, indent=2, ensure_ascii=False)
+            guardar_json("resultados/repositorio_propiedades.json", repositorio)
     
     # 5. Guardar repositorio final
     print("\n💾 Guardando repositorio corregido en resultados/repositorio_propiedades.json")
-    with open("resultados/repositorio_propiedades.json", "w", encoding="utf-8") as f:
-        json.dump(repositorio, f, indent=2, ensure_ascii=False)
+    guardar_json("resultados/repositorio_propiedades.json", repositorio)
     
     # 6. Guardar estadísticas
-    with open("resultados/stats_correccion.json", "w", encoding="utf-8") as f:
-        json.dump(stats, f, indent=2, ensure_ascii=False)
+    guardar_json("resultados/stats_correccion.json", stats)
     
     # 7. Mostrar resumen
     print("\n=== RESUMEN DE CORRECCIONES ===")
@@ -1,15 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import os
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
-def cargar_json(archivo: str) -> Dict:
-    """Carga un archivo JSON."""
-    with open(archivo, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from repositorio_io import cargar_json_cacheado, guardar_json, iterar_propiedades
 
 def verificar_precio(precio_estructurado: Dict, precio_original: Any) -> List[str]:
     """Verifica la concordancia del precio."""
@@ -151,8 +147,17 @@ def verificar_caracteristicas(caract_estructuradas: Dict, caract_originales: Any
     
     return errores
 
-def verificar_tipo_operacion(tipo_estructurado: str, datos_originales: Dict) -> List[str]:
-    """Verifica la concordancia del tipo de operación."""
+def textos_originales(datos_originales: Dict) -> Tuple[str, str]:
+    """Descripción y título originales en minúsculas."""
+    return (str(datos_originales.get("descripcion", "")).lower(),
+            str(datos_originales.get("titulo", "")).lower())
+
+def verificar_tipo_operacion(tipo_estructurado: str, datos_originales: Dict,
+                             textos: Tuple[str, str] = None) -> List[str]:
+    """
+    Verifica la concordancia del tipo de operación.
+    textos es (descripción, título) en minúsculas, si ya se calcularon.
+    """
     errores = []
     
     if not tipo_estructurado:
@@ -162,8 +167,7 @@ def verificar_tipo_operacion(tipo_estructurado: str, datos_originales: Dict) ->
     try:
         # Buscar tipo de operación en diferentes campos
         tipo_orig = str(datos_originales.get("tipo_operacion", "")).lower()
-        descripcion = str(datos_originales.get("descripcion", "")).lower()
-        titulo = str(datos_originales.get("titulo", "")).lower()
+        descripcion, titulo = textos or textos_originales(datos_originales)
         
         # Verificar coherencia
         if tipo_orig and tipo_orig != tipo_estructurado.lower():
@@ -185,8 +189,12 @@ def verificar_tipo_operacion(tipo_estructurado: str, datos_originales: Dict) ->
     
     return errores
 
-def verificar_tipo_propiedad(tipo_estructurado: str, datos_originales: Dict) -> List[str]:
-    """Verifica la concordancia del tipo de propiedad."""
+def verificar_tipo_propiedad(tipo_estructurado: str, datos_originales: Dict,
+                            textos: Tuple[str, str] = None) -> List[str]:
+    """
+    Verifica la concordancia del tipo de propiedad.
+    textos es (descripción, título) en minúsculas, si ya se calcularon.
+    """
     errores = []
     
     if not tipo_estructurado:
@@ -196,8 +204,7 @@ def verificar_tipo_propiedad(tipo_estructurado: str, datos_originales: Dict) ->
     try:
         # Buscar tipo de propiedad en diferentes campos
         tipo_orig = str(datos_originales.get("tipo_propiedad", "")).lower()
-        descripcion = str(datos_originales.get("descripcion", "")).lower()
-        titulo = str(datos_originales.get("titulo", "")).lower()
+        descripcion, titulo = textos or textos_originales(datos_originales)
         
         # Mapeo de tipos comunes
         mapeo_tipos = {
@@ -232,10 +239,12 @@ def verificar_propiedad(prop_estructurada: Dict, prop_original: Dict) -> Dict:
         "errores": [],
         "campos_verificados": {}
     }
+    # Alias local: evita repetir la cadena de .get() para cada campo
+    datos_propiedad = prop_estructurada.get("propiedad") or {}
     
     # Verificar precio
     errores_precio = verificar_precio(
-        prop_estructurada.get("propiedad", {}).get("precio"),
+        datos_propiedad.get("precio"),
         prop_original.get("precio")
     )
     if errores_precio:
@@ -260,10 +269,15 @@ def verificar_propiedad(prop_estructurada: Dict, prop_original: Dict) -> Dict:
         resultado["errores"].extend([f"Características: {e}" for e in errores_caract])
     resultado["campos_verificados"]["caracteristicas"] = len(errores_caract) == 0
     
+    # Descripción y título originales se pasan a minúsculas una sola vez
+    # para las dos verificaciones de tipo
+    textos = textos_originales(prop_original)
+    
     # Verificar tipo de propiedad
     errores_tipo = verificar_tipo_propiedad(
-        prop_estructurada.get("propiedad", {}).get("tipo_propiedad"),
-        prop_original
+        datos_propiedad.get("tipo_propiedad"),
+        prop_original,
+        textos
     )
     if errores_tipo:
         resultado["errores"].extend([f"Tipo propiedad: {e}" for e in errores_tipo])
@@ -271,8 +285,9 @@ def verificar_propiedad(prop_estructurada: Dict, prop_original: Dict) -> Dict:
     
     # Verificar tipo de operación
     errores_operacion = verificar_tipo_operacion(
-        prop_estructurada.get("propiedad", {}).get("tipo_operacion"),
-        prop_original
+        datos_propiedad.get("tipo_operacion"),
+        prop_original,
+        textos
     )
     if errores_operacion:
         resultado["errores"].extend([f"Tipo operación: {e}" for e in errores_operacion])
@@ -283,13 +298,14 @@ def verificar_propiedad(prop_estructurada: Dict, prop_original: Dict) -> Dict:
 def main():
     # Cargar archivos
     print("Cargando archivos...")
-    estructuradas = cargar_json("resultados/propiedades_estructuradas.json")
-    repositorio = cargar_json("resultados/repositorio_propiedades.json")
+    # Las propiedades estructuradas se recorren en streaming; el repositorio
+    # original sí se carga completo porque se consulta por id
+    repositorio = cargar_json_cacheado("resultados/repositorio_propiedades.json")
     
     # Preparar resultados
     resultados = {
         "fecha_verificacion": datetime.now().isoformat(),
-        "total_propiedades": len(estructuradas["propiedades"]),
+        "total_propiedades": 0,
         "propiedades_verificadas": [],
         "estadisticas": {
             "total_errores": 0,
@@ -306,28 +322,32 @@ def main():
     
     # Verificar cada propiedad
     print("\nVerificando propiedades...")
-    for prop in estructuradas["propiedades"]:
+    estadisticas = resultados["estadisticas"]
+    errores_por_campo = estadisticas["errores_por_campo"]
+    propiedades_verificadas = resultados["propiedades_verificadas"]
+    for prop in iterar_propiedades("resultados/propiedades_estructuradas.json"):
+        resultados["total_propiedades"] += 1
         prop_id = prop.get("id")
-        if prop_id in repositorio:
-            resultado = verificar_propiedad(prop, repositorio[prop_id])
+        prop_original = repositorio.get(prop_id)
+        if prop_original is not None:
+            resultado = verificar_propiedad(prop, prop_original)
             
             # Actualizar estadísticas
             if resultado["errores"]:
-                resultados["estadisticas"]["total_errores"] += len(resultado["errores"])
+                estadisticas["total_errores"] += len(resultado["errores"])
                 for campo, es_valido in resultado["campos_verificados"].items():
                     if not es_valido:
-                        resultados["estadisticas"]["errores_por_campo"][campo] += 1
+                        errores_por_campo[campo] += 1
             else:
-                resultados["estadisticas"]["propiedades_sin_errores"] += 1
+                estadisticas["propiedades_sin_errores"] += 1
             
-            resultados["propiedades_verificadas"].append(resultado)
+            propiedades_verificadas.append(resultado)
         else:
             print(f"Advertencia: Propiedad {prop_id} no encontrada en repositorio")
     
     # Guardar resultados
     archivo_resultados = f"resultados/verificacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(archivo_resultados, 'w', encoding='utf-8') as f:
-        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    guardar_json(archivo_resultados, resultados)
     
     # Imprimir resumen
     print("\nResumen de verificación:")
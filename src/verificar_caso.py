@@ -1,22 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
+from repositorio_io import buscar_propiedad
 
 def verificar_caso():
     """Verifica los cambios en el caso específico"""
-    # Cargar datos
-    with open("resultados/propiedades_estructuradas.json", "r", encoding="utf-8") as f:
-        datos = json.load(f)
-    
-    # Buscar la propiedad específica
+    # Buscar la propiedad específica con el índice de ids (solo se lee esa propiedad)
     id_buscar = "1002198755279328"
-    propiedad = None
-    
-    for prop in datos["propiedades"]:
-        if prop["id"] == id_buscar:
-            propiedad = prop
-            break
+    propiedad = buscar_propiedad("resultados/propiedades_estructuradas.json", id_buscar)
     
     if not propiedad:
         print(f"No se encontró la propiedad con ID {id_buscar}")
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Los scripts de src/ se importan entre sí como módulos sueltos
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+CARPETA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
@@ -0,0 +1,78 @@
+import gzip
+import io
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import actualiza_precios
+from conftest import CARPETA_FIXTURES
+
+FIXTURES_HTML = ["publicacion_completa.html", "publicacion_og.html", "precio_anidado.html"]
+
+
+def precio_beautifulsoup(html: bytes) -> str:
+    """Búsqueda original: primer <span> cuyo get_text(strip=True) parece un precio."""
+    soup = BeautifulSoup(html, "lxml", from_encoding="utf-8")
+    for span in soup.find_all("span"):
+        texto = span.get_text(strip=True)
+        if texto.startswith("$") and len(texto) < 30:
+            return texto
+    return ""
+
+
+def leer_fixture(nombre: str) -> bytes:
+    with open(os.path.join(CARPETA_FIXTURES, nombre), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("nombre", FIXTURES_HTML)
+def test_fixture_igual_que_beautifulsoup(nombre, tmp_path):
+    html = leer_fixture(nombre)
+    ruta = tmp_path / nombre
+    ruta.write_bytes(html)
+    assert actualiza_precios.leer_precio_html(str(ruta)) == (precio_beautifulsoup(html), None)
+
+
+@pytest.mark.parametrize("nombre", FIXTURES_HTML)
+def test_fixture_comprimido(nombre, tmp_path):
+    html = leer_fixture(nombre)
+    ruta = tmp_path / (nombre + ".gz")
+    with gzip.open(ruta, "wb") as f:
+        f.write(html)
+    assert actualiza_precios.leer_precio_html(str(ruta)) == (precio_beautifulsoup(html), None)
+
+
+def test_precios_de_fixtures():
+    assert actualiza_precios.extraer_precio(io.BytesIO(leer_fixture("publicacion_completa.html"))) == "$3,250,000"
+    assert actualiza_precios.extraer_precio(io.BytesIO(leer_fixture("publicacion_og.html"))) == ""
+    assert actualiza_precios.extraer_precio(io.BytesIO(leer_fixture("precio_anidado.html"))) == "$1,850,000"
+
+
+@pytest.mark.parametrize("html", [
+    "<rt><span>$5</span></rt>",
+    "<template><span>$5</span></template>",
+    "<ruby><rp><span><i>$5</i></span></rp></ruby>",
+    "<rt><b>x</b><span>$5</span></rt><span>$7</span>",
+    "<span><rt>$5</rt>$6</span>",
+    "<span><span>$1</span><span>,000</span></span>",
+    "<span>a<span>$2</span></span><span>$3</span>",
+])
+def test_etiquetas_sin_texto(html):
+    documento = f"<html><body>{html}</body></html>".encode()
+    assert actualiza_precios.extraer_precio(io.BytesIO(documento)) == precio_beautifulsoup(documento)
+
+
+@pytest.mark.parametrize("corte", [0, 1, 3, 9, 10, 12, 20])
+def test_precio_partido_entre_bloques(corte, tmp_path):
+    # El límite del primer bloque de lectura cae `corte` bytes después del "$"
+    inicio = b"<html><body><div>"
+    precio = b"</div><span>$2,450,000</span>"
+    relleno = b"x" * (actualiza_precios.TAMANO_BLOQUE - corte - len(inicio) - precio.index(b"$"))
+    html = inicio + relleno + precio + b"</body></html>"
+    assert html.index(b"$") == actualiza_precios.TAMANO_BLOQUE - corte
+    ruta = tmp_path / "partido.html.gz"
+    with gzip.open(ruta, "wb") as f:
+        f.write(html)
+    assert actualiza_precios.leer_precio_html(str(ruta)) == ("$2,450,000", None)
+    assert precio_beautifulsoup(html) == "$2,450,000"
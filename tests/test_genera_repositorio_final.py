@@ -0,0 +1,93 @@
+import importlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from conftest import CARPETA_FIXTURES
+
+pytest.importorskip("playwright")
+
+
+class RespuestaFalsa:
+    def __init__(self, texto, status_code=200):
+        self.text = texto
+        self.status_code = status_code
+
+
+@pytest.fixture
+def genera(tmp_path, monkeypatch):
+    """Importa el script en una carpeta temporal (al importarse lee los links y crea carpetas)."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("resultados/links")
+    with open("resultados/links/repositorio_unico.json", "w", encoding="utf-8") as f:
+        json.dump([], f)
+    sys.modules.pop("genera_repositorio_final", None)
+    modulo = importlib.import_module("genera_repositorio_final")
+    monkeypatch.setattr(modulo, "salida_registros", io.BytesIO())
+    monkeypatch.setattr(modulo, "_descargar_archivo", lambda url, ruta: True)
+    yield modulo
+    sys.modules.pop("genera_repositorio_final", None)
+
+
+def servir_fixture(genera, monkeypatch, nombre):
+    with open(os.path.join(CARPETA_FIXTURES, nombre), encoding="utf-8") as f:
+        html = f.read()
+    monkeypatch.setattr(genera.SESSION, "get", lambda url, **kwargs: RespuestaFalsa(html))
+
+
+ITEM = {"id": "123456789", "link": "https://www.facebook.com/marketplace/item/123456789", "ciudad": "cuernavaca"}
+
+
+def test_pagina_solo_open_graph_va_a_playwright(genera, monkeypatch):
+    servir_fixture(genera, monkeypatch, "publicacion_og.html")
+    assert genera.extraer_propiedad_sin_navegador(ITEM) is None
+    # No se guarda ningún registro incompleto
+    assert genera.salida_registros.getvalue() == b""
+
+
+def test_pagina_completa_se_extrae_sin_navegador(genera, monkeypatch):
+    servir_fixture(genera, monkeypatch, "publicacion_completa.html")
+    datos = genera.extraer_propiedad_sin_navegador(ITEM)
+    assert datos["titulo"] == "Casa en venta en Lomas de Cortés"
+    assert datos["precio"] == "$3,250,000"
+    assert datos["descripcion"].startswith("Casa en venta con 3 recámaras, 2 baños y jardín.")
+    assert "cisterna de 5 mil litros" in datos["descripcion"]
+    assert "Ver menos" not in datos["descripcion"]
+    assert datos["vendedor"] == "María Ejemplo"
+    assert json.loads(genera.salida_registros.getvalue()) == datos
+
+
+def test_error_http_va_a_playwright(genera, monkeypatch):
+    monkeypatch.setattr(genera.SESSION, "get", lambda url, **kwargs: RespuestaFalsa("", 404))
+    assert genera.extraer_propiedad_sin_navegador(ITEM) is None
+
+
+def test_paginas_de_facebook_no_se_reintentan(genera):
+    adaptador = genera.SESSION.get_adapter(ITEM["link"])
+    assert adaptador.max_retries.total == 0
+    # Las portadas (CDN) sí se reintentan ante errores transitorios
+    portada = genera.SESSION.get_adapter("https://scontent.fcvj1-1.fna.fbcdn.net/v/t45/foto.jpg")
+    assert 429 in portada.max_retries.status_forcelist
+
+
+def test_recupera_registros_de_corrida_interrumpida(genera):
+    # Maestro guardado antes de una corrida que murió sin volver a guardarlo
+    genera.guardar_json(genera.CARPETA_REPO_MASTER, {"1": {"id": "1"}})
+    os.utime(genera.CARPETA_REPO_MASTER, ns=(1_000_000_000, 1_000_000_000))
+    os.makedirs("resultados/2026-10-15", exist_ok=True)
+    with open("resultados/2026-10-15/propiedades.ndjson", "wb") as f:
+        f.write(genera.linea_ndjson({"id": "1", "titulo": "ya en el maestro"}))
+        f.write(genera.linea_ndjson({"id": "2", "titulo": "Casa"}))
+        f.write(b'{"id": "3", "titu')  # Línea a medias
+    
+    data_master = {"1": {"id": "1"}}
+    assert genera.recuperar_registros_ndjson(data_master) == 1
+    assert data_master == {"1": {"id": "1"}, "2": {"id": "2", "titulo": "Casa"}}
+    
+    # Con el maestro guardado después del NDJSON ya no hay nada que recuperar
+    os.utime(genera.CARPETA_REPO_MASTER)
+    os.utime("resultados/2026-10-15/propiedades.ndjson", ns=(2_000_000_000, 2_000_000_000))
+    assert genera.recuperar_registros_ndjson({}) == 0
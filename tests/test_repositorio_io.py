@@ -0,0 +1,151 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import repositorio_io
+
+
+def escribir_json(ruta, datos):
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+
+
+def test_cargar_json_cacheado_usa_copia_vigente(tmp_path):
+    ruta = tmp_path / "repo.json"
+    escribir_json(ruta, {"1": {"precio": "$1"}})
+    assert repositorio_io.cargar_json_cacheado(str(ruta)) == {"1": {"precio": "$1"}}
+    assert os.path.exists(str(ruta) + ".pkl")
+    # Sin cambios en el JSON se lee la copia pickle
+    assert repositorio_io.cargar_json_cacheado(str(ruta)) == {"1": {"precio": "$1"}}
+
+
+def test_cargar_json_cacheado_respaldo_restaurado_con_fecha_vieja(tmp_path):
+    ruta = tmp_path / "repo.json"
+    respaldo = tmp_path / "respaldo.json"
+    escribir_json(respaldo, {"1": {"precio": "$1,000"}})
+    os.utime(respaldo, ns=(1_000_000_000, 1_000_000_000))
+    
+    escribir_json(ruta, {"1": {"precio": "$2,000"}, "2": {"precio": "$3"}})
+    assert repositorio_io.cargar_json_cacheado(str(ruta))["1"]["precio"] == "$2,000"
+    
+    # Restaurar el respaldo conservando su fecha (más vieja que la copia pickle)
+    shutil.copy2(respaldo, ruta)
+    assert repositorio_io.cargar_json_cacheado(str(ruta)) == {"1": {"precio": "$1,000"}}
+
+
+def test_cargar_json_cacheado_ignora_copia_de_formato_anterior(tmp_path):
+    ruta = tmp_path / "repo.json"
+    escribir_json(ruta, [1, 2, 3])
+    with open(str(ruta) + ".pkl", "wb") as f:
+        f.write(b"no es un pickle")
+    assert repositorio_io.cargar_json_cacheado(str(ruta)) == [1, 2, 3]
+    assert repositorio_io.cargar_json_cacheado(str(ruta)) == [1, 2, 3]
+
+
+PROPIEDADES = [
+    {"id": "101", "descripcion": "Casa en Jiutepec, baño y medio, jardín 🌳", "precio": "$1,850,000"},
+    {"id": 102, "descripcion": "Departamento «Acapantzingo», ñandú, niño", "precio": "$950,000"},
+    {"id": "103", "descripcion": "Terreno\n\"plano\" \\ sin escrituras", "precio": "$400,000"},
+]
+
+
+@pytest.mark.parametrize("forma", ["lista", "objeto"])
+@pytest.mark.parametrize("indentar", [True, False])
+def test_buscar_propiedad_con_descripciones_no_ascii(tmp_path, forma, indentar):
+    ruta = tmp_path / "repo.json"
+    datos = PROPIEDADES if forma == "lista" else {"meta": {"total": 3, "lista": [1]}, "propiedades": PROPIEDADES}
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2 if indentar else None)
+    
+    indice = repositorio_io._indice_propiedades(str(ruta))
+    assert set(indice) == {"101", "102", "103"}
+    for prop in PROPIEDADES:
+        assert repositorio_io.buscar_propiedad(str(ruta), prop["id"]) == prop
+        # Con el índice ya guardado se lee solo el fragmento de la propiedad
+        assert repositorio_io.buscar_propiedad(str(ruta), str(prop["id"])) == prop
+    assert repositorio_io.buscar_propiedad(str(ruta), "999") is None
+
+
+def test_indice_propiedades_objeto_sin_propiedades(tmp_path):
+    ruta = tmp_path / "repo.json"
+    escribir_json(ruta, {"meta": {"total": 0}})
+    assert repositorio_io._indice_propiedades(str(ruta)) == {}
+    assert repositorio_io.buscar_propiedad(str(ruta), "101") is None
+
+
+def test_buscar_propiedad_reconstruye_indice_si_cambia_el_json(tmp_path):
+    ruta = tmp_path / "repo.json"
+    escribir_json(ruta, PROPIEDADES)
+    assert repositorio_io.buscar_propiedad(str(ruta), "103")["precio"] == "$400,000"
+    assert os.path.exists(str(ruta) + ".idx.pkl")
+    
+    # Las posiciones del índice anterior ya no sirven: la primera propiedad es más larga
+    nuevas = [dict(PROPIEDADES[0], descripcion="Casa remodelada " * 20)] + PROPIEDADES[1:2]
+    nuevas.append(dict(PROPIEDADES[2], precio="$380,000"))
+    escribir_json(ruta, nuevas)
+    assert repositorio_io.buscar_propiedad(str(ruta), "103")["precio"] == "$380,000"
+    assert repositorio_io.buscar_propiedad(str(ruta), "101") == nuevas[0]
+    
+    # Mismo tamaño y otra fecha: también se reconstruye
+    escribir_json(ruta, [dict(nuevas[0], id="104")] + nuevas[1:])
+    os.utime(ruta, ns=(1_000_000_000, 1_000_000_000))
+    assert repositorio_io.buscar_propiedad(str(ruta), "101") is None
+    assert repositorio_io.buscar_propiedad(str(ruta), "104")["id"] == "104"
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend_json(request, monkeypatch):
+    """Corre la prueba con orjson/ijson y con el respaldo de la biblioteca estándar."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(repositorio_io, "ORJSON_DISPONIBLE", False)
+        monkeypatch.setattr(repositorio_io, "IJSON_DISPONIBLE", False)
+    return request.param
+
+
+@pytest.mark.parametrize("indentar", [True, False])
+def test_guardar_json_ida_y_vuelta(tmp_path, backend_json, indentar):
+    ruta = tmp_path / "repo.json"
+    datos = {"101": PROPIEDADES[0], "lista": PROPIEDADES, "vacio": {}, "flotante": 2.5, "nulo": None}
+    repositorio_io.guardar_json(str(ruta), datos, indentar=indentar)
+    
+    with open(ruta, "r", encoding="utf-8") as f:
+        texto = f.read()
+    # UTF-8 sin escapar, como json.dump(..., ensure_ascii=False)
+    assert "jardín 🌳" in texto
+    assert ("\n  " in texto) == indentar
+    assert json.loads(texto) == datos
+    assert repositorio_io.cargar_json(str(ruta)) == datos
+
+
+def test_guardar_json_llaves_no_texto(tmp_path, backend_json):
+    ruta = tmp_path / "repo.json"
+    repositorio_io.guardar_json(str(ruta), {101: {"id": 101}, "102": {"id": "102"}})
+    # Igual que json.dump: las llaves numéricas se escriben como texto
+    assert repositorio_io.cargar_json(str(ruta)) == {"101": {"id": 101}, "102": {"id": "102"}}
+
+
+def test_linea_ndjson_ida_y_vuelta(backend_json):
+    lineas = b"".join(repositorio_io.linea_ndjson(prop) for prop in PROPIEDADES)
+    assert lineas.endswith(b"\n")
+    assert lineas.count(b"\n") == len(PROPIEDADES)
+    assert [json.loads(linea) for linea in lineas.splitlines()] == PROPIEDADES
+    assert "niño".encode("utf-8") in lineas
+
+
+@pytest.mark.parametrize("forma", ["lista", "objeto"])
+def test_iterar_propiedades_ida_y_vuelta(tmp_path, backend_json, forma):
+    ruta = tmp_path / "repo.json"
+    props = PROPIEDADES + [{"id": "104", "superficie": 120.5, "recamaras": 3}]
+    datos = props if forma == "lista" else {"meta": {"total": 4}, "propiedades": props}
+    repositorio_io.guardar_json(str(ruta), datos, indentar=False)
+    assert list(repositorio_io.iterar_propiedades(str(ruta))) == props
+
+
+def test_linea_ndjson_llaves_no_texto(backend_json):
+    linea = repositorio_io.linea_ndjson({101: "casa", "102": "terreno"})
+    assert json.loads(linea) == {"101": "casa", "102": "terreno"}